@@ -1,17 +1,29 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.replicas import get_routed_db
 from ...models.alert import Alert
 from ...models.client import Client
-from .auth import verify_api_key
+from .auth import rate_limited
 
 router = APIRouter()
 
+ALERT_LIST_COLUMNS = (
+    Alert.id,
+    Alert.title,
+    Alert.severity,
+    Alert.alert_type,
+    Alert.description,
+    Alert.is_read,
+    Alert.notified_at,
+)
 
-def _serialize_alert(alert: Alert) -> dict:
+
+def _serialize_alert(alert: Alert | Row) -> dict:
     return {
         "id": str(alert.id),
         "title": alert.title,
@@ -23,16 +35,20 @@ def _serialize_alert(alert: Alert) -> dict:
     }
 
 
-@router.get("/")
-def list_alerts(
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
-):
-    alerts = (
-        db.query(Alert)
-        .filter(Alert.client_id == client.id)
+def build_alert_list(db: Session, client_id, limit: int = 50) -> list[dict]:
+    rows = (
+        db.query(*ALERT_LIST_COLUMNS)
+        .filter(Alert.client_id == client_id)
         .order_by(Alert.created_at.desc())
-        .limit(50)
+        .limit(limit)
         .all()
     )
-    return [_serialize_alert(alert) for alert in alerts]
+    return [_serialize_alert(row) for row in rows]
+
+
+@router.get("/", response_class=ORJSONResponse)
+def list_alerts(
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
+):
+    return ORJSONResponse(build_alert_list(db, client.id))
@@ -4,22 +4,18 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.replicas import get_routed_db
 from ...models.client import Client
 from ...models.mention import Mention
-from .auth import verify_api_key
+from .auth import rate_limited
 
 router = APIRouter()
 
 
-@router.get("/sentiment")
-def sentiment_overview(
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
-):
+def build_sentiment_overview(db: Session, client_id) -> dict:
     sentiment_counts = (
         db.query(Mention.sentiment, func.count(Mention.id))
-        .filter(Mention.client_id == client.id)
+        .filter(Mention.client_id == client_id)
         .group_by(Mention.sentiment)
         .all()
     )
@@ -32,7 +28,7 @@ def sentiment_overview(
 
     average_score = (
         db.query(func.avg(Mention.sentiment_score))
-        .filter(Mention.client_id == client.id)
+        .filter(Mention.client_id == client_id)
         .scalar()
     )
 
@@ -47,16 +43,28 @@ def sentiment_overview(
     }
 
 
-@router.get("/sources")
-def source_breakdown(
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
-):
+def build_source_breakdown(db: Session, client_id) -> dict:
     breakdown = (
         db.query(Mention.source_type, func.count(Mention.id))
-        .filter(Mention.client_id == client.id)
+        .filter(Mention.client_id == client_id)
         .group_by(Mention.source_type)
         .all()
     )
 
     return {source or "unknown": count for source, count in breakdown}
+
+
+@router.get("/sentiment")
+def sentiment_overview(
+    client: Client = Depends(rate_limited("analytics")),
+    db: Session = Depends(get_routed_db),
+):
+    return build_sentiment_overview(db, client.id)
+
+
+@router.get("/sources")
+def source_breakdown(
+    client: Client = Depends(rate_limited("analytics")),
+    db: Session = Depends(get_routed_db),
+):
+    return build_source_breakdown(db, client.id)
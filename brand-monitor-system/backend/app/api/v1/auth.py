@@ -1,39 +1,121 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.rate_limit import enforce_rate_limit
+from ...core.replicas import get_routed_db, reads_from_replica, route_for_client, use_primary
 from ...models.client import Client
 
 router = APIRouter()
 security = HTTPBearer()
 
+IDENTITY_CACHE_SIZE = 4096
+
+
+class IdentityCache:
+    """Bounded, expiring in-process cache of client identities by API key.
+
+    Entries are keyed by a SHA-256 of the key, so raw keys never sit in memory longer
+    than a request; the least recently used entry goes once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = IDENTITY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, api_key: str) -> dict | None:
+        key = self._key(api_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, api_key: str, identity: dict, ttl: float) -> None:
+        key = self._key(api_key)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, identity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, api_key: str) -> None:
+        with self._lock:
+            self._entries.pop(self._key(api_key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Read by the dashboard's 304 path; any request that finds the key invalid evicts it.
+client_identities = IdentityCache()
+
+
+def lookup_client(db: Session, api_key: str) -> Client | None:
+    """Return the active client owning ``api_key``, retrying on the primary after a replica miss."""
+    query = db.query(Client).filter(
+        Client.api_key == api_key,
+        Client.status == "active",
+    )
+    client = query.first()
+
+    if not client and reads_from_replica(db):
+        # A just-created client may not have replicated yet.
+        use_primary(db)
+        client = query.first()
+
+    return client
+
 
 def verify_api_key(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_routed_db),
 ) -> Client:
     """Verify API key and return client"""
-    api_key = credentials.credentials
-
-    client = (
-        db.query(Client)
-        .filter(
-            Client.api_key == api_key,
-            Client.status == "active",
-        )
-        .first()
-    )
+    client = lookup_client(db, credentials.credentials)
 
     if not client:
+        client_identities.evict(credentials.credentials)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or inactive API key",
         )
 
+    route_for_client(db, client.id)
     return client
 
 
+def rate_limited(endpoint_class: str) -> Callable[..., Client]:
+    """:func:`verify_api_key` plus a token from the client's ``endpoint_class`` bucket.
+
+    Limits come from ``Client.subscription_tier``; see :data:`app.core.rate_limit.TIER_LIMITS`.
+    """
+
+    def dependency(request: Request, client: Client = Depends(verify_api_key)) -> Client:
+        enforce_rate_limit(request, client.id, client.subscription_tier, endpoint_class)
+        return client
+
+    return dependency
+
+
 @router.post("/validate")
 def validate_api_key(client: Client = Depends(verify_api_key)):
     """Validate API key endpoint"""
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from ...core.cache import CacheUnavailable, get_client_ingest
+from ...core.config import get_settings
+from ...core.providers import Provider
+from ...core.rate_limit import enforce_rate_limit
+from ...core.replicas import open_routed_session, read_bind, reads_from_replica, route_for_client, use_primary
+from .alerts import build_alert_list
+from .analytics import build_sentiment_overview, build_source_breakdown
+from .auth import client_identities, lookup_client, security
+from .mentions import build_mention_page
+
+router = APIRouter()
+
+section_executor: Provider[ThreadPoolExecutor] = Provider(
+    "dashboard_executor",
+    lambda: ThreadPoolExecutor(max_workers=8, thread_name_prefix="dashboard"),
+)
+
+
+def _client_identity(api_key: str, request: Request) -> dict:
+    """Resolve the API key, caching active clients for ``dashboard_auth_cache_seconds``.
+
+    The cache (:data:`~.auth.client_identities`) lets an unchanged dashboard answer ``304``
+    without a database round-trip; a key found invalid is evicted from it.
+    """
+    cached = client_identities.get(api_key)
+    if cached is not None:
+        return cached
+
+    db = open_routed_session(request)
+    try:
+        client = lookup_client(db, api_key)
+        if not client:
+            client_identities.evict(api_key)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or inactive API key",
+            )
+        identity = {
+            "client_id": client.id,
+            "company_name": client.company_name,
+            "subscription_tier": client.subscription_tier,
+        }
+    finally:
+        db.close()
+
+    client_identities.put(api_key, identity, get_settings().dashboard_auth_cache_seconds)
+    return identity
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {tag.strip() for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return int(last_modified.timestamp()) <= int(since.timestamp())
+    return False
+
+
+def _build_sections(db: Session, client_id, mentions_limit: int, alerts_limit: int) -> dict:
+    """Run the independent section queries concurrently.
+
+    A SQLAlchemy session cannot execute statements in parallel, so each section gets a
+    sibling session bound to the engine ``db`` reads from (same replica or primary).
+    """
+    bind = read_bind(db)
+    builders: Dict[str, Callable[[Session], object]] = {
+        "mentions": lambda s: build_mention_page(s, client_id, limit=mentions_limit),
+        "sentiment": lambda s: build_sentiment_overview(s, client_id),
+        "sources": lambda s: build_source_breakdown(s, client_id),
+        "alerts": lambda s: build_alert_list(s, client_id, limit=alerts_limit),
+    }
+
+    def run(builder: Callable[[Session], object]):
+        with Session(bind=bind) as section_db:
+            return builder(section_db)
+
+    executor = section_executor.get()
+    futures = {name: executor.submit(copy_context().run, run, builder) for name, builder in builders.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+@router.get("", response_class=ORJSONResponse)
+def dashboard(
+    request: Request,
+    mentions_limit: int = Query(10, ge=1, le=200),
+    alerts_limit: int = Query(10, ge=1, le=50),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+):
+    """Everything the WordPress dashboard renders, in one round-trip.
+
+    Responses carry an ETag and Last-Modified derived from the client's latest ingest;
+    conditional requests for an unchanged dashboard get ``304`` without touching the database.
+    """
+    identity = _client_identity(credentials.credentials, request)
+    client_id = identity["client_id"]
+    enforce_rate_limit(request, client_id, identity["subscription_tier"], "read")
+
+    try:
+        last_ingest = get_client_ingest(client_id)
+    except CacheUnavailable:
+        last_ingest = None
+
+    headers = {"Cache-Control": "private, no-cache"}
+    if last_ingest is not None:
+        etag = f'W/"{client_id.hex}-{int(last_ingest.timestamp() * 1000)}-{mentions_limit}-{alerts_limit}"'
+        headers["ETag"] = etag
+        headers["Last-Modified"] = format_datetime(last_ingest, usegmt=True)
+        if _not_modified(request, etag, last_ingest):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    db = open_routed_session(request)
+    try:
+        route_for_client(db, client_id)
+        fresh_for = (datetime.now(timezone.utc) - last_ingest).total_seconds() if last_ingest else None
+        if reads_from_replica(db) and (fresh_for is None or fresh_for < get_settings().replica_max_lag_seconds):
+            # The ETag names the new data; make sure a lagging replica can't serve the old.
+            use_primary(db)
+        sections = _build_sections(db, client_id, mentions_limit, alerts_limit)
+    finally:
+        db.close()
+
+    unread_alerts = sum(1 for alert in sections["alerts"] if not alert["is_read"])
+    body = {
+        "client": {
+            "valid": True,
+            "client_id": str(client_id),
+            "company_name": identity["company_name"],
+            "subscription_tier": identity["subscription_tier"],
+        },
+        "mentions": sections["mentions"],
+        "sentiment": sections["sentiment"],
+        "sources": sections["sources"],
+        "alerts": {"unread": unread_alerts, "data": sections["alerts"]},
+        "last_ingest_at": last_ingest.isoformat() if last_ingest else None,
+    }
+    return ORJSONResponse(body, headers=headers)
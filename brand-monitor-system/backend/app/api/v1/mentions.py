@@ -1,46 +1,68 @@
 from __future__ import annotations
 
 from typing import List, Optional
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.replicas import get_routed_db
 from ...models.mention import Mention
 from ...models.client import Client
-from .auth import verify_api_key
+from .auth import rate_limited
 
 router = APIRouter()
 
+# Only the columns the list view serializes; skips content/raw_data and ORM identity-map bookkeeping.
+MENTION_LIST_COLUMNS = (
+    Mention.id,
+    Mention.story_id,
+    Mention.source_type,
+    Mention.source_url,
+    Mention.title,
+    Mention.language,
+    Mention.sentiment,
+    Mention.sentiment_score,
+    Mention.discovered_at,
+)
 
-def _serialize_mention(mention: Mention) -> dict:
+
+def _serialize_mention(mention: Mention | Row) -> dict:
     return {
         "id": str(mention.id),
+        "story_id": str(mention.story_id) if mention.story_id else None,
         "source_type": mention.source_type,
         "source_url": mention.source_url,
         "title": mention.title,
+        "language": mention.language,
         "sentiment": mention.sentiment,
         "sentiment_score": float(mention.sentiment_score or 0),
         "discovered_at": mention.discovered_at.isoformat() if mention.discovered_at else None,
     }
 
 
-@router.get("/")
-def list_mentions(
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+def build_mention_page(
+    db: Session,
+    client_id,
+    limit: int = 50,
+    offset: int = 0,
     sentiment: Optional[str] = None,
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
-):
-    query = db.query(Mention).filter(Mention.client_id == client.id)
-
+    story_id: Optional[UUID] = None,
+) -> dict:
+    filters = [Mention.client_id == client_id]
     if sentiment:
-        query = query.filter(Mention.sentiment == sentiment)
+        filters.append(Mention.sentiment == sentiment)
+    if story_id:
+        filters.append(Mention.story_id == story_id)
 
-    total = query.count()
-    mentions: List[Mention] = (
-        query.order_by(Mention.discovered_at.desc())
+    total = db.query(func.count(Mention.id)).filter(*filters).scalar()
+    rows: List[Row] = (
+        db.query(*MENTION_LIST_COLUMNS)
+        .filter(*filters)
+        .order_by(Mention.discovered_at.desc())
         .offset(offset)
         .limit(limit)
         .all()
@@ -48,5 +70,19 @@ def list_mentions(
 
     return {
         "total": total,
-        "data": [_serialize_mention(m) for m in mentions],
+        "data": [_serialize_mention(row) for row in rows],
     }
+
+
+@router.get("/", response_class=ORJSONResponse)
+def list_mentions(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    sentiment: Optional[str] = None,
+    story_id: Optional[UUID] = None,
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
+):
+    return ORJSONResponse(
+        build_mention_page(db, client.id, limit=limit, offset=offset, sentiment=sentiment, story_id=story_id)
+    )
@@ -1,13 +1,18 @@
 from typing import List
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.replicas import get_routed_db
 from ...models.client import Client
+from ...models.scrape_job import ScrapeJob
 from ...scrapers.apify_orchestrator import orchestrator
-from .auth import verify_api_key
+from ...scrapers.scrape_queue import request_dispatch
+from .auth import rate_limited
 
 
 router = APIRouter()
@@ -22,18 +27,24 @@ class TriggerScrapeRequest(BaseModel):
 @router.post("/trigger")
 def trigger_scrape(
     request: TriggerScrapeRequest,
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    client: Client = Depends(rate_limited("scrape")),
+    db: Session = Depends(get_routed_db),
 ):
-    """Manually trigger a scrape job"""
-
-    scrape_job = orchestrator.trigger_scrape(
-        db=db,
-        client_id=client.id,
-        source_type=request.source_type,
-        keywords=request.keywords,
-        custom_config=request.custom_config,
-    )
+    """Queue a scrape job; queued jobs start round-robin across clients as Apify capacity frees up"""
+
+    try:
+        scrape_job = orchestrator.enqueue_scrape(
+            db=db,
+            client_id=client.id,
+            source_type=request.source_type,
+            keywords=request.keywords,
+            custom_config=request.custom_config,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    background_tasks.add_task(request_dispatch)
 
     return {
         "scrape_job_id": str(scrape_job.id),
@@ -42,16 +53,77 @@ def trigger_scrape(
     }
 
 
+SCRAPE_JOB_STATUS_COLUMNS = (
+    ScrapeJob.id,
+    ScrapeJob.status,
+    ScrapeJob.source_type,
+    ScrapeJob.mentions_found,
+    ScrapeJob.apify_credits_used,
+    ScrapeJob.error_message,
+    ScrapeJob.started_at,
+    ScrapeJob.completed_at,
+)
+MAX_STATUS_IDS = 100
+
+
+def _serialize_job_status(job: ScrapeJob | Row) -> dict:
+    return {
+        "id": str(job.id),
+        "status": job.status,
+        "source_type": job.source_type,
+        "mentions_found": job.mentions_found,
+        "apify_credits_used": float(job.apify_credits_used) if job.apify_credits_used is not None else None,
+        "error_message": job.error_message,
+        "started_at": job.started_at,
+        "completed_at": job.completed_at,
+    }
+
+
+@router.get("/status", response_class=ORJSONResponse)
+def get_scrape_statuses(
+    ids: List[str] = Query(..., description="Scrape job ids; repeat the parameter or separate with commas"),
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
+):
+    """Status of many scrape jobs in one query, in request order; unknown or foreign ids are listed under ``missing``"""
+
+    requested: List[str] = [value.strip() for raw in ids for value in raw.split(",") if value.strip()]
+    if len(requested) > MAX_STATUS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATUS_IDS} ids per request")
+
+    job_ids: List[UUID] = []
+    for value in requested:
+        try:
+            job_id = UUID(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid scrape job id: {value}")
+        if job_id not in job_ids:
+            job_ids.append(job_id)
+
+    rows = {}
+    if job_ids:
+        rows = {
+            row.id: row
+            for row in db.query(*SCRAPE_JOB_STATUS_COLUMNS)
+            .filter(ScrapeJob.client_id == client.id, ScrapeJob.id.in_(job_ids))
+            .all()
+        }
+
+    return ORJSONResponse(
+        {
+            "jobs": [_serialize_job_status(rows[job_id]) for job_id in job_ids if job_id in rows],
+            "missing": [str(job_id) for job_id in job_ids if job_id not in rows],
+        }
+    )
+
+
 @router.get("/status/{scrape_job_id}")
 def get_scrape_status(
     scrape_job_id: str,
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
 ):
     """Get status of a scrape job"""
-    from uuid import UUID
-
-    from ...models.scrape_job import ScrapeJob
 
     scrape_job = (
         db.query(ScrapeJob)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from ...core.replicas import get_routed_db
+from ...models.client import Client
+from ...processors.sentiment_backfill import backfill_progress, enqueue_backfill
+from .auth import rate_limited
+
+router = APIRouter()
+
+
+class BackfillRequest(BaseModel):
+    since: Optional[datetime] = None
+
+
+@router.post("/backfill")
+def start_backfill(
+    request: BackfillRequest,
+    client: Client = Depends(rate_limited("scrape")),
+    db: Session = Depends(get_routed_db),
+):
+    """Queue the client's mentions without sentiment for the low-priority batch lane"""
+
+    queued = enqueue_backfill(db, client.id, since=request.since)
+    return {"queued": queued, "progress": backfill_progress(db, client.id)}
+
+
+@router.get("/backfill")
+def get_backfill_progress(
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
+):
+    """Backfill queue entries per status: ``queued``, ``submitted``, ``done``, ``failed``"""
+
+    return backfill_progress(db, client.id)
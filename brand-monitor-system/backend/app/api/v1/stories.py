@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ...core.replicas import get_routed_db
+from ...models.client import Client
+from ...models.story import Story
+from .auth import rate_limited
+
+router = APIRouter()
+
+STORY_LIST_COLUMNS = (
+    Story.id,
+    Story.title,
+    Story.representative_mention_id,
+    Story.mention_count,
+    Story.sources,
+    Story.sentiment,
+    Story.sentiment_score,
+    Story.sampled_count,
+    Story.first_seen_at,
+    Story.last_seen_at,
+)
+
+
+def _serialize_story(story: Story | Row) -> dict:
+    return {
+        "id": str(story.id),
+        "title": story.title,
+        "representative_mention_id": (
+            str(story.representative_mention_id) if story.representative_mention_id else None
+        ),
+        "mention_count": story.mention_count,
+        "sources": story.sources or {},
+        "sentiment": story.sentiment,
+        "sentiment_score": float(story.sentiment_score) if story.sentiment_score is not None else None,
+        "sampled_mentions": story.sampled_count,
+        "first_seen_at": story.first_seen_at.isoformat() if story.first_seen_at else None,
+        "last_seen_at": story.last_seen_at.isoformat() if story.last_seen_at else None,
+    }
+
+
+def build_story_page(
+    db: Session,
+    client_id,
+    limit: int = 20,
+    offset: int = 0,
+    since_hours: Optional[int] = None,
+    sentiment: Optional[str] = None,
+) -> dict:
+    filters = [Story.client_id == client_id]
+    if since_hours:
+        filters.append(Story.last_seen_at >= datetime.utcnow() - timedelta(hours=since_hours))
+    if sentiment:
+        filters.append(Story.sentiment == sentiment)
+
+    total = db.query(func.count(Story.id)).filter(*filters).scalar()
+    rows: List[Row] = (
+        db.query(*STORY_LIST_COLUMNS)
+        .filter(*filters)
+        .order_by(Story.last_seen_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+    return {
+        "total": total,
+        "data": [_serialize_story(row) for row in rows],
+    }
+
+
+@router.get("/", response_class=ORJSONResponse)
+def list_stories(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    since_hours: Optional[int] = Query(None, ge=1),
+    sentiment: Optional[str] = None,
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
+):
+    """Stories (clusters of related mentions), most recently active first, with volume and sentiment."""
+    return ORJSONResponse(
+        build_story_page(db, client.id, limit=limit, offset=offset, since_hours=since_hours, sentiment=sentiment)
+    )
@@ -5,18 +5,18 @@ from datetime import date
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from ...core.database import get_db
+from ...core.replicas import get_routed_db
 from ...models.client import Client
 from ...models.usage import UsageTracking
-from .auth import verify_api_key
+from .auth import rate_limited
 
 router = APIRouter()
 
 
 @router.get("/")
 def current_month_usage(
-    client: Client = Depends(verify_api_key),
-    db: Session = Depends(get_db),
+    client: Client = Depends(rate_limited("read")),
+    db: Session = Depends(get_routed_db),
 ):
     today = date.today().replace(day=1)
     usage = (
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, HTTPException, Request
+from typing import Any, Dict
+from uuid import UUID
 
+from fastapi import APIRouter, Body, HTTPException
+
+from ...core.config import get_settings
 from ...core.database import SessionLocal
+from ...core.metrics import observe_stage
+from ...core.replicas import pin_primary
+from ...core.tracing import span
 from ...models.scrape_job import ScrapeJob
-from ...scrapers.data_processor import process_apify_dataset
+from ...scrapers.webhook_handler import ingest_run, record_run_info
 
 router = APIRouter()
 
 
 @router.post("/apify/{client_id}")
-async def apify_webhook(client_id: str, request: Request):
-    """Handle Apify webhook notifications"""
+def apify_webhook(client_id: str, payload: Dict[str, Any] = Body(...)):
+    """Handle Apify webhook notifications
 
-    payload = await request.json()
+    A plain ``def`` on purpose: the paged dataset download and chunked ingest block, so
+    FastAPI runs them in its threadpool instead of on the event loop.
+    """
 
     # Extract run information
     run_id = payload.get("resource", {}).get("id")
@@ -20,31 +29,36 @@ async def apify_webhook(client_id: str, request: Request):
     if not run_id or not default_dataset_id:
         raise HTTPException(status_code=400, detail="Invalid webhook payload")
 
-    db = SessionLocal()
     try:
-        scrape_job = (
-            db.query(ScrapeJob)
-            .filter(
-                ScrapeJob.apify_run_id == run_id,
-            )
-            .first()
-        )
+        client_uuid = UUID(client_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Unknown client")
 
-        if scrape_job:
-            scrape_job.status = "processing"
-            db.commit()
+    lease_seconds = get_settings().webhook_lease_seconds
 
-            mentions = process_apify_dataset(
-                db=db,
-                scrape_job_id=scrape_job.id,
-                dataset_id=default_dataset_id,
+    with observe_stage("webhook"):
+        db = SessionLocal()
+        try:
+            scrape_job = (
+                db.query(ScrapeJob)
+                .filter(
+                    ScrapeJob.apify_run_id == run_id,
+                    ScrapeJob.client_id == client_uuid,
+                )
+                .first()
             )
 
-            scrape_job.status = "completed"
-            scrape_job.mentions_found = len(mentions)
-            db.commit()
+            if not scrape_job:
+                return {"status": "ignored"}
 
-    finally:
-        db.close()
+            # Apify retries deliveries; only the holder of the ledger lease does the work.
+            with span("apify_webhook", scrape_job_id=scrape_job.id, **{"apify.run_id": run_id}):
+                record_run_info(scrape_job, payload["resource"])
+                if not ingest_run(db, scrape_job, run_id, default_dataset_id, lease_seconds):
+                    db.rollback()
+                    return {"status": "duplicate"}
+                pin_primary(scrape_job.client_id)
+        finally:
+            db.close()
 
     return {"status": "processed"}
@@ -1,30 +1,104 @@
-from apify_client import ApifyClient
+from __future__ import annotations
 
-from .config import settings
+import logging
+from typing import TYPE_CHECKING, Iterator
+
+import orjson
+
+from .cache import get_redis
+from .config import get_settings
+from .metrics import observe_stage, record_stage_items, timed_external_call
+from .providers import Provider
+
+if TYPE_CHECKING:
+    from apify_client import ApifyClient
+
+
+def _create_apify_client() -> ApifyClient:
+    from apify_client import ApifyClient
+
+    return ApifyClient(get_settings().apify_api_token)
+
+
+logger = logging.getLogger(__name__)
+
+RUN_INFO_KEY = "brand_monitor:apify_run:{run_id}"
+TERMINAL_RUN_STATUSES = frozenset({"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"})
+TERMINAL_RUN_CACHE_SECONDS = 3600
+
+apify_client_provider: Provider[ApifyClient] = Provider("apify_client", _create_apify_client)
 
 
 class ApifyService:
-    def __init__(self):
-        self.client = ApifyClient(settings.apify_api_token)
+    @property
+    def client(self) -> ApifyClient:
+        return apify_client_provider.get()
 
+    @timed_external_call("apify", "run_actor")
     def run_actor(self, actor_id: str, run_input: dict, webhooks: list | None = None):
-        """Trigger an Apify actor run"""
-        run = self.client.actor(actor_id).call(
+        """Start an Apify actor run without waiting for it; results arrive via the webhook"""
+        run = self.client.actor(actor_id).start(
             run_input=run_input,
             webhooks=webhooks,
         )
         return run
 
-    def get_dataset_items(self, dataset_id: str):
-        """Retrieve items from an Apify dataset"""
-        dataset = self.client.dataset(dataset_id)
-        items = dataset.list_items().items
-        return items
+    @timed_external_call("apify", "get_dataset_items")
+    def list_dataset_items(self, dataset_id: str, offset: int = 0, limit: int | None = None):
+        """One page of an Apify dataset (``.items`` and the dataset's ``.total``)"""
+        with observe_stage("dataset_fetch"):
+            page = self.client.dataset(dataset_id).list_items(offset=offset, limit=limit)
+        record_stage_items("dataset_fetch", len(page.items))
+        return page
+
+    def get_dataset_items(self, dataset_id: str, offset: int = 0):
+        """Retrieve items from an Apify dataset, skipping the first ``offset`` items"""
+        return self.list_dataset_items(dataset_id, offset=offset).items
+
+    def iter_dataset_pages(self, dataset_id: str, offset: int = 0, page_size: int = 5000) -> Iterator[list]:
+        """Yield an Apify dataset in pages of ``page_size`` items, so a large run is never held in memory at once"""
+        while True:
+            page = self.list_dataset_items(dataset_id, offset=offset, limit=page_size)
+            if not page.items:
+                return
+            yield page.items
+            offset += len(page.items)
+            if page.total is not None and offset >= page.total:
+                return
 
+    @timed_external_call("apify", "get_run_info")
     def get_run_info(self, run_id: str):
         """Get information about an actor run"""
         run = self.client.run(run_id).get()
         return run
 
+    def get_run_info_cached(self, run_id: str):
+        """:meth:`get_run_info` through a Redis cache shared by all workers.
+
+        Runs still in progress are cached for ``apify_run_cache_seconds``; finished runs
+        no longer change and are kept for an hour. Works uncached if Redis is down.
+        """
+        key = RUN_INFO_KEY.format(run_id=run_id)
+        try:
+            cached = get_redis().get(key)
+        except Exception:  # noqa: BLE001
+            logger.warning("run info cache unavailable", exc_info=True)
+            cached = None
+        if cached is not None:
+            return orjson.loads(cached)
+
+        run = self.get_run_info(run_id)
+        if run is not None:
+            ttl = (
+                TERMINAL_RUN_CACHE_SECONDS
+                if run.get("status") in TERMINAL_RUN_STATUSES
+                else get_settings().apify_run_cache_seconds
+            )
+            try:
+                get_redis().set(key, orjson.dumps(run, default=str), ex=ttl)
+            except Exception:  # noqa: BLE001
+                logger.warning("could not cache run info for %s", run_id, exc_info=True)
+        return run
+
 
 apify_service = ApifyService()
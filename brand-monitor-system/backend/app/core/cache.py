@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Iterator
+
+from .config import get_settings
+from .providers import Provider
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+INGEST_KEY = "brand_monitor:last_ingest:{client_id}"
+INGEST_MARKER_TTL_SECONDS = 3600
+LIVE_SENTIMENT_KEY = "brand_monitor:sentiment:live"
+
+
+def _create_redis() -> Redis:
+    from redis import Redis
+
+    return Redis.from_url(get_settings().redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+redis_provider: Provider[Redis] = Provider("redis", _create_redis)
+get_redis = redis_provider.get
+
+
+class CacheUnavailable(RuntimeError):
+    """Redis could not be reached."""
+
+
+def _ingest_key(client_id) -> str:
+    return INGEST_KEY.format(client_id=client_id)
+
+
+def _epoch(at: datetime) -> float:
+    """POSIX timestamp of ``at``; naive datetimes are UTC, as everywhere in this app."""
+    return (at if at.tzinfo is not None else at.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def mark_client_ingest(client_id, at: datetime | None = None) -> None:
+    """Record that ``client_id``'s dashboard data changed (new mentions or alerts); best effort."""
+    timestamp = time.time() if at is None else _epoch(at)
+    try:
+        get_redis().set(_ingest_key(client_id), repr(timestamp), ex=INGEST_MARKER_TTL_SECONDS)
+    except Exception:  # noqa: BLE001 - the marker expires, bounding staleness
+        logger.warning("could not record ingest marker for client %s", client_id, exc_info=True)
+
+
+def get_client_ingest(client_id) -> datetime:
+    """Last recorded data change for ``client_id``, as an aware UTC datetime.
+
+    A missing marker is seeded with "now": every later change records a newer one, so
+    the value only has to be unique, not exact. Raises :class:`CacheUnavailable`.
+    """
+    key = _ingest_key(client_id)
+    try:
+        redis = get_redis()
+        value = redis.get(key)
+        if value is None:
+            redis.set(key, repr(time.time()), nx=True, ex=INGEST_MARKER_TTL_SECONDS)
+            value = redis.get(key)
+    except Exception as exc:  # noqa: BLE001
+        raise CacheUnavailable(str(exc)) from exc
+    return datetime.fromtimestamp(float(value), timezone.utc)
+
+
+_live_sentiment_until = 0.0
+
+
+def mark_live_sentiment() -> None:
+    """Record live (interactive) sentiment work; the backfill lane holds off for ``sentiment_live_grace_seconds``.
+
+    Also kept in-process, so a worker running both lanes honours it when Redis is down.
+    """
+    global _live_sentiment_until
+    grace = get_settings().sentiment_live_grace_seconds
+    _live_sentiment_until = time.monotonic() + grace
+    try:
+        get_redis().set(LIVE_SENTIMENT_KEY, "1", ex=grace)
+    except Exception:  # noqa: BLE001
+        logger.warning("could not record live sentiment marker", exc_info=True)
+
+
+def live_sentiment_active() -> bool:
+    """Whether live sentiment work ran within the grace period, in this process or (via Redis) any other."""
+    if time.monotonic() < _live_sentiment_until:
+        return True
+    try:
+        return bool(get_redis().exists(LIVE_SENTIMENT_KEY))
+    except Exception:  # noqa: BLE001
+        logger.warning("live sentiment marker unavailable", exc_info=True)
+        return False
+
+
+@contextmanager
+def exclusive(name: str, timeout: int) -> Iterator[bool]:
+    """Hold the Redis lock ``name`` (expiring after ``timeout`` seconds) for the block.
+
+    Yields ``False`` if another holder has it. If Redis is unreachable it yields ``True``
+    so periodic jobs keep running, just without mutual exclusion.
+    """
+    try:
+        lock = get_redis().lock(name, timeout=timeout)
+        acquired = lock.acquire(blocking=False)
+    except Exception:  # noqa: BLE001
+        logger.warning("lock %s unavailable, running without it", name, exc_info=True)
+        yield True
+        return
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except Exception:  # noqa: BLE001 - the lock expires on its own
+                logger.warning("could not release lock %s", name, exc_info=True)
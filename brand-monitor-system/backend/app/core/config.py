@@ -1,16 +1,53 @@
+from typing import List
+
 from pydantic_settings import BaseSettings
 
+from .providers import Provider
+
 
 class Settings(BaseSettings):
     database_url: str
+    database_replica_urls: List[str] = []
+    replica_max_lag_seconds: float = 5.0
+    replica_lag_check_seconds: float = 2.0
+    replica_probe_timeout_seconds: float = 2.0
+    read_after_write_pin_seconds: float = 10.0
+    dashboard_auth_cache_seconds: float = 30.0
     redis_url: str
     apify_api_token: str
     anthropic_api_key: str
     secret_key: str
     environment: str = "development"
+    ingest_chunk_size: int = 500
+    dataset_page_size: int = 5000
+    mention_content_max_chars: int = 4000
+    webhook_lease_seconds: int = 300
+    rate_limit_enabled: bool = True
+    apify_max_concurrent_runs: int = 25
+    scrape_claim_timeout_seconds: int = 300
+    reconcile_after_seconds: int = 900
+    reconcile_batch_size: int = 100
+    apify_run_cache_seconds: int = 30
+    story_similarity_threshold: float = 0.25
+    story_merge_threshold: float = 0.3
+    story_window_hours: int = 72
+    story_batch_size: int = 1000
+    story_sample_size: int = 3
+    sentiment_live_grace_seconds: int = 60
+    sentiment_backfill_batch_size: int = 10000
+    sentiment_backfill_request_size: int = 20
+    sentiment_backfill_max_attempts: int = 3
 
     class Config:
         env_file = ".env"
 
 
-settings = Settings()
+settings_provider: Provider[Settings] = Provider("settings", Settings, after_fork=lambda _: None)
+get_settings = settings_provider.get
+
+
+def __getattr__(name: str):
+    # Backwards compatible ``from .config import settings`` (resolves eagerly at that import).
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
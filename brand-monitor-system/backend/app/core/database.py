@@ -1,18 +1,49 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
-from .config import settings
+from .config import get_settings
+from .metrics import instrument_engine
+from .providers import Provider
 
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _create_engine() -> Engine:
+    engine = create_engine(get_settings().database_url)
+    instrument_engine(engine)
+    return engine
+
+
+def _dispose_after_fork(engine: Engine) -> None:
+    # Drop pooled connections inherited from the parent without closing the parent's sockets.
+    engine.dispose(close=False)
+
+
+engine_provider: Provider[Engine] = Provider("engine", _create_engine, after_fork=_dispose_after_fork)
+get_engine = engine_provider.get
+
+session_factory: Provider[sessionmaker] = Provider(
+    "session_factory",
+    lambda: sessionmaker(autocommit=False, autoflush=False, bind=get_engine()),
+    after_fork=lambda _: None,
+)
 Base = declarative_base()
 
 
+def SessionLocal() -> Session:
+    """Open a session on the lazily created primary engine."""
+    return session_factory.get()()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
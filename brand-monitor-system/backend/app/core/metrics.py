@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "brand_monitor_pipeline_stage_seconds",
+    "Time spent in each ingest pipeline stage.",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+PIPELINE_STAGE_ITEMS = Counter(
+    "brand_monitor_pipeline_stage_items_total",
+    "Items (rows, mentions, alerts) handled by each pipeline stage.",
+    ["stage"],
+)
+INGEST_CONTENT_BYTES = Counter(
+    "brand_monitor_ingest_content_bytes_total",
+    "Title/content bytes of dataset items as delivered (raw) and as stored after normalization.",
+    ["stage"],
+)
+INGEST_DROPPED_ITEMS = Counter(
+    "brand_monitor_ingest_dropped_items_total",
+    "Dataset items skipped by pre-ingest normalization.",
+    ["reason"],
+)
+EXTERNAL_CALL_SECONDS = Histogram(
+    "brand_monitor_external_call_seconds",
+    "Latency of Apify and Anthropic API calls.",
+    ["service", "operation", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+ANTHROPIC_TOKENS = Counter(
+    "brand_monitor_anthropic_tokens_total",
+    "Tokens consumed by Anthropic calls.",
+    ["direction"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "brand_monitor_http_request_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "brand_monitor_db_queries_per_request",
+    "Number of SQL statements executed while serving a request.",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_QUERY_SECONDS_PER_REQUEST = Histogram(
+    "brand_monitor_db_query_seconds_per_request",
+    "Total SQL execution time while serving a request.",
+    ["route"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "brand_monitor_db_query_seconds",
+    "Latency of individual SQL statements.",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def observe_stage(stage: str, items: int | None = None) -> Iterator[None]:
+    """Time a pipeline stage; ``items`` (if known up front) feeds the per-stage item counter."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        PIPELINE_STAGE_SECONDS.labels(stage).observe(time.perf_counter() - started)
+        if items:
+            PIPELINE_STAGE_ITEMS.labels(stage).inc(items)
+
+
+def record_stage_items(stage: str, items: int) -> None:
+    PIPELINE_STAGE_ITEMS.labels(stage).inc(items)
+
+
+def record_normalization(bytes_in: int, bytes_out: int, dropped: dict[str, int]) -> None:
+    INGEST_CONTENT_BYTES.labels("raw").inc(bytes_in)
+    INGEST_CONTENT_BYTES.labels("stored").inc(bytes_out)
+    for reason, count in dropped.items():
+        INGEST_DROPPED_ITEMS.labels(reason).inc(count)
+
+
+@contextmanager
+def observe_external_call(service: str, operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        EXTERNAL_CALL_SECONDS.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+def timed_external_call(service: str, operation: str) -> Callable:
+    """Decorator form of :func:`observe_external_call`."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe_external_call(service, operation):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_anthropic_usage(usage) -> None:
+    """Count tokens from an Anthropic ``response.usage`` object, tolerating SDKs without it."""
+    if usage is None:
+        return
+    ANTHROPIC_TOKENS.labels("input").inc(getattr(usage, "input_tokens", 0) or 0)
+    ANTHROPIC_TOKENS.labels("output").inc(getattr(usage, "output_tokens", 0) or 0)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement on ``engine`` and attribute it to the active request, if any."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        operation = statement.lstrip()[:6].upper()
+        DB_QUERY_SECONDS.labels(operation).observe(elapsed)
+
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += elapsed
+
+
+def _route_template(app, scope) -> str:
+    """Return the path template (``/api/v1/scrape/status/{scrape_job_id}``) to keep label cardinality bounded.
+
+    The router leaves the route it matched in ``scope``; the route table is only scanned
+    when it didn't (requests that failed before or outside routing).
+    """
+    path = getattr(scope.get("route"), "path", None)
+    if path is not None:
+        return path
+    for candidate in app.router.routes:
+        path = getattr(candidate, "path", None)
+        if path is not None and candidate.matches(scope)[0] == Match.FULL:
+            return path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency and per-request SQL counts by route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _query_stats.reset(token)
+            route = _route_template(scope["app"], scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(stats.count)
+            DB_QUERY_SECONDS_PER_REQUEST.labels(route).observe(stats.seconds)
+
+
+def multiprocess_enabled() -> bool:
+    """True when ``PROMETHEUS_MULTIPROC_DIR`` is set, i.e. every process writes its samples to shared files."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def mark_process_dead(pid: int | None = None) -> None:
+    """Drop a finished process's live-gauge files; call from worker-exit hooks in multiprocess mode."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Prometheus text for this process, or aggregated over all API and Celery processes in multiprocess mode."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, Generic, List, TypeVar
+
+T = TypeVar("T")
+
+_registry: List["Provider"] = []
+
+
+class Provider(Generic[T]):
+    """Lazily built, per-process singleton.
+
+    ``factory`` runs on first :meth:`get`, not at import. After ``fork`` the child
+    either keeps the instance and runs ``after_fork`` on it (e.g. to reset an engine
+    pool) or, without a hook, drops it so the child builds its own on next use.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], T],
+        after_fork: Callable[[T], None] | None = None,
+    ):
+        self.name = name
+        self._factory = factory
+        self._after_fork = after_fork
+        self._instance: T | None = None
+        self._override: T | None = None
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def get(self) -> T:
+        if self._override is not None:
+            return self._override
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def override(self, instance: T | None) -> None:
+        """Serve ``instance`` instead of the factory product (tests, benchmarks); ``None`` clears it."""
+        self._override = instance
+
+    def reset(self) -> None:
+        with self._lock:
+            self._instance = None
+
+    def _handle_fork(self) -> None:
+        self._lock = threading.Lock()
+        if self._instance is None:
+            return
+        if self._after_fork is not None:
+            self._after_fork(self._instance)
+        else:
+            self._instance = None
+
+
+def reset_after_fork() -> None:
+    """Make every provider safe to use in a freshly forked child process."""
+    for provider in _registry:
+        provider._handle_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_after_fork)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict
+
+from fastapi import HTTPException, Request, status
+
+from .cache import get_redis
+from .config import get_settings
+from .providers import Provider
+
+logger = logging.getLogger(__name__)
+
+BUCKET_KEY = "brand_monitor:rate:{client_id}:{endpoint_class}"
+STATE_KEY = "rate_limit_headers"
+FAIL_OPEN_SECONDS = 5.0
+
+# Atomic refill-and-take on a hash {tokens, ts}. Uses the server clock so every API
+# process agrees on elapsed time; floats go back as strings (Lua numbers truncate).
+_TOKEN_BUCKET_LUA = """
+local limit = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+  tokens = limit
+  ts = now
+end
+tokens = math.min(limit, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(limit / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+# The script object only carries the source and its SHA; it is built (and hashed) once
+# per process and run on the current Redis client, with EVALSHA falling back to EVAL.
+token_bucket_script = Provider(
+    "token_bucket_script",
+    lambda: get_redis().register_script(_TOKEN_BUCKET_LUA),
+    after_fork=lambda _: None,
+)
+
+
+@dataclass(frozen=True)
+class BucketLimit:
+    """``limit`` requests per ``period`` seconds; the full ``limit`` may be spent as a burst."""
+
+    limit: int
+    period: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.limit / self.period
+
+
+# Used for unknown ``subscription_tier`` values, here and by the scrape queue.
+DEFAULT_TIER = "starter"
+
+# Endpoint classes: ``read`` (lists, dashboard, status), ``analytics`` (aggregations)
+# and ``scrape`` (triggering Apify runs, which cost credits).
+TIER_LIMITS: Dict[str, Dict[str, BucketLimit]] = {
+    "starter": {
+        "read": BucketLimit(60, 60),
+        "analytics": BucketLimit(20, 60),
+        "scrape": BucketLimit(5, 3600),
+    },
+    "professional": {
+        "read": BucketLimit(300, 60),
+        "analytics": BucketLimit(100, 60),
+        "scrape": BucketLimit(30, 3600),
+    },
+    "enterprise": {
+        "read": BucketLimit(1200, 60),
+        "analytics": BucketLimit(400, 60),
+        "scrape": BucketLimit(120, 3600),
+    },
+}
+
+
+def limit_for(tier: str | None, endpoint_class: str) -> BucketLimit:
+    """Limit for ``endpoint_class`` on ``tier``; unknown tiers get :data:`DEFAULT_TIER`."""
+    limits = TIER_LIMITS.get((tier or "").lower(), TIER_LIMITS[DEFAULT_TIER])
+    return limits[endpoint_class]
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: BucketLimit
+    tokens: float
+
+    @property
+    def remaining(self) -> int:
+        return max(0, math.floor(self.tokens))
+
+    @property
+    def reset_seconds(self) -> int:
+        """Seconds until the bucket is full again."""
+        return math.ceil(max(0.0, self.limit.limit - self.tokens) / self.limit.refill_rate)
+
+    @property
+    def retry_after(self) -> int:
+        """Seconds until one more request would be admitted."""
+        return max(1, math.ceil(max(0.0, 1 - self.tokens) / self.limit.refill_rate))
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+_redis_down_until = 0.0
+
+
+def take_token(client_id, tier: str | None, endpoint_class: str) -> RateLimitDecision | None:
+    """Spend one token from ``client_id``'s ``endpoint_class`` bucket.
+
+    Returns ``None`` (admit) when rate limiting is disabled or Redis is unreachable; after
+    a Redis failure the limiter stays open for :data:`FAIL_OPEN_SECONDS` instead of
+    paying a connection timeout on every request.
+    """
+    global _redis_down_until
+    if not get_settings().rate_limit_enabled or time.monotonic() < _redis_down_until:
+        return None
+
+    limit = limit_for(tier, endpoint_class)
+    key = BUCKET_KEY.format(client_id=client_id, endpoint_class=endpoint_class)
+    try:
+        allowed, tokens = token_bucket_script.get()(
+            keys=[key], args=[limit.limit, limit.refill_rate, 1], client=get_redis()
+        )
+    except Exception:  # noqa: BLE001 - never fail requests because the limiter is down
+        _redis_down_until = time.monotonic() + FAIL_OPEN_SECONDS
+        logger.warning("rate limiter unavailable, admitting requests", exc_info=True)
+        return None
+    return RateLimitDecision(allowed=bool(int(allowed)), limit=limit, tokens=float(tokens))
+
+
+def enforce_rate_limit(request: Request, client_id, tier: str | None, endpoint_class: str) -> None:
+    """Take a token for the request or raise ``429`` with ``Retry-After``.
+
+    Admitted requests get their ``RateLimit-*`` headers from :class:`RateLimitHeadersMiddleware`.
+    """
+    decision = take_token(client_id, tier, endpoint_class)
+    if decision is None:
+        return
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded for {endpoint_class} requests",
+            headers=decision.headers(),
+        )
+    setattr(request.state, STATE_KEY, decision.headers())
+
+
+class RateLimitHeadersMiddleware:
+    """ASGI middleware copying the headers recorded by :func:`enforce_rate_limit` onto the response.
+
+    Routes return their own ``Response`` objects, so dependencies cannot set headers directly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                extra = scope.get("state", {}).get(STATE_KEY)
+                if extra:
+                    raw = list(message.get("headers", []))
+                    present = {name.lower() for name, _ in raw}
+                    for name, value in extra.items():
+                        if name.lower().encode("latin-1") not in present:
+                            raw.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+                    message = {**message, "headers": raw}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
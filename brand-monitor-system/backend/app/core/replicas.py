@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql import Select
+
+from .cache import get_redis
+from .config import get_settings
+from .database import get_engine
+from .metrics import instrument_engine
+from .providers import Provider
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+PRIMARY_HEADER = "x-read-from"
+PRIMARY_PIN_KEY = "brand_monitor:primary_pin:{client_id}"
+
+logger = logging.getLogger(__name__)
+
+_PG_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaPool:
+    """Replica engines with cached, lag-aware health checks and round-robin selection."""
+
+    def __init__(
+        self,
+        urls: List[str],
+        max_lag_seconds: float,
+        check_interval: float,
+        probe_timeout: float = 2.0,
+    ):
+        self.engines: List[Engine] = []
+        # Lag probes use their own unpooled, short-timeout connections so an unreachable
+        # replica fails fast instead of hanging the request that probes it.
+        self._probe_engines: List[Engine | None] = []
+        for url in urls:
+            engine = create_engine(url)
+            instrument_engine(engine)
+            self.engines.append(engine)
+            self._probe_engines.append(
+                create_engine(
+                    url,
+                    poolclass=NullPool,
+                    connect_args={
+                        # libpq rounds connect_timeout up to 2 seconds.
+                        "connect_timeout": max(2, int(probe_timeout)),
+                        "options": f"-c statement_timeout={int(probe_timeout * 1000)}",
+                    },
+                )
+                if engine.dialect.name == "postgresql"
+                else None
+            )
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._lag: Dict[int, tuple[float, float | None]] = {}
+        self._probe_locks = [threading.Lock() for _ in self.engines]
+        self._cycle = itertools.cycle(range(len(self.engines)))
+        self._lock = threading.Lock()
+
+    def measure_lag(self, index: int) -> float | None:
+        """Replication lag in seconds, ``0`` for non-Postgres stand-ins, ``None`` if unreachable."""
+        probe_engine = self._probe_engines[index]
+        if probe_engine is None:
+            return 0.0
+        try:
+            with probe_engine.connect() as connection:
+                return float(connection.execute(_PG_LAG_QUERY).scalar() or 0)
+        except Exception:  # noqa: BLE001 - any failure marks the replica unhealthy
+            return None
+
+    def lag(self, index: int) -> float | None:
+        """Cached lag of replica ``index``, re-probed at most every ``check_interval``.
+
+        One request thread probes an expired entry while the others keep using the last
+        measurement; only the very first probe of a replica is waited for.
+        """
+        checked_at, lag = self._lag.get(index, (None, None))
+        if checked_at is not None and time.monotonic() - checked_at < self.check_interval:
+            return lag
+        probe_lock = self._probe_locks[index]
+        if not probe_lock.acquire(blocking=checked_at is None):
+            return lag
+        try:
+            checked_at, lag = self._lag.get(index, (None, None))
+            if checked_at is None or time.monotonic() - checked_at >= self.check_interval:
+                lag = self.measure_lag(index)
+                self._lag[index] = (time.monotonic(), lag)
+            return lag
+        finally:
+            probe_lock.release()
+
+    def choose(self) -> Engine | None:
+        """Next replica within the lag budget, or ``None`` to fall back to the primary."""
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+            lag = self.lag(index)
+            if lag is not None and lag <= self.max_lag_seconds:
+                return self.engines[index]
+        return None
+
+    def dispose(self, close: bool = True) -> None:
+        for engine in self.engines:
+            engine.dispose(close=close)
+
+    def after_fork(self) -> None:
+        """Drop inherited pooled connections and any probe lock held by a parent thread."""
+        self.dispose(close=False)
+        self._probe_locks = [threading.Lock() for _ in self.engines]
+
+
+def _create_replica_pool() -> ReplicaPool:
+    settings = get_settings()
+    return ReplicaPool(
+        settings.database_replica_urls,
+        max_lag_seconds=settings.replica_max_lag_seconds,
+        check_interval=settings.replica_lag_check_seconds,
+        probe_timeout=settings.replica_probe_timeout_seconds,
+    )
+
+
+replica_pool: Provider[ReplicaPool] = Provider(
+    "replica_pool",
+    _create_replica_pool,
+    after_fork=lambda pool: pool.after_fork(),
+)
+
+
+class _PrimaryPins:
+    """Clients that wrote recently and must read from the primary until the pin expires.
+
+    Pins live in Redis so they hold across API processes, and in-process as well so the
+    process that served the write honours them while Redis is down.
+    """
+
+    def __init__(self):
+        self._expires: Dict[object, float] = {}
+        self._lock = threading.Lock()
+
+    def pin(self, client_id, seconds: float | None = None) -> None:
+        if seconds is None:
+            seconds = get_settings().read_after_write_pin_seconds
+        with self._lock:
+            self._expires[client_id] = time.monotonic() + seconds
+        try:
+            get_redis().set(PRIMARY_PIN_KEY.format(client_id=client_id), "1", px=max(1, int(seconds * 1000)))
+        except Exception:  # noqa: BLE001
+            logger.warning("could not record primary pin for client %s", client_id, exc_info=True)
+
+    def _pinned_here(self, client_id) -> bool:
+        expires = self._expires.get(client_id)
+        if expires is None:
+            return False
+        if expires > time.monotonic():
+            return True
+        with self._lock:
+            self._expires.pop(client_id, None)
+        return False
+
+    def is_pinned(self, client_id) -> bool:
+        if self._pinned_here(client_id):
+            return True
+        try:
+            return bool(get_redis().exists(PRIMARY_PIN_KEY.format(client_id=client_id)))
+        except Exception:  # noqa: BLE001
+            logger.warning("primary pin unavailable for client %s", client_id, exc_info=True)
+            return False
+
+
+primary_pins = _PrimaryPins()
+pin_primary = primary_pins.pin
+
+
+class RoutingSession(Session):
+    """Session that sends SELECTs to ``info["replica"]`` and everything else to the primary.
+
+    Flushes, DML and any statement issued after :func:`use_primary` go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None or self._flushing or not isinstance(clause, Select):
+            return get_engine()
+        return replica
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: Session) -> None:
+    if session.info.get("dirty"):
+        session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _mark_dirty(session: Session, flush_context, instances) -> None:
+    session.info["dirty"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["dirty"] = True
+
+
+routing_session_factory: Provider[sessionmaker] = Provider(
+    "routing_session_factory",
+    lambda: sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False),
+    after_fork=lambda _: None,
+)
+
+
+def use_primary(db: Session) -> None:
+    """Send every further statement on ``db`` to the primary (read-your-writes)."""
+    db.info["replica"] = None
+
+
+def route_for_client(db: Session, client_id) -> None:
+    """Record the authenticated client and pin it to the primary if it wrote recently."""
+    db.info["client_id"] = client_id
+    if primary_pins.is_pinned(client_id):
+        use_primary(db)
+
+
+def reads_from_replica(db: Session) -> bool:
+    return db.info.get("replica") is not None
+
+
+def read_bind(db: Session) -> Engine:
+    """Engine that SELECTs on ``db`` currently go to (for sibling sessions that must match)."""
+    return db.info.get("replica") or get_engine()
+
+
+def open_routed_session(request: Request) -> Session:
+    """GET/HEAD requests read from a healthy replica, other methods use the primary.
+
+    Send ``X-Read-From: primary`` to force the primary for a read.
+    """
+    db: Session = routing_session_factory.get()()
+    if (
+        request.method in READ_METHODS
+        and request.headers.get(PRIMARY_HEADER, "").lower() != "primary"
+        and get_settings().database_replica_urls
+    ):
+        db.info["replica"] = replica_pool.get().choose()
+    return db
+
+
+def close_routed_session(db: Session) -> None:
+    """Close ``db``, pinning its client to the primary for ``read_after_write_pin_seconds`` if it wrote."""
+    if db.info.get("wrote") and db.info.get("client_id") is not None:
+        pin_primary(db.info["client_id"])
+    db.close()
+
+
+def get_routed_db(request: Request):
+    """Request-scoped routing session dependency; see :func:`open_routed_session`."""
+    db = open_routed_session(request)
+    try:
+        yield db
+    finally:
+        close_routed_session(db)
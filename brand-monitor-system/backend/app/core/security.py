@@ -4,7 +4,7 @@ from typing import Any
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from .config import settings
+from .config import get_settings
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -28,14 +28,14 @@ def create_access_token(subject: str, expires_delta: timedelta | None = None) ->
 
     expire = datetime.utcnow() + expires_delta
     to_encode: dict[str, Any] = {"sub": subject, "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_settings().secret_key, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict[str, Any]:
     """Decode a JWT token and return its claims."""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, get_settings().secret_key, algorithms=[ALGORITHM])
     except JWTError as exc:  # pragma: no cover - library guard
         raise ValueError("Invalid token") from exc
     return payload
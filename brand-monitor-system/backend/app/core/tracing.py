@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+try:  # OpenTelemetry is optional; spans become no-ops without it.
+    from opentelemetry import baggage, context, propagate, trace
+except ImportError:  # pragma: no cover - depends on deployment
+    trace = None
+
+SCRAPE_JOB_KEY = "scrape_job.id"
+
+
+@contextmanager
+def span(name: str, scrape_job_id: Any = None, **attributes: Any) -> Iterator[None]:
+    """Open a span named ``name``; ``scrape_job_id`` is set as an attribute and as baggage.
+
+    Baggage carries the scrape job id into any Celery task published from inside the span.
+    """
+    if trace is None:
+        yield
+        return
+
+    token = None
+    if scrape_job_id is not None:
+        token = context.attach(baggage.set_baggage(SCRAPE_JOB_KEY, str(scrape_job_id)))
+    else:
+        scrape_job_id = baggage.get_baggage(SCRAPE_JOB_KEY)
+
+    try:
+        with trace.get_tracer("brand_monitor").start_as_current_span(name) as current:
+            if scrape_job_id is not None:
+                current.set_attribute(SCRAPE_JOB_KEY, str(scrape_job_id))
+            for key, value in attributes.items():
+                if value is not None:
+                    current.set_attribute(key, value)
+            yield
+    finally:
+        if token is not None:
+            context.detach(token)
+
+
+def inject_headers(headers: Dict[str, Any]) -> None:
+    """Write the current trace context and baggage into a message header carrier."""
+    if trace is not None:
+        propagate.inject(headers)
+
+
+def attach_headers(headers: Dict[str, Any] | None):
+    """Make the trace context carried by ``headers`` current; returns a token for :func:`detach`."""
+    if trace is None or not headers:
+        return None
+    return context.attach(propagate.extract(headers))
+
+
+def detach(token) -> None:
+    if token is not None:
+        context.detach(token)
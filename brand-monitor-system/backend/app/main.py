@@ -1,7 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.v1 import alerts, analytics, auth, mentions, scraping, usage, webhooks
+from .api.v1 import alerts, analytics, auth, dashboard, mentions, scraping, sentiment, stories, usage, webhooks
+from .core.metrics import MetricsMiddleware, render_metrics
+from .core.rate_limit import RateLimitHeadersMiddleware
 
 
 app = FastAPI(title="Brand Monitor API", version="1.0.0")
@@ -13,16 +15,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RateLimitHeadersMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(scraping.router, prefix="/api/v1/scrape", tags=["scraping"])
 app.include_router(webhooks.router, prefix="/api/v1/webhooks", tags=["webhooks"])
 app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["alerts"])
 app.include_router(mentions.router, prefix="/api/v1/mentions", tags=["mentions"])
+app.include_router(stories.router, prefix="/api/v1/stories", tags=["stories"])
+app.include_router(sentiment.router, prefix="/api/v1/sentiment", tags=["sentiment"])
 app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["analytics"])
 app.include_router(usage.router, prefix="/api/v1/usage", tags=["usage"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
 
 
 @app.get("/")
 def root():
     return {"message": "Brand Monitor API", "version": "1.0.0"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -2,12 +2,21 @@ from .alert import Alert
 from .client import Client
 from .mention import Mention
 from .scrape_job import ScrapeJob
+from .sentiment_backfill import SentimentBackfillItem
+from .sentiment_batch import SentimentBatch
+from .story import Story, StoryTermStats
 from .usage import UsageTracking
+from .webhook_delivery import WebhookDelivery
 
 __all__ = [
     "Alert",
     "Client",
     "Mention",
     "ScrapeJob",
+    "SentimentBackfillItem",
+    "SentimentBatch",
+    "Story",
+    "StoryTermStats",
     "UsageTracking",
+    "WebhookDelivery",
 ]
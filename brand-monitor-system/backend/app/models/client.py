@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 
 from sqlalchemy import Column, DateTime, Integer, Numeric, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -20,10 +20,13 @@ class Client(Base):
     monthly_mention_limit = Column(Integer, nullable=False)
     apify_budget_limit = Column(Numeric(10, 2))
     status = Column(String(20), default="active")
+    # ISO 639-1 codes to keep at ingest; NULL keeps every language.
+    languages = Column(JSONB)
     created_at = Column(DateTime)
     updated_at = Column(DateTime)
 
     scrape_jobs = relationship("ScrapeJob", back_populates="client")
     mentions = relationship("Mention", back_populates="client")
     alerts = relationship("Alert", back_populates="client")
+    stories = relationship("Story", back_populates="client")
     usage_records = relationship("UsageTracking", back_populates="client")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -11,21 +11,34 @@ from ..core.database import Base
 
 class Mention(Base):
     __tablename__ = "mentions"
+    __table_args__ = (
+        Index("ix_mentions_story_id", "story_id"),
+        Index(
+            "ix_mentions_unclustered",
+            "client_id",
+            "discovered_at",
+            postgresql_where=text("story_id IS NULL"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"))
     scrape_job_id = Column(UUID(as_uuid=True), ForeignKey("scrape_jobs.id"))
+    story_id = Column(UUID(as_uuid=True), ForeignKey("stories.id", ondelete="SET NULL"))
     source_type = Column(String(50), nullable=False)
     source_url = Column(Text, nullable=False)
     title = Column(Text)
     content = Column(Text, nullable=False)
     author = Column(String(255))
+    language = Column(String(8))
     published_at = Column(DateTime)
     discovered_at = Column(DateTime)
     sentiment = Column(String(20))
     sentiment_score = Column(Numeric(3, 2))
     confidence_score = Column(Numeric(3, 2))
     entities = Column(JSONB)
+    # Sentiment copied from the mention's story rather than analysed on its own.
+    sentiment_inherited = Column(Boolean, default=False)
     is_duplicate = Column(Boolean, default=False)
     duplicate_of = Column(UUID(as_uuid=True), ForeignKey("mentions.id"))
     screenshot_url = Column(Text)
@@ -34,3 +47,4 @@ class Mention(Base):
 
     client = relationship("Client", back_populates="mentions")
     scrape_job = relationship("ScrapeJob", back_populates="mentions")
+    story = relationship("Story", back_populates="mentions", foreign_keys=[story_id])
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, Numeric, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from ..core.database import Base
@@ -16,7 +16,11 @@ class ScrapeJob(Base):
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"))
     source_id = Column(UUID(as_uuid=True), nullable=True)
     apify_run_id = Column(String(100))
+    source_type = Column(String(50))
+    run_config = Column(JSONB)
     status = Column(String(50), nullable=False)
+    # When the dispatcher moved the job to ``pending``; stale claims without a run go back to ``queued``.
+    claimed_at = Column(DateTime)
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
     mentions_found = Column(Integer, default=0)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class SentimentBackfillItem(Base):
+    """Durable queue entry for one mention awaiting backfill sentiment.
+
+    ``queued`` -> ``submitted`` (in ``batch_id`` as request ``request_id``, slot ``position``)
+    -> ``done``, or back to ``queued`` on a failed request until ``failed`` after too many attempts.
+    """
+
+    __tablename__ = "sentiment_backfill_queue"
+    __table_args__ = (
+        Index("ix_sentiment_backfill_queue_status", "status", "enqueued_at"),
+        Index("ix_sentiment_backfill_queue_batch", "batch_id", "status"),
+        Index("ix_sentiment_backfill_queue_client", "client_id", "status"),
+    )
+
+    mention_id = Column(UUID(as_uuid=True), ForeignKey("mentions.id", ondelete="CASCADE"), primary_key=True)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    batch_id = Column(UUID(as_uuid=True), ForeignKey("sentiment_batches.id", ondelete="SET NULL"))
+    request_id = Column(String(64))
+    position = Column(Integer)
+    attempts = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text)
+    enqueued_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+    batch = relationship("SentimentBatch", back_populates="items")
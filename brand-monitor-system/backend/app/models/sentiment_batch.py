@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class SentimentBatch(Base):
+    """One asynchronous model batch job submitted by the sentiment backfill lane."""
+
+    __tablename__ = "sentiment_batches"
+    __table_args__ = (Index("ix_sentiment_batches_status", "status", "submitted_at"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    provider_batch_id = Column(String(100), unique=True)
+    status = Column(String(20), nullable=False, default="submitting")
+    request_count = Column(Integer, nullable=False, default=0)
+    mention_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime)
+    submitted_at = Column(DateTime)
+    collected_at = Column(DateTime)
+
+    items = relationship("SentimentBackfillItem", back_populates="batch")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, Numeric, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class Story(Base):
+    """A cluster of related mentions about the same event, built incrementally per client."""
+
+    __tablename__ = "stories"
+    __table_args__ = (Index("ix_stories_client_last_seen", "client_id", "last_seen_at"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)
+    title = Column(Text)
+    representative_mention_id = Column(UUID(as_uuid=True), ForeignKey("mentions.id", ondelete="SET NULL", use_alter=True))
+    # Mean hashed TF-IDF vector of the members, float32 bytes (see processors/story_clusterer.py).
+    centroid = Column(LargeBinary, nullable=False)
+    mention_count = Column(Integer, nullable=False, default=0)
+    sources = Column(JSONB)
+    sentiment = Column(String(20))
+    sentiment_score = Column(Numeric(3, 2))
+    sampled_count = Column(Integer, nullable=False, default=0)
+    sampled_at_count = Column(Integer, nullable=False, default=0)
+    alerted_at = Column(DateTime)
+    first_seen_at = Column(DateTime)
+    last_seen_at = Column(DateTime)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+    client = relationship("Client", back_populates="stories")
+    mentions = relationship("Mention", back_populates="story", foreign_keys="Mention.story_id")
+
+
+class StoryTermStats(Base):
+    """Running document frequencies of a client's clustered mentions, for IDF weights that don't depend on batch size."""
+
+    __tablename__ = "story_term_stats"
+
+    client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True)
+    documents = Column(Integer, nullable=False, default=0)
+    # Mentions containing each hashed feature, float32 bytes (see processors/story_clusterer.py).
+    document_frequency = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime)
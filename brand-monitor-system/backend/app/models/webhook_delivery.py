@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from ..core.database import Base
+
+
+class WebhookDelivery(Base):
+    """Ledger row claiming one Apify ``(run_id, dataset_id)`` delivery for processing."""
+
+    __tablename__ = "webhook_deliveries"
+    __table_args__ = (UniqueConstraint("apify_run_id", "dataset_id", name="uq_webhook_deliveries_run_dataset"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    scrape_job_id = Column(UUID(as_uuid=True), ForeignKey("scrape_jobs.id", ondelete="CASCADE"), nullable=False)
+    apify_run_id = Column(String(100), nullable=False)
+    dataset_id = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False, default="processing")
+    items_committed = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=1)
+    lease_expires_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+    scrape_job = relationship("ScrapeJob")
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from sqlalchemy.orm import Session
 
+from ..core.cache import mark_client_ingest
+from ..core.metrics import observe_stage
 from ..models.alert import Alert
 
 
@@ -9,17 +13,38 @@ class AlertGenerator:
     """Create alert records based on processed mentions."""
 
     def create_negative_sentiment_alert(self, db: Session, mention, severity: str = "medium") -> Alert:
-        alert = Alert(
-            client_id=mention.client_id,
-            mention_id=mention.id,
-            alert_type="negative_sentiment",
-            severity=severity,
-            title=f"Negative mention detected for {mention.source_type}",
-            description=mention.title or mention.content[:140],
-        )
-        db.add(alert)
-        db.commit()
-        db.refresh(alert)
+        with observe_stage("alert_generation", items=1):
+            alert = Alert(
+                client_id=mention.client_id,
+                mention_id=mention.id,
+                alert_type="negative_sentiment",
+                severity=severity,
+                title=f"Negative mention detected for {mention.source_type}",
+                description=mention.title or mention.content[:140],
+            )
+            db.add(alert)
+            db.commit()
+            db.refresh(alert)
+        mark_client_ingest(alert.client_id)
+        return alert
+
+    def create_negative_story_alert(self, db: Session, story, severity: str = "medium") -> Alert:
+        """One alert per negative story rather than one per mention in it."""
+        with observe_stage("alert_generation", items=1):
+            sources = ", ".join(sorted(story.sources or {})) or "unknown sources"
+            alert = Alert(
+                client_id=story.client_id,
+                mention_id=story.representative_mention_id,
+                alert_type="negative_story",
+                severity=severity,
+                title=f"Negative story: {story.title or 'untitled'}"[:255],
+                description=f"{story.mention_count} related mention(s) across {sources}",
+            )
+            story.alerted_at = datetime.utcnow()
+            db.add(alert)
+            db.commit()
+            db.refresh(alert)
+        mark_client_ingest(alert.client_id)
         return alert
 
 
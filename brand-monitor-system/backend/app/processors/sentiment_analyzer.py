@@ -1,20 +1,35 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterator, List, Sequence, Tuple
 
-from anthropic import Anthropic
+from ..core.cache import mark_live_sentiment
+from ..core.config import get_settings
+from ..core.metrics import observe_external_call, observe_stage, record_anthropic_usage
+from ..core.providers import Provider
 
-from ..core.config import settings
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 
-class SentimentAnalyzer:
-    def __init__(self):
-        self.client = Anthropic(api_key=settings.anthropic_api_key)
+def _create_anthropic_client() -> Anthropic:
+    from anthropic import Anthropic
 
-    def analyze_batch(self, mentions: List[Dict]) -> List[Dict]:
-        """Analyze sentiment for a batch of mentions"""
+    return Anthropic(api_key=get_settings().anthropic_api_key)
+
+
+anthropic_client_provider: Provider[Anthropic] = Provider("anthropic_client", _create_anthropic_client)
+
+MODEL = "claude-sonnet-4-20250514"
+MAX_TOKENS = 4000
+
+
+class SentimentAnalyzer:
+    @property
+    def client(self) -> Anthropic:
+        return anthropic_client_provider.get()
 
+    def build_prompt(self, mentions: Sequence[Dict]) -> str:
         mentions_text = "\n\n".join(
             [
                 (
@@ -26,7 +41,7 @@ class SentimentAnalyzer:
             ]
         )
 
-        prompt = f"""Analyze the sentiment of these brand mentions and return a JSON array with sentiment analysis for each mention.
+        return f"""Analyze the sentiment of these brand mentions and return a JSON array with sentiment analysis for each mention.
 
 {mentions_text}
 
@@ -39,14 +54,60 @@ For each mention, provide:
 
 Return ONLY valid JSON array, no other text."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}],
-        )
+    def request_params(self, mentions: Sequence[Dict]) -> Dict:
+        """``messages.create`` arguments for one batch of mentions"""
+        return {
+            "model": MODEL,
+            "max_tokens": MAX_TOKENS,
+            "messages": [{"role": "user", "content": self.build_prompt(mentions)}],
+        }
+
+    def analyze_batch(self, mentions: List[Dict]) -> List[Dict]:
+        """Analyze sentiment for a batch of mentions (the live lane; pauses backfill submissions)"""
+
+        mark_live_sentiment()
+        with observe_stage("sentiment_batch", items=len(mentions)):
+            with observe_external_call("anthropic", "messages.create"):
+                response = self.client.messages.create(**self.request_params(mentions))
+            record_anthropic_usage(getattr(response, "usage", None))
 
-        results = json.loads(response.content[0].text)
+            results = json.loads(response.content[0].text)
         return results
 
+    def submit_batch(self, requests: Sequence[Tuple[str, Sequence[Dict]]]) -> str:
+        """Submit ``(custom_id, mentions)`` requests as one asynchronous message batch; returns its id
+
+        The pinned ``anthropic`` release has Message Batches under ``client.beta`` only.
+        """
+        with observe_external_call("anthropic", "messages.batches.create"):
+            batch = self.client.beta.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": self.request_params(mentions)}
+                    for custom_id, mentions in requests
+                ]
+            )
+        return batch.id
+
+    def batch_status(self, batch_id: str) -> str:
+        """``in_progress``, ``canceling`` or ``ended``"""
+        with observe_external_call("anthropic", "messages.batches.retrieve"):
+            batch = self.client.beta.messages.batches.retrieve(batch_id)
+        return batch.processing_status
+
+    def batch_results(self, batch_id: str) -> Iterator[Tuple[str, List[Dict] | None, str | None]]:
+        """Yield ``(custom_id, results, error)`` for each request of an ended batch"""
+        with observe_external_call("anthropic", "messages.batches.results"):
+            entries = self.client.beta.messages.batches.results(batch_id)
+        for entry in entries:
+            result = entry.result
+            if result.type != "succeeded":
+                yield entry.custom_id, None, result.type
+                continue
+            record_anthropic_usage(getattr(result.message, "usage", None))
+            try:
+                yield entry.custom_id, json.loads(result.message.content[0].text), None
+            except (ValueError, IndexError, AttributeError) as exc:
+                yield entry.custom_id, None, f"unparseable response: {exc}"
+
 
 analyzer = SentimentAnalyzer()
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import bindparam, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..core.cache import exclusive, live_sentiment_active, mark_client_ingest
+from ..core.config import get_settings
+from ..core.metrics import observe_stage
+from ..models.mention import Mention
+from ..models.sentiment_backfill import SentimentBackfillItem
+from ..models.sentiment_batch import SentimentBatch
+from .sentiment_analyzer import analyzer
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_LOCK_KEY = "brand_monitor:sentiment_backfill"
+BACKFILL_LOCK_SECONDS = 900
+WRITEBACK_CHUNK_SIZE = 500
+# A batch row left in ``submitting`` this long means the submitter died mid-call.
+STALE_SUBMISSION_SECONDS = 3600
+
+# Core executemany UPDATE; backfill results never overwrite sentiment the live lane set in the meantime.
+_mentions = Mention.__table__
+_MENTION_WRITEBACK = (
+    update(_mentions)
+    .where(_mentions.c.id == bindparam("b_id"), _mentions.c.sentiment.is_(None))
+    .values(
+        sentiment=bindparam("b_sentiment"),
+        sentiment_score=bindparam("b_sentiment_score"),
+        confidence_score=bindparam("b_confidence_score"),
+        entities=bindparam("b_entities"),
+    )
+)
+
+
+def enqueue_backfill(db: Session, client_id, since: datetime | None = None) -> int:
+    """Queue ``client_id``'s mentions that have no sentiment yet (optionally only those discovered since ``since``).
+
+    One ``INSERT ... SELECT``; mentions already in the queue are skipped. Returns the number queued.
+    """
+    now = datetime.utcnow()
+    already_queued = exists().where(SentimentBackfillItem.mention_id == Mention.id)
+    source = select(
+        Mention.id,
+        Mention.client_id,
+        literal("queued"),
+        literal(0),
+        literal(now),
+        literal(now),
+    ).where(
+        Mention.client_id == client_id,
+        Mention.sentiment.is_(None),
+        Mention.is_duplicate.isnot(True),
+        ~already_queued,
+    )
+    if since is not None:
+        source = source.where(Mention.discovered_at >= since)
+
+    result = db.execute(
+        insert(SentimentBackfillItem).from_select(
+            ["mention_id", "client_id", "status", "attempts", "enqueued_at", "updated_at"],
+            source,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def backfill_progress(db: Session, client_id) -> Dict[str, int]:
+    """Queue entries per status for ``client_id``."""
+    rows = (
+        db.query(SentimentBackfillItem.status, func.count(SentimentBackfillItem.mention_id))
+        .filter(SentimentBackfillItem.client_id == client_id)
+        .group_by(SentimentBackfillItem.status)
+        .all()
+    )
+    progress = {"queued": 0, "submitted": 0, "done": 0, "failed": 0}
+    progress.update({status: count for status, count in rows})
+    return progress
+
+
+def _requeue(db: Session, batch: SentimentBatch, error: str) -> None:
+    now = datetime.utcnow()
+    db.query(SentimentBackfillItem).filter(
+        SentimentBackfillItem.batch_id == batch.id,
+        SentimentBackfillItem.status == "submitted",
+    ).update(
+        {
+            SentimentBackfillItem.status: "queued",
+            SentimentBackfillItem.batch_id: None,
+            SentimentBackfillItem.request_id: None,
+            SentimentBackfillItem.position: None,
+            SentimentBackfillItem.error_message: error,
+            SentimentBackfillItem.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    batch.status = "failed"
+    db.commit()
+
+
+def submit_backfill(db: Session) -> SentimentBatch | None:
+    """Submit the oldest queued mentions as one asynchronous batch job.
+
+    Returns ``None`` without touching the queue while live sentiment work is active
+    (live mentions have strict priority) or when nothing is queued.
+    """
+    if live_sentiment_active():
+        return None
+
+    settings = get_settings()
+    rows = (
+        db.query(Mention.id, Mention.title, Mention.content)
+        .join(SentimentBackfillItem, SentimentBackfillItem.mention_id == Mention.id)
+        .filter(SentimentBackfillItem.status == "queued")
+        .order_by(SentimentBackfillItem.enqueued_at, SentimentBackfillItem.mention_id)
+        .limit(settings.sentiment_backfill_batch_size)
+        .all()
+    )
+    if not rows:
+        return None
+
+    now = datetime.utcnow()
+    request_size = settings.sentiment_backfill_request_size
+    batch = SentimentBatch(status="submitting", mention_count=len(rows), created_at=now)
+    db.add(batch)
+    db.flush()
+
+    requests: List[Tuple[str, List[Dict]]] = []
+    assignments: List[Dict] = []
+    for start in range(0, len(rows), request_size):
+        chunk = rows[start:start + request_size]
+        request_id = f"r{len(requests)}"
+        requests.append((request_id, [{"title": row.title or "N/A", "content": row.content or ""} for row in chunk]))
+        assignments.extend(
+            {
+                "mention_id": row.id,
+                "status": "submitted",
+                "batch_id": batch.id,
+                "request_id": request_id,
+                "position": position,
+                "updated_at": now,
+            }
+            for position, row in enumerate(chunk)
+        )
+    batch.request_count = len(requests)
+    db.execute(update(SentimentBackfillItem), assignments)
+    db.commit()
+
+    try:
+        provider_batch_id = analyzer.submit_batch(requests)
+    except Exception as exc:  # noqa: BLE001 - the mentions go back to the queue
+        logger.exception("sentiment backfill submission failed")
+        _requeue(db, batch, str(exc))
+        return None
+
+    batch.provider_batch_id = provider_batch_id
+    batch.status = "submitted"
+    batch.submitted_at = datetime.utcnow()
+    db.commit()
+    return batch
+
+
+def _flush(db: Session, mention_updates: List[Dict], item_updates: List[Dict], clients: Set) -> None:
+    """Write one chunk of results and its queue checkpoints in a single transaction.
+
+    Once committed, ``clients`` (those with mentions in the chunk) get a new ingest
+    marker so their cached dashboards pick up the sentiment.
+    """
+    if mention_updates:
+        db.execute(_MENTION_WRITEBACK, mention_updates)
+    if item_updates:
+        db.execute(update(SentimentBackfillItem), item_updates)
+    db.commit()
+    for client_id in clients:
+        mark_client_ingest(client_id)
+    mention_updates.clear()
+    item_updates.clear()
+    clients.clear()
+
+
+def collect_batch(db: Session, batch: SentimentBatch) -> Dict[str, int]:
+    """Write an ended batch's results back with bulk UPDATEs, checkpointing every :data:`WRITEBACK_CHUNK_SIZE` mentions.
+
+    Only queue entries still ``submitted`` are considered, so a collection interrupted
+    part-way resumes where it stopped. Mentions of failed or missing requests are
+    requeued until ``sentiment_backfill_max_attempts``.
+    """
+    counts = {"scored": 0, "retried": 0, "failed": 0}
+    max_attempts = get_settings().sentiment_backfill_max_attempts
+    pending: Dict[str, List[Tuple[object, int]]] = {}
+    client_of: Dict[object, object] = {}
+    for mention_id, client_id, request_id, attempts in (
+        db.query(
+            SentimentBackfillItem.mention_id,
+            SentimentBackfillItem.client_id,
+            SentimentBackfillItem.request_id,
+            SentimentBackfillItem.attempts,
+        )
+        .filter(SentimentBackfillItem.batch_id == batch.id, SentimentBackfillItem.status == "submitted")
+        .order_by(SentimentBackfillItem.request_id, SentimentBackfillItem.position)
+    ):
+        pending.setdefault(request_id, []).append((mention_id, attempts))
+        client_of[mention_id] = client_id
+
+    now = datetime.utcnow()
+    mention_updates: List[Dict] = []
+    item_updates: List[Dict] = []
+    clients: Set = set()
+
+    def retry(members: List[Tuple[object, int]], error: str) -> None:
+        for mention_id, attempts in members:
+            gave_up = attempts + 1 >= max_attempts
+            counts["failed" if gave_up else "retried"] += 1
+            item_updates.append(
+                {
+                    "mention_id": mention_id,
+                    "status": "failed" if gave_up else "queued",
+                    "batch_id": None,
+                    "request_id": None,
+                    "position": None,
+                    "attempts": attempts + 1,
+                    "error_message": error,
+                    "updated_at": now,
+                }
+            )
+
+    if pending:
+        for request_id, results, error in analyzer.batch_results(batch.provider_batch_id):
+            members = pending.pop(request_id, None)
+            if members is None:
+                continue
+            if error is not None:
+                retry(members, error)
+            else:
+                scored = [
+                    (member, result) for member, result in zip(members, results or []) if isinstance(result, dict)
+                ]
+                for (mention_id, _), result in scored:
+                    mention_updates.append(
+                        {
+                            "b_id": mention_id,
+                            "b_sentiment": result.get("sentiment"),
+                            "b_sentiment_score": result.get("sentiment_score"),
+                            "b_confidence_score": result.get("confidence_score"),
+                            "b_entities": result.get("entities"),
+                        }
+                    )
+                    item_updates.append({"mention_id": mention_id, "status": "done", "updated_at": now})
+                    clients.add(client_of[mention_id])
+                counts["scored"] += len(scored)
+                scored_ids = {mention_id for (mention_id, _), _ in scored}
+                missing = [member for member in members if member[0] not in scored_ids]
+                if missing:
+                    retry(missing, "no result for mention")
+
+            if len(item_updates) >= WRITEBACK_CHUNK_SIZE:
+                _flush(db, mention_updates, item_updates, clients)
+
+        for members in pending.values():
+            retry(members, "request missing from batch results")
+
+    _flush(db, mention_updates, item_updates, clients)
+    batch.status = "collected"
+    batch.collected_at = datetime.utcnow()
+    db.commit()
+    return counts
+
+
+def collect_backfill(db: Session) -> Dict[str, int]:
+    """Collect every submitted batch that has ended; requeue submissions that never reached the API."""
+    counts = {"batches": 0, "scored": 0, "retried": 0, "failed": 0}
+
+    stale_before = datetime.utcnow() - timedelta(seconds=STALE_SUBMISSION_SECONDS)
+    for batch in db.query(SentimentBatch).filter(
+        SentimentBatch.status == "submitting", SentimentBatch.created_at < stale_before
+    ):
+        _requeue(db, batch, "submission interrupted")
+
+    submitted = (
+        db.query(SentimentBatch)
+        .filter(SentimentBatch.status == "submitted")
+        .order_by(SentimentBatch.submitted_at)
+        .all()
+    )
+    for batch in submitted:
+        try:
+            if analyzer.batch_status(batch.provider_batch_id) != "ended":
+                continue
+            with observe_stage("sentiment_backfill", items=batch.mention_count):
+                batch_counts = collect_batch(db, batch)
+        except Exception:  # noqa: BLE001 - retried on the next pass, from the last checkpoint
+            logger.exception("could not collect sentiment batch %s", batch.provider_batch_id)
+            db.rollback()
+            continue
+        counts["batches"] += 1
+        for key, value in batch_counts.items():
+            counts[key] += value
+    return counts
+
+
+def run_sentiment_backfill(db: Session) -> Dict[str, int] | None:
+    """Collect finished backfill batches, then submit the next one, under a Redis lock.
+
+    ``None`` if another backfill worker holds the lock.
+    """
+    with exclusive(BACKFILL_LOCK_KEY, BACKFILL_LOCK_SECONDS) as acquired:
+        if not acquired:
+            return None
+        counts = collect_backfill(db)
+        batch = submit_backfill(db)
+        counts["submitted"] = batch.mention_count if batch is not None else 0
+        return counts
@@ -0,0 +1,539 @@
+from __future__ import annotations
+
+import logging
+import re
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..core.cache import exclusive, mark_client_ingest
+from ..core.config import get_settings
+from ..core.metrics import observe_stage
+from ..models.mention import Mention
+from ..models.story import Story, StoryTermStats
+from .alert_generator import default_alert_generator
+from .sentiment_analyzer import analyzer
+
+logger = logging.getLogger(__name__)
+
+FEATURES = 1 << 11
+MAX_TEXT_CHARS = 2000
+MAX_ACTIVE_STORIES = 500
+SENTIMENT_BATCH_SIZE = 20
+SENTIMENT_THRESHOLD = 0.2
+HIGH_SEVERITY_MENTIONS = 50
+SWEEP_LOCK_KEY = "brand_monitor:story_sweep"
+SWEEP_LOCK_SECONDS = 600
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by can did do for from had has have he her his how i if in into is it "
+    "its just me my no not of on or our out she so than that the their them then there they this to too "
+    "up us was we were what when which who will with you your".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9'-]+")
+
+CLUSTER_COLUMNS = (
+    Mention.id,
+    Mention.source_type,
+    Mention.title,
+    Mention.content,
+    Mention.discovered_at,
+    Mention.sentiment,
+)
+
+Assignment = Tuple[Story, List[Row]]
+Sample = Tuple[object, Row]
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature(term: str) -> int:
+    """Hashed feature for ``term``: ``column << 1 | sign bit``.
+
+    crc32 rather than ``hash()`` so vectors agree across processes (string hashing is salted).
+    """
+    digest = zlib.crc32(term.encode("utf-8"))
+    return (digest % FEATURES) << 1 | digest >> 31
+
+
+def _terms(text: str) -> List[str]:
+    tokens = [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _decode(centroid: bytes) -> np.ndarray:
+    return np.frombuffer(centroid, dtype=np.float32)
+
+
+def _mention_text(row: Row) -> str:
+    return f"{row.title or ''} {row.content or ''}"[:MAX_TEXT_CHARS]
+
+
+def _label(score: float) -> str:
+    if score >= SENTIMENT_THRESHOLD:
+        return "positive"
+    if score <= -SENTIMENT_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+def _centroids(vectors: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Normalised mean vector per label (labels must be ``0..k-1``)."""
+    order = np.argsort(labels, kind="stable")
+    _, starts = np.unique(labels[order], return_index=True)
+    return _normalize(np.add.reduceat(vectors[order], starts, axis=0))
+
+
+def _group(vectors: np.ndarray, threshold: float) -> np.ndarray:
+    """Group labels ``0..k-1`` for mentions that matched no existing story.
+
+    Leader pass: each ungrouped vector takes every later ungrouped vector within
+    ``threshold`` of it. Pairs of groups whose centroids are mutually closest and within
+    ``threshold`` are then merged until none are left; single mentions of a story are
+    less alike than a mention and the story's centroid.
+    """
+    similarity = vectors @ vectors.T
+    labels = np.full(len(vectors), -1, dtype=np.int64)
+    groups = 0
+    for leader in range(len(vectors)):
+        if labels[leader] >= 0:
+            continue
+        members = (labels < 0) & (similarity[leader] >= threshold)
+        members[leader] = True
+        labels[members] = groups
+        groups += 1
+
+    while groups > 1:
+        centroids = _centroids(vectors, labels)
+        similarity = centroids @ centroids.T
+        np.fill_diagonal(similarity, -1.0)
+        index = np.arange(groups)
+        best = similarity.argmax(axis=1)
+        merge = (best[best] == index) & (similarity[index, best] >= threshold) & (index < best)
+        if not merge.any():
+            break
+        target = index.copy()
+        target[best[merge]] = index[merge]
+        _, labels = np.unique(target[labels], return_inverse=True)
+        groups = int(labels.max()) + 1
+    return labels
+
+
+class StoryClusterer:
+    """Incremental per-client clustering of mentions into stories.
+
+    Mentions become signed, hashed TF-IDF vectors (words and word pairs). IDF comes from
+    each client's running document frequencies (:class:`StoryTermStats`), so terms every
+    mention shares, like the brand name, carry little weight, and vectors don't depend on
+    how many mentions a sweep happens to pick up.
+
+    Each vector joins the closest recent story whose centroid is within
+    ``story_similarity_threshold`` cosine similarity; the rest are grouped into new
+    stories (see :func:`_group`), and stories that have grown together are merged once
+    their centroids are within ``story_merge_threshold`` (see :meth:`merge`). Centroids
+    are running means, so stories follow coverage.
+    """
+
+    def vectorize(self, texts: Sequence[str], stats: StoryTermStats | None = None) -> np.ndarray:
+        """L2-normalised ``len(texts) x FEATURES`` float32 matrix.
+
+        IDF is taken over ``stats`` after adding ``texts`` to it (the caller commits), or
+        over ``texts`` alone without it.
+        """
+        codes: List[int] = []
+        lengths: List[int] = []
+        for text in texts:
+            features = [_feature(term) for term in _terms(text)]
+            codes.extend(features)
+            lengths.append(len(features))
+
+        rows = len(texts)
+        encoded = np.asarray(codes, dtype=np.int64)
+        flat = np.repeat(np.arange(rows, dtype=np.int64), lengths) * FEATURES + (encoded >> 1)
+        signs = 1.0 - 2.0 * (encoded & 1)
+        counts = np.bincount(flat, weights=signs, minlength=rows * FEATURES).reshape(rows, FEATURES)
+
+        matrix = (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+        document_frequency = np.count_nonzero(matrix, axis=0).astype(np.float32)
+        documents = rows
+        if stats is not None:
+            document_frequency += _decode(stats.document_frequency)
+            documents += stats.documents
+            stats.document_frequency = document_frequency.tobytes()
+            stats.documents = documents
+            stats.updated_at = datetime.utcnow()
+        matrix *= (np.log((1 + documents) / (1 + document_frequency)) + 1).astype(np.float32)
+        return _normalize(matrix)
+
+    def term_stats(self, db: Session, client_id) -> StoryTermStats:
+        """``client_id``'s running document frequencies, created empty on first use; doesn't commit."""
+        stats = db.get(StoryTermStats, client_id)
+        if stats is None:
+            stats = StoryTermStats(
+                client_id=client_id,
+                documents=0,
+                document_frequency=np.zeros(FEATURES, dtype=np.float32).tobytes(),
+            )
+            db.add(stats)
+        return stats
+
+    def assign(self, db: Session, client_id, rows: List[Row]) -> List[Assignment]:
+        """Attach ``rows`` (see :data:`CLUSTER_COLUMNS`) to stories; doesn't commit.
+
+        Returns each touched story with its members from ``rows``, closest to the centroid first.
+        """
+        settings = get_settings()
+        threshold = settings.story_similarity_threshold
+        now = datetime.utcnow()
+        vectors = self.vectorize([_mention_text(row) for row in rows], self.term_stats(db, client_id))
+
+        stories: List[Story] = (
+            db.query(Story)
+            .filter(
+                Story.client_id == client_id,
+                Story.last_seen_at >= now - timedelta(hours=settings.story_window_hours),
+            )
+            .order_by(Story.last_seen_at.desc())
+            .limit(MAX_ACTIVE_STORIES)
+            .all()
+        )
+
+        labels = np.full(len(rows), -1, dtype=np.int64)
+        if stories:
+            centroids = _normalize(np.stack([_decode(story.centroid) for story in stories]))
+            similarity = vectors @ centroids.T
+            best = similarity.argmax(axis=1)
+            matched = similarity[np.arange(len(rows)), best] >= threshold
+            labels[matched] = best[matched]
+
+        pending = np.flatnonzero(labels < 0)
+        if pending.size:
+            groups = _group(vectors[pending], threshold)
+            for group in range(groups.max() + 1):
+                members = pending[groups == group]
+                labels[members] = len(stories)
+                story = Story(
+                    id=uuid.uuid4(),
+                    client_id=client_id,
+                    mention_count=0,
+                    sampled_count=0,
+                    sampled_at_count=0,
+                    first_seen_at=min(rows[member].discovered_at or now for member in members),
+                    created_at=now,
+                )
+                db.add(story)
+                stories.append(story)
+
+        order = np.argsort(labels, kind="stable")
+        touched, starts = np.unique(labels[order], return_index=True)
+        members_of: Dict[int, np.ndarray] = {}
+        for index, members in zip(touched, np.split(order, starts[1:])):
+            story = stories[index]
+            previous = story.mention_count or 0
+            total = vectors[members].sum(axis=0)
+            if previous:
+                total += _decode(story.centroid) * previous
+            story.centroid = (total / (previous + len(members))).astype(np.float32).tobytes()
+            story.mention_count = previous + len(members)
+
+            sources = Counter(story.sources or {})
+            sources.update(rows[member].source_type or "unknown" for member in members)
+            story.sources = dict(sources)
+            story.last_seen_at = max(
+                [story.last_seen_at or story.first_seen_at or now] + [rows[member].discovered_at or now for member in members]
+            )
+            story.updated_at = now
+            members_of[int(index)] = members
+        db.flush()
+
+        for absorbed, survivor in self.merge(db, stories, list(members_of), settings.story_merge_threshold):
+            members_of[survivor] = np.concatenate(
+                [members_of.get(survivor, order[:0]), members_of.pop(absorbed, order[:0])]
+            )
+
+        assignments: List[Assignment] = []
+        updates: List[Dict] = []
+        inherited: List[Dict] = []  # members of stories that already have a sentiment
+        for index, members in members_of.items():
+            story = stories[index]
+            closeness = vectors[members] @ _normalize(_decode(story.centroid)[np.newaxis, :])[0]
+            ranked = [rows[member] for member in members[np.argsort(-closeness, kind="stable")]]
+            if story.representative_mention_id is None:
+                story.representative_mention_id = ranked[0].id
+                story.title = (ranked[0].title or ranked[0].content or "")[:255]
+            assignments.append((story, ranked))
+            for row in ranked:
+                if story.sentiment is not None and row.sentiment is None:
+                    inherited.append(
+                        {
+                            "id": row.id,
+                            "story_id": story.id,
+                            "sentiment": story.sentiment,
+                            "sentiment_score": story.sentiment_score,
+                            "sentiment_inherited": True,
+                        }
+                    )
+                else:
+                    updates.append({"id": row.id, "story_id": story.id})
+
+        for batch in (updates, inherited):
+            if batch:
+                db.execute(update(Mention), batch)
+        return assignments
+
+    def merge(self, db: Session, stories: List[Story], touched: List[int], threshold: float) -> List[Tuple[int, int]]:
+        """Merge stories whose centroids are mutually closest and within ``threshold``; doesn't commit.
+
+        Starts from the ``touched`` indexes of ``stories`` and repeats with the survivors.
+        A story seeded by a single mention is less alike the story's next mention than
+        that mention is to a fuller centroid, so without this, sweeps that each see a few
+        mentions would leave one story split in several. Centroids are less noisy than
+        single mentions, hence a stricter ``story_merge_threshold`` than for assignment.
+        The smaller story of a pair is folded into the larger (see :meth:`absorb`).
+        Returns ``(absorbed, survivor)`` index pairs in merge order.
+        """
+        merges: List[Tuple[int, int]] = []
+        alive = np.ones(len(stories), dtype=bool)
+        candidates = sorted(set(touched))
+        while candidates and alive.sum() > 1:
+            centroids = _normalize(np.stack([_decode(story.centroid) for story in stories]))
+            similarity = centroids[candidates] @ centroids.T
+            similarity[:, ~alive] = -1.0
+            similarity[np.arange(len(candidates)), candidates] = -1.0
+            merged = set()
+            for candidate, row in zip(candidates, similarity):
+                partner = int(row.argmax())
+                if row[partner] < threshold or not alive[candidate] or merged & {candidate, partner}:
+                    continue
+                reverse = centroids[partner] @ centroids.T
+                reverse[~alive] = -1.0
+                reverse[partner] = -1.0
+                if int(reverse.argmax()) != candidate:
+                    continue
+                survivor, absorbed = (
+                    (candidate, partner)
+                    if stories[candidate].mention_count >= stories[partner].mention_count
+                    else (partner, candidate)
+                )
+                self.absorb(db, stories[survivor], stories[absorbed])
+                alive[absorbed] = False
+                merged.update((survivor, absorbed))
+                merges.append((absorbed, survivor))
+            candidates = sorted(index for index in merged if alive[index])
+        return merges
+
+    def absorb(self, db: Session, survivor: Story, absorbed: Story) -> None:
+        """Fold ``absorbed`` into ``survivor``: weighted centroid, counts, sources and members; deletes ``absorbed``."""
+        total = survivor.mention_count + absorbed.mention_count
+        centroid = (
+            _decode(survivor.centroid) * survivor.mention_count + _decode(absorbed.centroid) * absorbed.mention_count
+        ) / total
+        survivor.centroid = centroid.astype(np.float32).tobytes()
+        survivor.mention_count = total
+        survivor.sources = dict(Counter(survivor.sources or {}) + Counter(absorbed.sources or {}))
+        survivor.first_seen_at = min(
+            filter(None, (survivor.first_seen_at, absorbed.first_seen_at)), default=survivor.first_seen_at
+        )
+        survivor.last_seen_at = max(
+            filter(None, (survivor.last_seen_at, absorbed.last_seen_at)), default=survivor.last_seen_at
+        )
+        # Sentiment is re-averaged over all analysed members the next time the story is sampled.
+        survivor.sampled_count += absorbed.sampled_count
+        if survivor.sentiment is None:
+            survivor.sentiment, survivor.sentiment_score = absorbed.sentiment, absorbed.sentiment_score
+        survivor.alerted_at = survivor.alerted_at or absorbed.alerted_at
+        survivor.updated_at = datetime.utcnow()
+
+        db.query(Mention).filter(Mention.story_id == absorbed.id).update(
+            {Mention.story_id: survivor.id}, synchronize_session=False
+        )
+        if survivor.sentiment is not None:
+            self.inherit(db, survivor)
+        db.delete(absorbed)
+
+    def plan_samples(self, assignments: List[Assignment]) -> List[Sample]:
+        """Pick the members to send to the model: a few per story instead of every mention.
+
+        A story is sampled until it has ``story_sample_size`` analysed members, and again
+        each time its volume doubles; members closest to the centroid go first.
+        """
+        sample_size = get_settings().story_sample_size
+        picked: List[Sample] = []
+        for story, members in assignments:
+            if story.sampled_count < sample_size:
+                wanted = sample_size - story.sampled_count
+            elif story.mention_count >= 2 * story.sampled_at_count:
+                wanted = sample_size
+            else:
+                continue
+            picked.extend((story.id, row) for row in members[:wanted])
+        return picked
+
+    def analyze_samples(self, db: Session, samples: List[Sample]) -> int:
+        """Analyse ``samples`` and set each story's sentiment to the mean of its analysed members.
+
+        Members the model returned no result for are sent once more in a later request.
+        Unanalysed members inherit the story's label and score (``sentiment_inherited``),
+        so sentiment filters and breakdowns count the whole story. Alerts once per story
+        when it turns negative. Returns the number of mentions analysed.
+        """
+        updates: List[Dict] = []
+        pending = list(samples)
+        retried = set()
+        while pending:
+            batch, pending = pending[:SENTIMENT_BATCH_SIZE], pending[SENTIMENT_BATCH_SIZE:]
+            try:
+                results = analyzer.analyze_batch(
+                    [{"title": row.title or "N/A", "content": row.content or ""} for _, row in batch]
+                )
+            except Exception:  # noqa: BLE001 - unsampled stories are retried when they grow
+                logger.exception("story sentiment sample failed")
+                continue
+            missing = []
+            for index, (story_id, row) in enumerate(batch):
+                result = results[index] if index < len(results) else None
+                if not isinstance(result, dict):
+                    missing.append((story_id, row))
+                    continue
+                updates.append(
+                    {
+                        "id": row.id,
+                        "sentiment": result.get("sentiment"),
+                        "sentiment_score": result.get("sentiment_score"),
+                        "confidence_score": result.get("confidence_score"),
+                        "entities": result.get("entities"),
+                        "sentiment_inherited": False,
+                    }
+                )
+            if missing:
+                logger.warning("story sentiment sample returned %d results for %d mentions", len(results), len(batch))
+                pending.extend(sample for sample in missing if sample[1].id not in retried)
+                retried.update(row.id for _, row in missing)
+
+        if not updates:
+            return 0
+
+        story_ids = {story_id for story_id, _ in samples}
+        db.execute(update(Mention), updates)
+        scores = (
+            db.query(Mention.story_id, func.avg(Mention.sentiment_score), func.count(Mention.id))
+            .filter(
+                Mention.story_id.in_(story_ids),
+                Mention.sentiment_score.isnot(None),
+                Mention.sentiment_inherited.isnot(True),
+            )
+            .group_by(Mention.story_id)
+            .all()
+        )
+        stories = {story.id: story for story in db.query(Story).filter(Story.id.in_(story_ids))}
+        for story_id, average, count in scores:
+            story = stories[story_id]
+            story.sentiment_score = round(float(average), 2)
+            story.sentiment = _label(float(average))
+            story.sampled_count = count
+            story.sampled_at_count = story.mention_count
+            self.inherit(db, story)
+        db.commit()
+
+        for story in stories.values():
+            if story.sentiment == "negative" and story.alerted_at is None:
+                severity = "high" if story.mention_count >= HIGH_SEVERITY_MENTIONS else "medium"
+                default_alert_generator.create_negative_story_alert(db, story, severity=severity)
+        return len(updates)
+
+    def inherit(self, db: Session, story: Story) -> None:
+        """Copy ``story``'s sentiment onto its members that have none of their own; doesn't commit."""
+        db.query(Mention).filter(
+            Mention.story_id == story.id,
+            or_(Mention.sentiment.is_(None), Mention.sentiment_inherited.is_(True)),
+        ).update(
+            {
+                Mention.sentiment: story.sentiment,
+                Mention.sentiment_score: story.sentiment_score,
+                Mention.sentiment_inherited: True,
+            },
+            synchronize_session=False,
+        )
+
+    def cluster_pending(self, db: Session, client_id, analyze: bool = True) -> Dict[str, int]:
+        """Cluster ``client_id``'s recent mentions that have no story yet, in batches.
+
+        Each batch commits before its sentiment samples go to the model, so no transaction
+        stays open across model calls.
+        """
+        settings = get_settings()
+        cutoff = datetime.utcnow() - timedelta(hours=settings.story_window_hours)
+        clustered = sampled = 0
+        stories = set()
+
+        while True:
+            rows = (
+                db.query(*CLUSTER_COLUMNS)
+                .filter(
+                    Mention.client_id == client_id,
+                    Mention.story_id.is_(None),
+                    Mention.discovered_at >= cutoff,
+                )
+                .order_by(Mention.discovered_at, Mention.id)
+                .limit(settings.story_batch_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            with observe_stage("story_clustering", items=len(rows)):
+                assignments = self.assign(db, client_id, rows)
+                samples = self.plan_samples(assignments) if analyze else []
+                stories.update(story.id for story, _ in assignments)
+                db.commit()
+            clustered += len(rows)
+            if samples:
+                sampled += self.analyze_samples(db, samples)
+
+        if clustered:
+            mark_client_ingest(client_id)
+            # Stories touched by an early batch may have been merged away by a later one.
+            live = db.query(func.count(Story.id)).filter(Story.id.in_(stories)).scalar() if stories else 0
+        else:
+            live = 0
+        return {"mentions": clustered, "stories": live, "sampled": sampled}
+
+
+story_clusterer = StoryClusterer()
+
+
+def process_pending_stories(db: Session) -> int:
+    """Cluster every client's unassigned recent mentions; returns the number clustered.
+
+    Runs under a Redis lock so overlapping sweeps don't cluster the same mentions twice.
+    """
+    with exclusive(SWEEP_LOCK_KEY, SWEEP_LOCK_SECONDS) as acquired:
+        if not acquired:
+            return 0
+
+        cutoff = datetime.utcnow() - timedelta(hours=get_settings().story_window_hours)
+        client_ids = [
+            client_id
+            for (client_id,) in db.query(Mention.client_id)
+            .filter(
+                Mention.client_id.isnot(None),
+                Mention.story_id.is_(None),
+                Mention.discovered_at >= cutoff,
+            )
+            .distinct()
+            .all()
+        ]
+        return sum(story_clusterer.cluster_pending(db, client_id)["mentions"] for client_id in client_ids)
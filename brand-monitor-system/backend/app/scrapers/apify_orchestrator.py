@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -10,6 +11,8 @@ from ..models.scrape_job import ScrapeJob
 
 
 class ApifyOrchestrator:
+    # ``fields`` maps mention columns to the actor's output keys (first non-empty wins,
+    # dots reach into nested objects); see ``normalizer.compile_mapper``.
     ACTOR_CONFIGS: dict[str, dict] = {
         "google_search": {
             "actor_id": "apify/google-search-scraper",
@@ -19,6 +22,11 @@ class ApifyOrchestrator:
                 "languageCode": "en",
                 "countryCode": "us",
             },
+            "fields": {
+                "source_url": ("url",),
+                "title": ("title",),
+                "content": ("description",),
+            },
         },
         "twitter": {
             "actor_id": "apify/twitter-scraper",
@@ -26,6 +34,13 @@ class ApifyOrchestrator:
                 "maxTweets": 100,
                 "sort": "Latest",
             },
+            "fields": {
+                "source_url": ("url", "twitterUrl"),
+                "content": ("full_text", "text"),
+                "author": ("user.screen_name", "author.userName"),
+                "published_at": ("created_at", "createdAt"),
+                "language": ("lang",),
+            },
         },
         "reddit": {
             "actor_id": "apify/reddit-scraper",
@@ -33,30 +48,50 @@ class ApifyOrchestrator:
                 "sort": "new",
                 "maxResults": 50,
             },
+            "fields": {
+                "source_url": ("url",),
+                "title": ("title",),
+                "content": ("body",),
+                "author": ("username",),
+                "published_at": ("createdAt",),
+            },
         },
         "web_scraper": {
             "actor_id": "apify/web-scraper",
             "default_input": {
                 "maxConcurrency": 5,
             },
+            "fields": {
+                "source_url": ("url",),
+                "title": ("pageTitle", "title"),
+                "content": ("text", "html"),
+            },
+            # Page HTML duplicates ``text``; don't keep it in ``raw_data``.
+            "raw_exclude": ("html",),
         },
         "news": {
             "actor_id": "apify/google-news-scraper",
             "default_input": {
                 "maxArticles": 50,
             },
+            "fields": {
+                "source_url": ("link", "url"),
+                "title": ("title",),
+                "content": ("description",),
+                "author": ("source",),
+                "published_at": ("publishedAt", "date"),
+            },
         },
     }
 
-    def trigger_scrape(
+    def build_run(
         self,
-        db: Session,
         client_id: UUID,
         source_type: str,
         keywords: List[str],
         custom_config: Dict | None = None,
-    ) -> ScrapeJob:
-        """Trigger an Apify actor run for a specific source type"""
+    ) -> Tuple[str, dict, list]:
+        """Actor id, run input and webhooks for a run of ``source_type``"""
 
         actor_config = self.ACTOR_CONFIGS.get(source_type)
         if not actor_config:
@@ -79,22 +114,54 @@ class ApifyOrchestrator:
             }
         ]
 
+        return actor_config["actor_id"], run_input, webhooks
+
+    def enqueue_scrape(
+        self,
+        db: Session,
+        client_id: UUID,
+        source_type: str,
+        keywords: List[str],
+        custom_config: Dict | None = None,
+    ) -> ScrapeJob:
+        """Record a queued scrape job; the dispatcher in ``scrape_queue`` starts it"""
+
+        if source_type not in self.ACTOR_CONFIGS:
+            raise ValueError(f"Unknown source type: {source_type}")
+
         scrape_job = ScrapeJob(
             client_id=client_id,
-            status="pending",
+            source_type=source_type,
+            run_config={"keywords": keywords, "custom_config": custom_config},
+            status="queued",
+            created_at=datetime.utcnow(),
         )
         db.add(scrape_job)
         db.commit()
         db.refresh(scrape_job)
 
+        return scrape_job
+
+    def start_scrape(self, db: Session, scrape_job: ScrapeJob) -> ScrapeJob:
+        """Start the Apify actor run for a queued (or pending) scrape job"""
+
+        config = scrape_job.run_config or {}
+        actor_id, run_input, webhooks = self.build_run(
+            scrape_job.client_id,
+            scrape_job.source_type,
+            config.get("keywords") or [],
+            config.get("custom_config"),
+        )
+
         run = apify_service.run_actor(
-            actor_id=actor_config["actor_id"],
+            actor_id=actor_id,
             run_input=run_input,
             webhooks=webhooks,
         )
 
         scrape_job.apify_run_id = run["id"]
         scrape_job.status = "running"
+        scrape_job.started_at = datetime.utcnow()
         db.commit()
         db.refresh(scrape_job)
 
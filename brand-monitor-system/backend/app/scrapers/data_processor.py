@@ -1,53 +1,68 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Callable
 
 from sqlalchemy.orm import Session
 
 from ..core.apify_client import apify_service
+from ..core.config import get_settings
+from ..core.metrics import observe_stage, record_normalization
+from ..models.client import Client
 from ..models.mention import Mention
 from ..models.scrape_job import ScrapeJob
+from .normalizer import Normalizer
 
 
-def process_apify_dataset(db: Session, scrape_job_id, dataset_id: str) -> list[Mention]:
-    """Persist mentions from an Apify dataset."""
+def process_apify_dataset(
+    db: Session,
+    scrape_job_id,
+    dataset_id: str,
+    start_offset: int = 0,
+    checkpoint: Callable[[int], None] | None = None,
+) -> int:
+    """Persist mentions from an Apify dataset; returns the number stored.
+
+    The dataset is fetched in pages of ``settings.dataset_page_size`` items; each page is
+    normalized (see :class:`~.normalizer.Normalizer`) and committed in chunks of
+    ``settings.ingest_chunk_size``. ``checkpoint`` is called with the dataset offset
+    reached by each chunk just before that chunk commits, so progress recorded in the
+    same session lands atomically with the rows; if it raises, the chunk is left
+    uncommitted for the caller to roll back. Dropped items still advance the offset.
+    Committed mentions are not kept, so memory stays bounded by one page.
+    """
 
-    dataset_items = apify_service.get_dataset_items(dataset_id)
     scrape_job: ScrapeJob | None = (
         db.query(ScrapeJob).filter(ScrapeJob.id == scrape_job_id).first()
     )
     client_id = scrape_job.client_id if scrape_job else None
+    languages = db.query(Client.languages).filter(Client.id == client_id).scalar() if client_id else None
+    normalizer = Normalizer(scrape_job.source_type if scrape_job else None, languages=languages)
+    settings = get_settings()
+    chunk_size = settings.ingest_chunk_size
+
+    stored = 0
+    offset = start_offset
+
+    for page in apify_service.iter_dataset_pages(dataset_id, offset=start_offset, page_size=settings.dataset_page_size):
+        for chunk_start in range(0, len(page), chunk_size):
+            chunk = page[chunk_start:chunk_start + chunk_size]
+            with observe_stage("normalize", items=len(chunk)):
+                rows = list(normalizer.normalize_many(chunk))
+
+            with observe_stage("map_insert", items=len(rows)):
+                discovered_at = datetime.utcnow()
+                db.add_all(
+                    Mention(scrape_job_id=scrape_job_id, client_id=client_id, discovered_at=discovered_at, **row)
+                    for row in rows
+                )
+                stored += len(rows)
+
+                offset += len(chunk)
+                if checkpoint is not None:
+                    checkpoint(offset)
+                db.commit()
 
-    mentions: list[Mention] = []
-
-    for raw in dataset_items:
-        mention = Mention(
-            scrape_job_id=scrape_job_id,
-            client_id=client_id,
-            source_type=raw.get("source_type", "web"),
-            source_url=raw.get("url") or raw.get("link", ""),
-            title=raw.get("title"),
-            content=raw.get("text") or raw.get("content", ""),
-            author=raw.get("author"),
-            published_at=_parse_datetime(raw.get("publishedAt")),
-            discovered_at=datetime.utcnow(),
-            raw_data=raw,
-        )
-        db.add(mention)
-        mentions.append(mention)
-
-    db.commit()
-
-    return mentions
-
-
-def _parse_datetime(value: Any):
-    if not value:
-        return None
-    if isinstance(value, datetime):
-        return value
-    try:
-        return datetime.fromisoformat(value)
-    except ValueError:
-        return None
+    stats = normalizer.stats
+    record_normalization(stats.bytes_in, stats.bytes_out, stats.dropped)
+    return stored
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import html
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from operator import methodcaller
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Sequence
+
+from ..core.config import get_settings
+from .apify_orchestrator import ApifyOrchestrator
+
+MAPPED_COLUMNS = ("source_url", "title", "content", "author", "published_at", "language")
+TITLE_MAX_CHARS = 500
+AUTHOR_MAX_CHARS = 255
+# Raw title/content is cut to this many times the stored length before cleaning; the
+# rest could only survive cleaning as markup or be truncated away.
+RAW_CHARS_FACTOR = 8
+
+# Items from jobs without a known ``source_type`` (scrapes queued before it was recorded).
+GENERIC_FIELDS: Dict[str, Sequence[str]] = {
+    "source_url": ("url", "link"),
+    "title": ("title",),
+    "content": ("text", "content"),
+    "author": ("author",),
+    "published_at": ("publishedAt",),
+}
+
+# Elements whose content is never mention text; dropped with everything inside them.
+_DROPPED_TAGS = frozenset(
+    ("script", "style", "noscript", "template", "svg", "iframe", "nav", "footer", "aside", "form")
+)
+_DROPPED_CLOSE = {tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE) for tag in _DROPPED_TAGS}
+# A tag or declaration, closed by ``>`` or cut off by the end of the text. It never
+# crosses another ``<``, so each match is bounded by the next one.
+_MARKUP = re.compile(r"<(?:/?([a-zA-Z][^\s/<>]*)|[!?/])[^<>]*(?:>|$)")
+_WHITESPACE = re.compile(r"\s+")
+_WORDS = re.compile(r"[^\W\d_]+")
+
+_STOPWORDS: Dict[str, str] = {
+    "en": "the and of to in is that for it with on was are this be as at by have from not but they you",
+    "es": "el la de que y en los las del se por un una para con no es al lo como más pero sus le ya",
+    "fr": "le la les de des et est que un une du en pour pas qui dans sur au avec ce il sont mais",
+    "de": "der die das und ist nicht mit den von zu ein eine im auf für dem des sich auch wird",
+    "pt": "o os as de que e do da em um uma para com não no na por se mais dos das ao",
+    "it": "il la le di che è un una per con non del della sono nel alla anche gli si ma",
+    "nl": "de het een en van is dat in op te niet met voor zijn ook aan er maar om",
+}
+# word -> languages it is a stopword of, so scoring is one dict lookup per word.
+_STOPWORD_LANGUAGES: Dict[str, tuple] = {}
+for _language, _words in _STOPWORDS.items():
+    for _word in _words.split():
+        _STOPWORD_LANGUAGES[_word] = _STOPWORD_LANGUAGES.get(_word, ()) + (_language,)
+
+# (first code point, last code point, language) for scripts that identify a language on their own.
+_SCRIPTS = (
+    (0x0370, 0x03FF, "el"),
+    (0x0400, 0x04FF, "ru"),
+    (0x0590, 0x05FF, "he"),
+    (0x0600, 0x06FF, "ar"),
+    (0x0900, 0x097F, "hi"),
+    (0x0E00, 0x0E7F, "th"),
+    (0x3040, 0x30FF, "ja"),
+    (0x4E00, 0x9FFF, "zh"),
+    (0xAC00, 0xD7AF, "ko"),
+)
+LANGUAGE_SAMPLE_CHARS = 600
+MIN_LANGUAGE_HITS = 2
+
+
+def _strip_markup(text: str) -> str:
+    """``text`` with comments, tags and :data:`_DROPPED_TAGS` blocks replaced by spaces.
+
+    One forward scan: every search starts where the previous one ended, so time stays
+    linear in ``len(text)`` however the markup is broken. Unclosed comments and dropped
+    blocks run to the end of the text, as they would in a browser; a ``<`` that starts
+    no tag (``a < b``, ``<3``) is kept as text.
+    """
+    pieces = []
+    position = 0
+    length = len(text)
+    while position < length:
+        start = text.find("<", position)
+        if start < 0:
+            pieces.append(text[position:])
+            break
+        pieces.append(text[position:start])
+
+        if text.startswith("<!--", start):
+            end = text.find("-->", start + 4)
+            pieces.append(" ")
+            position = length if end < 0 else end + 3
+            continue
+
+        match = _MARKUP.match(text, start)
+        if match is None:
+            pieces.append("<")
+            position = start + 1
+            continue
+        pieces.append(" ")
+        position = match.end()
+        tag = (match.group(1) or "").lower()
+        if tag in _DROPPED_TAGS and not match.group(0).startswith("</") and not match.group(0).endswith("/>"):
+            close = _DROPPED_CLOSE[tag].search(text, position)
+            position = length if close is None else close.end()
+    return "".join(pieces)
+
+
+def clean_text(value: Any, max_chars: int | None = None) -> str:
+    """Plain text from an HTML fragment: markup, boilerplate blocks and entities removed, whitespace collapsed.
+
+    ``max_chars`` cuts the raw value before cleaning, so an oversized field costs no
+    more than one of that length.
+    """
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if max_chars is not None:
+        text = text[:max_chars]
+    if "<" in text:
+        text = _strip_markup(text)
+    if "&" in text:
+        text = html.unescape(text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def truncate(text: str, max_chars: int) -> str:
+    """Cut ``text`` to ``max_chars``, backing up to a word boundary when one is near."""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = cut.rfind(" ", max_chars - max_chars // 10)
+    return cut[:boundary] if boundary > 0 else cut
+
+
+def detect_language(text: str) -> str | None:
+    """ISO 639-1 code guessed from the script or stopwords of the start of ``text``.
+
+    Deliberately cheap: ``None`` when the sample is too short or ambiguous to call.
+    """
+    sample = text[:LANGUAGE_SAMPLE_CHARS]
+    for char in sample:
+        if char.isalpha():
+            point = ord(char)
+            if point < 0x0370:
+                break
+            for first, last, language in _SCRIPTS:
+                if first <= point <= last:
+                    # Kanji alone can't tell Japanese from Chinese; kana settles it.
+                    if language == "zh" and any(0x3040 <= ord(c) <= 0x30FF for c in sample):
+                        return "ja"
+                    return language
+            break
+
+    hits: Counter = Counter()
+    for word in _WORDS.findall(sample.lower()):
+        languages = _STOPWORD_LANGUAGES.get(word)
+        if languages:
+            hits.update(languages)
+    ranked = hits.most_common(2)
+    if not ranked or ranked[0][1] < MIN_LANGUAGE_HITS:
+        return None
+    if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+        return None
+    return ranked[0][0]
+
+
+def _language_code(value: Any) -> str | None:
+    """Normalize an actor-reported language (``en``, ``en-US``, ``und``) to a two-letter code."""
+    if not isinstance(value, str) or len(value) < 2:
+        return None
+    code = value[:2].lower()
+    return code if code.isalpha() and value.lower() != "und" else None
+
+
+def parse_datetime(value: Any) -> datetime | None:
+    """Apify timestamps (``datetime`` or ISO strings, ``Z`` suffix allowed) as naive UTC."""
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _dig(raw: dict, keys: Sequence[str]) -> Any:
+    value: Any = raw
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _missing(raw: dict) -> None:
+    return None
+
+
+def _lookup(path: str) -> Callable[[dict], Any]:
+    """Reader for one candidate key; ``a.b`` reads nested objects."""
+    if "." not in path:
+        return methodcaller("get", path)
+    keys = tuple(path.split("."))
+    if len(keys) == 2:
+        outer, inner = keys
+
+        def nested(raw: dict) -> Any:
+            value = raw.get(outer)
+            return value.get(inner) if isinstance(value, dict) else None
+
+        return nested
+    return lambda raw: _dig(raw, keys)
+
+
+def _first_of(paths: Sequence[str]) -> Callable[[dict], Any]:
+    """Reader returning the first non-empty candidate (``None`` if all are empty)."""
+    if not paths:
+        return _missing
+    lookups = tuple(_lookup(path) for path in paths)
+    if len(lookups) == 1:
+        return lookups[0]
+    if len(lookups) == 2:
+        first, second = lookups
+        return lambda raw: first(raw) or second(raw) or None
+
+    def first_non_empty(raw: dict) -> Any:
+        for lookup in lookups:
+            value = lookup(raw)
+            if value:
+                return value
+        return None
+
+    return first_non_empty
+
+
+def compile_mapper(fields: Mapping[str, Sequence[str]]) -> Callable[[dict], Dict[str, Any]]:
+    """Build a function mapping one raw actor item to :data:`MAPPED_COLUMNS`.
+
+    ``fields`` maps each column to candidate keys tried in order (first non-empty wins;
+    ``a.b`` reads nested objects). Each column gets its reader up front, so mapping an
+    item is one call per column with no walk over the spec.
+    """
+    source_url, title, content, author, published_at, language = (
+        _first_of(fields.get(column, ())) for column in MAPPED_COLUMNS
+    )
+
+    def mapper(raw: dict) -> Dict[str, Any]:
+        return {
+            "source_url": source_url(raw),
+            "title": title(raw),
+            "content": content(raw),
+            "author": author(raw),
+            "published_at": published_at(raw),
+            "language": language(raw),
+        }
+
+    return mapper
+
+
+SOURCE_MAPPERS: Dict[str, Callable[[dict], Dict[str, Any]]] = {
+    source_type: compile_mapper(config["fields"])
+    for source_type, config in ApifyOrchestrator.ACTOR_CONFIGS.items()
+}
+generic_mapper = compile_mapper(GENERIC_FIELDS)
+
+
+@dataclass
+class NormalizeStats:
+    rows_in: int = 0
+    rows_out: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    dropped: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def bytes_saved_per_row(self) -> float:
+        return (self.bytes_in - self.bytes_out) / self.rows_in if self.rows_in else 0.0
+
+
+class Normalizer:
+    """Maps, cleans and filters raw dataset items for one scrape job before insert.
+
+    ``raw_data`` keeps the item minus the top-level keys content is read from (stored
+    cleaned in ``content``) and the source's ``raw_exclude`` fields. ``bytes_in``/``bytes_out``
+    count title, content and those dropped fields as delivered versus as stored.
+    """
+
+    def __init__(
+        self,
+        source_type: str | None,
+        languages: Iterable[str] | None = None,
+        max_content_chars: int | None = None,
+    ):
+        config = ApifyOrchestrator.ACTOR_CONFIGS.get(source_type or "", {})
+        content_paths = config.get("fields", GENERIC_FIELDS).get("content", ())
+        self.source_type = source_type
+        self.mapper = SOURCE_MAPPERS.get(source_type or "", generic_mapper)
+        self.raw_exclude = frozenset(config.get("raw_exclude", ())).union(
+            path for path in content_paths if "." not in path
+        )
+        self.languages = frozenset(code.lower() for code in languages) if languages else None
+        self.max_content_chars = max_content_chars or get_settings().mention_content_max_chars
+        self.stats = NormalizeStats()
+
+    def _drop(self, reason: str) -> None:
+        self.stats.dropped[reason] = self.stats.dropped.get(reason, 0) + 1
+
+    def normalize(self, raw: dict) -> Dict[str, Any] | None:
+        """Mention column values for ``raw``, or ``None`` if it should not be stored."""
+        stats = self.stats
+        stats.rows_in += 1
+        fields = self.mapper(raw)
+
+        raw_title = fields["title"]
+        raw_content = fields["content"]
+        title = truncate(clean_text(raw_title, RAW_CHARS_FACTOR * TITLE_MAX_CHARS), TITLE_MAX_CHARS)
+        content = truncate(
+            clean_text(raw_content, RAW_CHARS_FACTOR * self.max_content_chars), self.max_content_chars
+        )
+
+        excluded = [value for key, value in raw.items() if key in self.raw_exclude]
+        raw = {key: value for key, value in raw.items() if key not in self.raw_exclude}
+        if not any(value is raw_content for value in excluded):
+            excluded.append(raw_content)
+        stats.bytes_in += sum(len(value.encode()) for value in (raw_title, *excluded) if isinstance(value, str))
+
+        if not title and not content:
+            self._drop("empty")
+            return None
+
+        language = _language_code(fields["language"]) or detect_language(content or title)
+        if self.languages is not None and language is not None and language not in self.languages:
+            self._drop("language")
+            return None
+
+        stats.rows_out += 1
+        stats.bytes_out += len(title.encode()) + len(content.encode())
+        author = fields["author"]
+        return {
+            "source_type": self.source_type or raw.get("source_type", "web"),
+            "source_url": fields["source_url"] or "",
+            "title": title or None,
+            "content": content,
+            "author": truncate(str(author), AUTHOR_MAX_CHARS) if author else None,
+            "published_at": parse_datetime(fields["published_at"]),
+            "language": language,
+            "raw_data": raw,
+        }
+
+    def normalize_many(self, items: Iterable[dict]) -> Iterator[Dict[str, Any]]:
+        for raw in items:
+            row = self.normalize(raw)
+            if row is not None:
+                yield row
+
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..core.apify_client import TERMINAL_RUN_STATUSES, apify_service
+from ..core.cache import exclusive
+from ..core.config import get_settings
+from ..core.metrics import observe_stage
+from ..models.scrape_job import ScrapeJob
+from .webhook_handler import record_run_info
+
+logger = logging.getLogger(__name__)
+
+STALE_STATUSES = ("running", "processing")
+POLL_CONCURRENCY = 8
+RECONCILE_LOCK_KEY = "brand_monitor:scrape_reconcile"
+RECONCILE_LOCK_SECONDS = 300
+
+
+def stale_jobs(db: Session, limit: int) -> List[ScrapeJob]:
+    """Running/processing jobs with an Apify run that haven't finished within ``reconcile_after_seconds``."""
+    cutoff = datetime.utcnow() - timedelta(seconds=get_settings().reconcile_after_seconds)
+    return (
+        db.query(ScrapeJob)
+        .filter(
+            ScrapeJob.status.in_(STALE_STATUSES),
+            ScrapeJob.apify_run_id.isnot(None),
+            or_(ScrapeJob.started_at < cutoff, ScrapeJob.started_at.is_(None)),
+        )
+        .order_by(ScrapeJob.started_at)
+        .limit(limit)
+        .all()
+    )
+
+
+def poll_runs(run_ids: List[str]) -> Dict[str, dict | None | bool]:
+    """Fetch run info for ``run_ids`` concurrently (Apify has no bulk run lookup), via the cache.
+
+    Maps each id to the run, ``None`` if Apify doesn't know it, or ``False`` if the lookup failed.
+    """
+    if not run_ids:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(POLL_CONCURRENCY, len(run_ids))) as pool:
+        return dict(zip(run_ids, pool.map(_safe_run_info, run_ids)))
+
+
+def _safe_run_info(run_id: str):
+    try:
+        return apify_service.get_run_info_cached(run_id)
+    except Exception:  # noqa: BLE001 - leave the job for the next pass
+        logger.warning("could not fetch Apify run %s", run_id, exc_info=True)
+        return False
+
+
+def reconcile_scrape_jobs(db: Session, ingest: Callable[[ScrapeJob, str], None]) -> Dict[str, int]:
+    """Bring stale scrape jobs in line with their Apify runs (e.g. after a lost webhook).
+
+    Succeeded runs are handed to ``ingest(scrape_job, dataset_id)``, which must be
+    idempotent (the webhook delivery ledger makes it so). Failed, aborted, timed-out and
+    unknown runs, and succeeded runs without a dataset, mark the job ``failed``. Runs
+    still in progress are left alone.
+    """
+    counts = {"checked": 0, "ingest": 0, "failed": 0, "running": 0, "unreachable": 0}
+    jobs = stale_jobs(db, get_settings().reconcile_batch_size)
+    if not jobs:
+        return counts
+
+    with observe_stage("reconcile", items=len(jobs)):
+        runs = poll_runs([job.apify_run_id for job in jobs])
+        to_ingest: List[tuple[ScrapeJob, str]] = []
+        for job in jobs:
+            counts["checked"] += 1
+            run = runs.get(job.apify_run_id)
+            if run is False:
+                counts["unreachable"] += 1
+                continue
+            if run is None:
+                job.status = "failed"
+                job.error_message = f"Apify run {job.apify_run_id} not found"
+                counts["failed"] += 1
+                continue
+
+            record_run_info(job, run)
+            status = run.get("status")
+            if status == "SUCCEEDED" and run.get("defaultDatasetId"):
+                to_ingest.append((job, run["defaultDatasetId"]))
+            elif status == "SUCCEEDED":
+                logger.warning("Apify run %s succeeded without a dataset", job.apify_run_id)
+                job.status = "failed"
+                job.error_message = "Apify run succeeded without a dataset"
+                counts["failed"] += 1
+            elif status in TERMINAL_RUN_STATUSES:
+                job.status = "failed"
+                job.error_message = f"Apify run {status.lower()}"
+                counts["failed"] += 1
+            else:
+                counts["running"] += 1
+        db.commit()
+
+    for job, dataset_id in to_ingest:
+        ingest(job, dataset_id)
+        counts["ingest"] += 1
+    return counts
+
+
+def run_reconciler(db: Session, ingest: Callable[[ScrapeJob, str], None]) -> Dict[str, int] | None:
+    """:func:`reconcile_scrape_jobs` under a Redis lock; ``None`` if another reconciler is running."""
+    with exclusive(RECONCILE_LOCK_KEY, RECONCILE_LOCK_SECONDS) as acquired:
+        if not acquired:
+            return None
+        return reconcile_scrape_jobs(db, ingest)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from ..core.cache import exclusive
+from ..core.config import get_settings
+from ..core.metrics import observe_stage
+from ..core.rate_limit import DEFAULT_TIER
+from ..models.client import Client
+from ..models.scrape_job import ScrapeJob
+from .apify_orchestrator import orchestrator
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running", "processing")
+DISPATCH_LOCK_KEY = "brand_monitor:scrape_dispatch"
+DISPATCH_LOCK_SECONDS = 60
+
+# Apify runs a single client may have in flight at once.
+TIER_SCRAPE_CONCURRENCY: Dict[str, int] = {
+    "starter": 1,
+    "professional": 3,
+    "enterprise": 10,
+}
+
+
+def tier_concurrency(tier: str | None) -> int:
+    return TIER_SCRAPE_CONCURRENCY.get((tier or "").lower(), TIER_SCRAPE_CONCURRENCY[DEFAULT_TIER])
+
+
+def active_runs(db: Session) -> Dict[object, int]:
+    """In-flight scrape jobs per client."""
+    rows = (
+        db.query(ScrapeJob.client_id, func.count(ScrapeJob.id))
+        .filter(ScrapeJob.status.in_(ACTIVE_STATUSES))
+        .group_by(ScrapeJob.client_id)
+        .all()
+    )
+    return {client_id: count for client_id, count in rows}
+
+
+def _queued_round_robin(db: Session):
+    """Queued jobs ordered in rounds: every client's oldest job, then every client's second, ...
+
+    A client with a long backlog therefore waits its turn behind one job from each other client.
+    """
+    position = (
+        func.row_number()
+        .over(partition_by=ScrapeJob.client_id, order_by=(ScrapeJob.created_at, ScrapeJob.id))
+        .label("position")
+    )
+    queued = (
+        select(ScrapeJob.id, ScrapeJob.client_id, ScrapeJob.created_at, position)
+        .where(ScrapeJob.status == "queued")
+        .subquery()
+    )
+    return db.execute(
+        select(queued.c.id, queued.c.client_id, Client.subscription_tier)
+        .join(Client, Client.id == queued.c.client_id)
+        .where(queued.c.position <= max(TIER_SCRAPE_CONCURRENCY.values()))
+        .order_by(queued.c.position, queued.c.created_at)
+    ).all()
+
+
+def release_stale_claims(db: Session) -> int:
+    """Put ``pending`` jobs that never got an Apify run back in the queue.
+
+    A dispatcher that dies between :func:`_claim` and the Apify call (OOM, deploy) would
+    otherwise leave the job ``pending`` forever, holding one of its client's run slots.
+    Claims older than ``scrape_claim_timeout_seconds`` (or from before claims were
+    timestamped) are released. Returns the number requeued.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=get_settings().scrape_claim_timeout_seconds)
+    released = (
+        db.query(ScrapeJob)
+        .filter(
+            ScrapeJob.status == "pending",
+            ScrapeJob.apify_run_id.is_(None),
+            or_(ScrapeJob.claimed_at < cutoff, ScrapeJob.claimed_at.is_(None)),
+        )
+        .update({ScrapeJob.status: "queued", ScrapeJob.claimed_at: None}, synchronize_session=False)
+    )
+    db.commit()
+    if released:
+        logger.warning("requeued %d scrape jobs left pending by a dispatcher that never started them", released)
+    return released
+
+
+def _claim(db: Session, scrape_job_id) -> ScrapeJob | None:
+    """Move a job from ``queued`` to ``pending``; ``None`` if another dispatcher got it first."""
+    claimed = (
+        db.query(ScrapeJob)
+        .filter(ScrapeJob.id == scrape_job_id, ScrapeJob.status == "queued")
+        .update({ScrapeJob.status: "pending", ScrapeJob.claimed_at: datetime.utcnow()}, synchronize_session=False)
+    )
+    db.commit()
+    if not claimed:
+        return None
+    return db.get(ScrapeJob, scrape_job_id)
+
+
+def dispatch_queued_scrapes(db: Session) -> List[ScrapeJob]:
+    """Start queued scrape jobs fairly across clients.
+
+    Respects ``apify_max_concurrent_runs`` overall and :data:`TIER_SCRAPE_CONCURRENCY`
+    per client, after releasing stale claims. Returns the jobs that were started.
+    """
+    release_stale_claims(db)
+    active = active_runs(db)
+    free = get_settings().apify_max_concurrent_runs - sum(active.values())
+    if free <= 0:
+        return []
+
+    started: List[ScrapeJob] = []
+    with observe_stage("scrape_dispatch"):
+        for scrape_job_id, client_id, tier in _queued_round_robin(db):
+            if free <= 0:
+                break
+            if active.get(client_id, 0) >= tier_concurrency(tier):
+                continue
+
+            scrape_job = _claim(db, scrape_job_id)
+            if scrape_job is None:
+                continue
+            active[client_id] = active.get(client_id, 0) + 1
+            free -= 1
+
+            try:
+                started.append(orchestrator.start_scrape(db, scrape_job))
+            except Exception as exc:  # noqa: BLE001 - one failed start must not stall the queue
+                logger.exception("could not start scrape job %s", scrape_job_id)
+                db.rollback()
+                scrape_job.status = "failed"
+                scrape_job.error_message = str(exc)
+                db.commit()
+                active[client_id] -= 1
+                free += 1
+
+    return started
+
+
+def run_dispatcher(db: Session) -> List[ScrapeJob]:
+    """:func:`dispatch_queued_scrapes` under a Redis lock so concurrent dispatchers can't overshoot the caps.
+
+    Skips the round if another dispatcher holds the lock; runs unlocked if Redis is down.
+    """
+    with exclusive(DISPATCH_LOCK_KEY, DISPATCH_LOCK_SECONDS) as acquired:
+        if not acquired:
+            return []
+        return dispatch_queued_scrapes(db)
+
+
+def request_dispatch() -> None:
+    """Ask a Celery worker to run the dispatcher now; the periodic run covers any failure."""
+    try:
+        from ..tasks import dispatch_scrape_queue_task
+
+        dispatch_scrape_queue_task.apply_async(retry=False)
+    except Exception:  # noqa: BLE001
+        logger.warning("could not schedule scrape dispatch", exc_info=True)
@@ -1,8 +1,25 @@
 from __future__ import annotations
 
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from ..core.cache import mark_client_ingest
+from ..models.mention import Mention
 from ..models.scrape_job import ScrapeJob
+from ..models.webhook_delivery import WebhookDelivery
+from .data_processor import process_apify_dataset
+from .normalizer import parse_datetime
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(RuntimeError):
+    """A retry took the delivery over after this holder's lease expired; the holder must stop writing."""
 
 
 def update_scrape_status(db: Session, run_id: str, status: str) -> None:
@@ -13,3 +30,169 @@ def update_scrape_status(db: Session, run_id: str, status: str) -> None:
 
     scrape_job.status = status
     db.commit()
+
+
+def claim_delivery(
+    db: Session,
+    scrape_job_id,
+    run_id: str,
+    dataset_id: str,
+    lease_seconds: int,
+) -> WebhookDelivery | None:
+    """Atomically claim the ``(run_id, dataset_id)`` delivery.
+
+    The first delivery inserts the ledger row; the unique constraint turns concurrent
+    retries into no-ops. A row whose lease has expired is taken over with a conditional
+    UPDATE so exactly one retry resumes it from ``items_committed``. Returns ``None``
+    when the delivery is already completed or another worker holds a live lease.
+    """
+    now = datetime.utcnow()
+    lease_expires_at = now + timedelta(seconds=lease_seconds)
+
+    delivery = WebhookDelivery(
+        scrape_job_id=scrape_job_id,
+        apify_run_id=run_id,
+        dataset_id=dataset_id,
+        status="processing",
+        items_committed=0,
+        attempts=1,
+        lease_expires_at=lease_expires_at,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(delivery)
+    try:
+        db.commit()
+        return delivery
+    except IntegrityError:
+        db.rollback()
+
+    ledger = db.query(WebhookDelivery).filter(
+        WebhookDelivery.apify_run_id == run_id,
+        WebhookDelivery.dataset_id == dataset_id,
+    )
+    taken_over = ledger.filter(
+        WebhookDelivery.status == "processing",
+        WebhookDelivery.lease_expires_at < now,
+    ).update(
+        {
+            WebhookDelivery.lease_expires_at: lease_expires_at,
+            WebhookDelivery.attempts: WebhookDelivery.attempts + 1,
+            WebhookDelivery.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    db.commit()
+
+    if not taken_over:
+        return None
+    return ledger.one()
+
+
+def _held_lease(db: Session, delivery_id, attempts: int):
+    """The ledger row, fenced on the ``attempts`` value its holder claimed it with."""
+    return db.query(WebhookDelivery).filter(
+        WebhookDelivery.id == delivery_id,
+        WebhookDelivery.attempts == attempts,
+        WebhookDelivery.status == "processing",
+    )
+
+
+def checkpoint_delivery(db: Session, delivery_id, attempts: int, items_committed: int, lease_seconds: int) -> None:
+    """Record progress and extend the lease in the chunk's transaction; committed by the caller.
+
+    Raises :class:`LeaseLost` (the caller rolls the chunk back) if the row no longer
+    carries the holder's ``attempts``, i.e. a retry has taken the delivery over.
+    """
+    now = datetime.utcnow()
+    updated = _held_lease(db, delivery_id, attempts).update(
+        {
+            WebhookDelivery.items_committed: items_committed,
+            WebhookDelivery.lease_expires_at: now + timedelta(seconds=lease_seconds),
+            WebhookDelivery.updated_at: now,
+        },
+        synchronize_session=False,
+    )
+    if not updated:
+        raise LeaseLost(f"webhook delivery {delivery_id} was taken over")
+
+
+def complete_delivery(db: Session, delivery_id, attempts: int) -> None:
+    """Mark the delivery completed in the caller's transaction; raises :class:`LeaseLost` like :func:`checkpoint_delivery`."""
+    updated = _held_lease(db, delivery_id, attempts).update(
+        {WebhookDelivery.status: "completed", WebhookDelivery.updated_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
+    if not updated:
+        raise LeaseLost(f"webhook delivery {delivery_id} was taken over")
+
+
+def release_delivery(db: Session, delivery_id, attempts: int) -> None:
+    """Expire the lease after a failure so the next Apify retry resumes immediately (a no-op once taken over)."""
+    db.rollback()
+    now = datetime.utcnow()
+    _held_lease(db, delivery_id, attempts).update(
+        {WebhookDelivery.lease_expires_at: now, WebhookDelivery.updated_at: now},
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def record_run_info(scrape_job: ScrapeJob, run: Dict[str, Any]) -> None:
+    """Copy finish time and cost from an Apify run object onto ``scrape_job``; the caller commits."""
+    finished_at = parse_datetime(run.get("finishedAt"))
+    if finished_at is not None:
+        scrape_job.completed_at = finished_at
+    if run.get("usageTotalUsd") is not None:
+        scrape_job.apify_credits_used = run["usageTotalUsd"]
+
+
+def ingest_run(
+    db: Session,
+    scrape_job: ScrapeJob,
+    run_id: str,
+    dataset_id: str,
+    lease_seconds: int,
+) -> bool:
+    """Claim the ``(run_id, dataset_id)`` delivery and ingest the dataset into ``scrape_job``.
+
+    Shared by the Apify webhook and the reconciler. Returns ``False`` when the delivery
+    is already completed, another worker holds its lease, or a retry took the lease
+    over mid-ingest (the uncommitted chunk is rolled back).
+    """
+    delivery = claim_delivery(db, scrape_job.id, run_id, dataset_id, lease_seconds)
+    if delivery is None:
+        return False
+    # Read before any commit expires the row: these are the values this holder claimed.
+    delivery_id, attempts, start_offset = delivery.id, delivery.attempts, delivery.items_committed
+
+    scrape_job.status = "processing"
+    db.commit()
+
+    try:
+        process_apify_dataset(
+            db=db,
+            scrape_job_id=scrape_job.id,
+            dataset_id=dataset_id,
+            start_offset=start_offset,
+            checkpoint=lambda offset: checkpoint_delivery(db, delivery_id, attempts, offset, lease_seconds),
+        )
+        complete_delivery(db, delivery_id, attempts)
+    except LeaseLost:
+        db.rollback()
+        logger.warning("lease on run %s dataset %s lost to a retry; stopped ingesting", run_id, dataset_id)
+        return False
+    except Exception:
+        release_delivery(db, delivery_id, attempts)
+        raise
+
+    scrape_job.status = "completed"
+    # Normalization may drop items, and a resumed delivery only saw part of the dataset.
+    scrape_job.mentions_found = (
+        db.query(func.count(Mention.id)).filter(Mention.scrape_job_id == scrape_job.id).scalar()
+    )
+    if scrape_job.completed_at is None:
+        scrape_job.completed_at = datetime.utcnow()
+    db.commit()
+    mark_client_ingest(scrape_job.client_id)
+    return True
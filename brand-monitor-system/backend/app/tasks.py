@@ -3,6 +3,9 @@ from __future__ import annotations
 import os
 
 from celery import Celery
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_process_shutdown
+
+from .core.tracing import attach_headers, detach, inject_headers, span
 
 
 celery_app = Celery(
@@ -11,10 +14,134 @@ celery_app = Celery(
     backend=os.getenv("REDIS_URL", "redis://localhost:6379/0"),
 )
 
+SCRAPE_DISPATCH_INTERVAL_SECONDS = 10.0
+STORY_CLUSTERING_INTERVAL_SECONDS = 30.0
+RECONCILE_INTERVAL_SECONDS = 60.0
+SENTIMENT_BACKFILL_INTERVAL_SECONDS = 60.0
+BACKFILL_QUEUE = "backfill"
+
+celery_app.conf.beat_schedule = {
+    "dispatch-scrape-queue": {
+        "task": "app.tasks.dispatch_scrape_queue_task",
+        "schedule": SCRAPE_DISPATCH_INTERVAL_SECONDS,
+    },
+    "reconcile-scrape-jobs": {
+        "task": "app.tasks.reconcile_scrape_jobs_task",
+        "schedule": RECONCILE_INTERVAL_SECONDS,
+    },
+    "cluster-stories": {
+        "task": "app.tasks.cluster_stories_task",
+        "schedule": STORY_CLUSTERING_INTERVAL_SECONDS,
+    },
+    "sentiment-backfill": {
+        "task": "app.tasks.sentiment_backfill_task",
+        "schedule": SENTIMENT_BACKFILL_INTERVAL_SECONDS,
+    },
+}
+# Backfill runs on its own queue so its long writebacks never delay live tasks on a worker.
+celery_app.conf.task_routes = {
+    "app.tasks.sentiment_backfill_task": {"queue": BACKFILL_QUEUE},
+}
+
+TRACE_HEADERS = ("traceparent", "tracestate", "baggage")
+_trace_tokens: dict[str, object] = {}
+
+
+@before_task_publish.connect
+def _inject_trace_headers(headers=None, **_):
+    """Carry the publisher's trace context (and scrape job baggage) in the task message."""
+    if headers is not None:
+        inject_headers(headers)
+
+
+@task_prerun.connect
+def _attach_trace_context(task_id=None, task=None, **_):
+    carrier = {key: task.request.get(key) for key in TRACE_HEADERS if task.request.get(key)}
+    _trace_tokens[task_id] = attach_headers(carrier)
 
-@celery_app.task
+
+@task_postrun.connect
+def _detach_trace_context(task_id=None, **_):
+    detach(_trace_tokens.pop(task_id, None))
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid=None, **_):
+    from .core.metrics import mark_process_dead
+
+    mark_process_dead(pid)
+
+
+@celery_app.task(ignore_result=True)
 def process_dataset_task(scrape_job_id: str, dataset_id: str) -> None:
-    """Placeholder Celery task to process Apify datasets asynchronously."""
-    # The FastAPI webhook currently processes synchronously.
-    # This task is defined so Celery workers can be wired up later.
-    return None
+    """Ingest an Apify dataset for a scrape job whose webhook never arrived (queued by the reconciler)."""
+    from uuid import UUID
+
+    from .core.config import get_settings
+    from .core.database import SessionLocal
+    from .models.scrape_job import ScrapeJob
+    from .scrapers.webhook_handler import ingest_run
+
+    with span("process_dataset_task", scrape_job_id=scrape_job_id, **{"apify.dataset_id": dataset_id}):
+        db = SessionLocal()
+        try:
+            scrape_job = db.get(ScrapeJob, UUID(scrape_job_id))
+            if scrape_job is None or scrape_job.status == "completed":
+                return None
+            ingest_run(db, scrape_job, scrape_job.apify_run_id, dataset_id, get_settings().webhook_lease_seconds)
+        finally:
+            db.close()
+
+
+@celery_app.task(ignore_result=True)
+def reconcile_scrape_jobs_task() -> None:
+    """Poll Apify for stale running/processing jobs and queue ingest for finished, unprocessed runs."""
+    from .core.database import SessionLocal
+    from .scrapers.reconciler import run_reconciler
+
+    db = SessionLocal()
+    try:
+        run_reconciler(db, lambda job, dataset_id: process_dataset_task.delay(str(job.id), dataset_id))
+    finally:
+        db.close()
+
+
+@celery_app.task(ignore_result=True)
+def dispatch_scrape_queue_task() -> int:
+    """Start queued scrape jobs round-robin across clients; runs on a beat schedule and on demand."""
+    from .core.database import SessionLocal
+    from .scrapers.scrape_queue import run_dispatcher
+
+    db = SessionLocal()
+    try:
+        return len(run_dispatcher(db))
+    finally:
+        db.close()
+
+
+@celery_app.task(ignore_result=True)
+def cluster_stories_task() -> int:
+    """Group newly ingested mentions into stories and sample their sentiment; runs on a beat schedule."""
+    from .core.database import SessionLocal
+    from .processors.story_clusterer import process_pending_stories
+
+    db = SessionLocal()
+    try:
+        with span("cluster_stories_task"):
+            return process_pending_stories(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(ignore_result=True)
+def sentiment_backfill_task() -> None:
+    """Collect ended backfill sentiment batches and submit the next one, unless live sentiment is active."""
+    from .core.database import SessionLocal
+    from .processors.sentiment_backfill import run_sentiment_backfill
+
+    db = SessionLocal()
+    try:
+        with span("sentiment_backfill_task"):
+            run_sentiment_backfill(db)
+    finally:
+        db.close()
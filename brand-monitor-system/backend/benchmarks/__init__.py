@@ -0,0 +1,8 @@
+"""End-to-end benchmark harness for the Brand Monitor backend.
+
+Runs the ingest, sentiment and read paths against local stand-ins for Apify
+and Anthropic so results are reproducible and free. Usage::
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+"""
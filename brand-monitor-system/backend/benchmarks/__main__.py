@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import fields
+
+from .environment import configure_environment
+from .results import build_report, compare_reports, load_report, write_report
+from .scenarios import SCENARIOS, BenchOptions
+
+
+def _add_option_arguments(parser: argparse.ArgumentParser) -> None:
+    for option in fields(BenchOptions):
+        flag = "--" + option.name.replace("_", "-")
+        parser.add_argument(flag, type=type(option.default), default=option.default)
+
+
+def _prepare_state(options: BenchOptions) -> dict:
+    from app.core.database import SessionLocal
+
+    from .environment import create_schema, install_fakes, seed_client, seed_read_data
+
+    create_schema()
+    fakes = install_fakes(options.apify_latency(), options.anthropic_latency())
+
+    db = SessionLocal()
+    try:
+        client = seed_client(db)
+        job = seed_read_data(db, client, options.seed_mentions, options.seed_alerts)
+        return {
+            "fakes": fakes,
+            "client_id": client.id,
+            "api_key": client.api_key,
+            "scrape_job_id": str(job.id),
+        }
+    finally:
+        db.close()
+
+
+def run(args: argparse.Namespace) -> int:
+    database_url = configure_environment(args.database_url, args.redis_url)
+    options = BenchOptions(**{option.name: getattr(args, option.name) for option in fields(BenchOptions)})
+
+    selected = args.scenario or list(SCENARIOS)
+    unknown = [name for name in selected if name not in SCENARIOS]
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    state = _prepare_state(options)
+    results = {}
+    for name in selected:
+        print(f"running {name} ...", file=sys.stderr)
+        results[name] = SCENARIOS[name](options, state)
+
+    report = build_report(options, database_url, results)
+    if args.output:
+        write_report(report, args.output)
+        print(f"wrote {args.output}", file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write("\n")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    rows = compare_reports(load_report(args.baseline), load_report(args.candidate), args.threshold)
+    regressions = 0
+    for row in rows:
+        marker = "REGRESSION" if row["regression"] else ""
+        regressions += row["regression"]
+        print(f"{row['metric']:<60} {row['baseline']:>12.3f} {row['candidate']:>12.3f} {row['change']:>+8.1%} {marker}")
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmark scenarios")
+    run_parser.add_argument("--scenario", action="append", help=f"One of: {', '.join(SCENARIOS)} (repeatable)")
+    run_parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite database")
+    run_parser.add_argument("--redis-url", default=None, help="Defaults to an in-process fakeredis")
+    run_parser.add_argument("--output", "-o", default=None, help="Write the JSON report here instead of stdout")
+    _add_option_arguments(run_parser)
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="Diff two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+WORDS = (
+    "acme launch product update customer service outage pricing review "
+    "great terrible support release feature roadmap partnership recall "
+    "quality delivery refund praise complaint announcement brand market"
+).split()
+
+HTML_SNIPPETS = (
+    "<p>{text}</p>",
+    "<div class=\"post\"><span>{text}</span></div>",
+    "{text}",
+    "<article><h2>Update</h2><p>{text}</p><footer>Share this</footer></article>",
+)
+
+
+def _sentence(rng: random.Random, min_words: int, max_words: int) -> str:
+    count = rng.randint(min_words, max_words)
+    return " ".join(rng.choice(WORDS) for _ in range(count)).capitalize() + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return " ".join(_sentence(rng, 6, 18) for _ in range(sentences))
+
+
+def _timestamp(rng: random.Random) -> str:
+    moment = datetime(2024, 1, 1) + timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+    return moment.isoformat()
+
+
+def _google_search_item(rng: random.Random, index: int, keyword: str) -> Dict:
+    return {
+        "searchQuery": {"term": keyword, "page": 1 + index // 100},
+        "position": index % 100 + 1,
+        "title": _sentence(rng, 4, 10),
+        "url": f"https://example-{index % 97}.com/articles/{index}",
+        "displayedUrl": f"example-{index % 97}.com",
+        "description": _paragraph(rng, 2),
+    }
+
+
+def _twitter_item(rng: random.Random, index: int, keyword: str) -> Dict:
+    return {
+        "id": str(1_700_000_000_000 + index),
+        "url": f"https://twitter.com/user{index % 500}/status/{index}",
+        "full_text": f"{_sentence(rng, 5, 30)} #{keyword}",
+        "user": {"screen_name": f"user{index % 500}", "followers_count": rng.randint(0, 50_000)},
+        "created_at": _timestamp(rng),
+        "retweet_count": rng.randint(0, 500),
+        "favorite_count": rng.randint(0, 2000),
+        "lang": rng.choice(("en", "en", "en", "es", "fr")),
+    }
+
+
+def _reddit_item(rng: random.Random, index: int, keyword: str) -> Dict:
+    return {
+        "id": f"t3_{index:08x}",
+        "dataType": "post",
+        "url": f"https://www.reddit.com/r/{keyword}/comments/{index:x}/",
+        "title": _sentence(rng, 4, 14),
+        "body": rng.choice(HTML_SNIPPETS).format(text=_paragraph(rng, rng.randint(1, 6))),
+        "username": f"redditor_{index % 800}",
+        "communityName": f"r/{keyword}",
+        "createdAt": _timestamp(rng),
+        "upVotes": rng.randint(0, 5000),
+    }
+
+
+def _web_scraper_item(rng: random.Random, index: int, keyword: str) -> Dict:
+    text = _paragraph(rng, rng.randint(4, 20))
+    return {
+        "url": f"https://blog-{index % 53}.example.org/{keyword}/{index}",
+        "pageTitle": _sentence(rng, 3, 9),
+        "text": text,
+        "html": "<html><body>" + rng.choice(HTML_SNIPPETS).format(text=text) + "</body></html>",
+    }
+
+
+def _news_item(rng: random.Random, index: int, keyword: str) -> Dict:
+    return {
+        "title": _sentence(rng, 6, 14),
+        "link": f"https://news-{index % 31}.example.net/{keyword}/{index}",
+        "source": f"Example News {index % 31}",
+        "publishedAt": _timestamp(rng),
+        "description": rng.choice(HTML_SNIPPETS).format(text=_paragraph(rng, 3)),
+        "image": f"https://cdn.example.net/{index}.jpg",
+    }
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int, str], Dict]] = {
+    "google_search": _google_search_item,
+    "twitter": _twitter_item,
+    "reddit": _reddit_item,
+    "web_scraper": _web_scraper_item,
+    "news": _news_item,
+}
+
+
+def generate_dataset(source_type: str, size: int, keyword: str = "acme", seed: int = 0) -> List[Dict]:
+    """Return ``size`` dataset items shaped like the output of ``source_type``'s actor."""
+    try:
+        generator = GENERATORS[source_type]
+    except KeyError as exc:
+        raise ValueError(f"Unknown source type: {source_type}") from exc
+
+    rng = random.Random(f"{source_type}:{seed}")
+    return [generator(rng, index, keyword) for index in range(size)]
+
+
+def generate_mixed_dataset(size: int, keyword: str = "acme", seed: int = 0) -> List[Dict]:
+    """Return ``size`` items spread evenly across every supported source type."""
+    sources = list(GENERATORS)
+    per_source = -(-size // len(sources))
+    items: List[Dict] = []
+    for source_type in sources:
+        items.extend(generate_dataset(source_type, per_source, keyword=keyword, seed=seed))
+    return items[:size]
+
+
+_SYLLABLES = "ka lo mi ren tas vor ul pen dri sol at nex qu bar fin go zel ix mar tu".split()
+
+
+def _topic_word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def generate_story_mentions(stories: int, per_story: int, keyword: str = "acme", seed: int = 0) -> List[Dict]:
+    """Mentions drawn from ``stories`` synthetic stories, interleaved as they would arrive.
+
+    Each story has its own small vocabulary; mentions mix it with generic brand chatter
+    and the keyword, so members are related but never identical. Items carry the true
+    ``story`` index for scoring clusters.
+    """
+    rng = random.Random(f"stories:{seed}")
+    sources = list(GENERATORS)
+    items: List[Dict] = []
+    for story in range(stories):
+        vocabulary = [_topic_word(rng) for _ in range(12)]
+        for _ in range(per_story):
+            topic = rng.sample(vocabulary, 6)
+            chatter = [rng.choice(WORDS) for _ in range(rng.randint(4, 12))]
+            words = topic + chatter + [keyword]
+            rng.shuffle(words)
+            items.append(
+                {
+                    "story": story,
+                    "source_type": rng.choice(sources),
+                    "title": " ".join(rng.sample(vocabulary, 3) + [keyword]).capitalize(),
+                    "content": " ".join(words).capitalize() + ".",
+                }
+            )
+    rng.shuffle(items)
+    return items
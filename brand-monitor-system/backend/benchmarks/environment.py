@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict
+
+from .fakes import FakeAnthropic, FakeApifyClient, Latency
+
+_BENCH_ENV = {
+    # Only Celery's broker settings read this; the app's Redis is fakeredis unless --redis-url is given.
+    "REDIS_URL": "redis://localhost:6379/15",
+    "APIFY_API_TOKEN": "benchmark-apify-token",
+    "ANTHROPIC_API_KEY": "benchmark-anthropic-key",
+    "SECRET_KEY": "benchmark-secret",
+    "ENVIRONMENT": "benchmark",
+    "RATE_LIMIT_ENABLED": "false",
+    "SENTIMENT_LIVE_GRACE_SECONDS": "1",
+}
+
+
+def configure_environment(database_url: str | None = None, redis_url: str | None = None) -> str:
+    """Point the app settings at a benchmark database before ``app`` is imported.
+
+    Defaults to a throwaway SQLite file so the harness runs without Postgres. ``redis_url``
+    (or ``BENCH_REDIS_URL``) selects a real Redis; otherwise :func:`install_fakes` swaps
+    in fakeredis.
+    """
+    if database_url is None:
+        database_url = os.environ.get("BENCH_DATABASE_URL")
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(prefix="brand-monitor-bench-"), "bench.db")
+        database_url = f"sqlite:///{path}"
+    if redis_url is None:
+        redis_url = os.environ.get("BENCH_REDIS_URL")
+
+    os.environ["DATABASE_URL"] = database_url
+    if redis_url is not None:
+        os.environ["REDIS_URL"] = redis_url
+        os.environ["BENCH_REDIS_URL"] = redis_url
+    for key, value in _BENCH_ENV.items():
+        os.environ.setdefault(key, value)
+
+    if database_url.startswith("sqlite"):
+        _register_sqlite_types()
+
+    return database_url
+
+
+def _register_sqlite_types() -> None:
+    from sqlalchemy.dialects.postgresql import JSONB
+    from sqlalchemy.ext.compiler import compiles
+
+    @compiles(JSONB, "sqlite")
+    def _compile_jsonb(type_, compiler, **kw):  # noqa: ANN001
+        return "JSON"
+
+
+def create_schema() -> None:
+    from app.core.database import Base, get_engine
+    import app.models  # noqa: F401
+
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+
+def install_fakes(apify_latency: Latency, anthropic_latency: Latency) -> Dict[str, object]:
+    """Override the Apify and Anthropic SDK client providers with local fakes.
+
+    Redis becomes fakeredis too unless :func:`configure_environment` was given a Redis URL.
+    """
+    from app.core.apify_client import apify_client_provider
+    from app.core.cache import redis_provider
+    from app.processors.sentiment_analyzer import anthropic_client_provider
+
+    fakes: Dict[str, object] = {
+        "apify": FakeApifyClient(latency=apify_latency),
+        "anthropic": FakeAnthropic(latency=anthropic_latency),
+    }
+    apify_client_provider.override(fakes["apify"])
+    anthropic_client_provider.override(fakes["anthropic"])
+    if "BENCH_REDIS_URL" not in os.environ:
+        try:
+            import fakeredis
+        except ImportError:
+            raise SystemExit(
+                "benchmarks need fakeredis (pip install -r requirements-dev.txt) or a Redis given with --redis-url"
+            ) from None
+        fakes["redis"] = fakeredis.FakeRedis()
+        redis_provider.override(fakes["redis"])
+    return fakes
+
+
+def seed_client(db, tier: str = "professional"):
+    from app.models.client import Client
+
+    client = Client(
+        api_key=uuid.uuid4().hex,
+        company_name="Benchmark Co",
+        email="bench@example.com",
+        subscription_tier=tier,
+        monthly_mention_limit=1_000_000,
+        status="active",
+        created_at=datetime.utcnow(),
+    )
+    db.add(client)
+    db.commit()
+    db.refresh(client)
+    return client
+
+
+def seed_read_data(db, client, mentions: int, alerts: int):
+    """Populate mentions, alerts, a usage row and a scrape job for the read-path scenarios."""
+    from app.models.alert import Alert
+    from app.models.mention import Mention
+    from app.models.scrape_job import ScrapeJob
+    from app.models.usage import UsageTracking
+
+    from .datasets import generate_mixed_dataset
+
+    now = datetime.utcnow()
+    job = ScrapeJob(client_id=client.id, status="completed", started_at=now, completed_at=now, created_at=now)
+    db.add(job)
+    db.flush()
+
+    sentiments = ("positive", "negative", "neutral")
+    rows = []
+    for index, raw in enumerate(generate_mixed_dataset(mentions)):
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "client_id": client.id,
+                "scrape_job_id": job.id,
+                "source_type": ("google_search", "twitter", "reddit", "web_scraper", "news")[index % 5],
+                "source_url": raw.get("url") or raw.get("link", ""),
+                "title": raw.get("title") or raw.get("pageTitle"),
+                "content": str(raw.get("full_text") or raw.get("body") or raw.get("text") or raw.get("description", "")),
+                "discovered_at": now - timedelta(minutes=index),
+                "sentiment": sentiments[index % 3],
+                "sentiment_score": (index % 21 - 10) / 10,
+                "raw_data": raw,
+                "created_at": now,
+            }
+        )
+    db.bulk_insert_mappings(Mention, rows)
+
+    db.bulk_insert_mappings(
+        Alert,
+        [
+            {
+                "id": uuid.uuid4(),
+                "client_id": client.id,
+                "mention_id": rows[index % len(rows)]["id"] if rows else None,
+                "alert_type": "negative_sentiment",
+                "severity": ("low", "medium", "high")[index % 3],
+                "title": f"Benchmark alert {index}",
+                "description": "Synthetic alert",
+                "is_read": False,
+                "created_at": now - timedelta(minutes=index),
+            }
+            for index in range(alerts)
+        ],
+    )
+    db.add(
+        UsageTracking(
+            client_id=client.id,
+            month=date.today().replace(day=1),
+            mentions_processed=mentions,
+            apify_credits_used=0,
+            claude_tokens_used=0,
+        )
+    )
+    db.commit()
+    return job
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Iterator, List
+
+
+@dataclass
+class Latency:
+    """Simulated service latency: ``base_ms + per_item_ms * items`` plus uniform jitter."""
+
+    base_ms: float = 0.0
+    per_item_ms: float = 0.0
+    jitter_ms: float = 0.0
+    seed: int = 0
+    _rng: random.Random = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def wait(self, items: int = 1) -> None:
+        delay_ms = self.base_ms + self.per_item_ms * items
+        if self.jitter_ms:
+            with self._lock:
+                delay_ms += self._rng.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+
+class _FakeDataset:
+    def __init__(self, owner: "FakeApifyClient", dataset_id: str):
+        self._owner = owner
+        self._dataset_id = dataset_id
+
+    def _items(self) -> List[Dict]:
+        return self._owner.datasets.get(self._dataset_id, [])
+
+    def list_items(self, offset: int = 0, limit: int | None = None):
+        items = self._items()
+        end = len(items) if limit is None else offset + limit
+        page = items[offset:end]
+        self._owner.latency.wait(len(page))
+        return SimpleNamespace(items=page, total=len(items), offset=offset, count=len(page))
+
+    def iterate_items(self, offset: int = 0, limit: int | None = None) -> Iterator[Dict]:
+        items = self._items()
+        end = len(items) if limit is None else offset + limit
+        page_size = self._owner.page_size
+        for start in range(offset, min(end, len(items)), page_size):
+            page = items[start:min(start + page_size, end)]
+            self._owner.latency.wait(len(page))
+            yield from page
+
+
+class _FakeActor:
+    def __init__(self, owner: "FakeApifyClient", actor_id: str):
+        self._owner = owner
+        self._actor_id = actor_id
+
+    def start(self, run_input: dict | None = None, webhooks: list | None = None, **_: object) -> Dict:
+        self._owner.latency.wait()
+        return self._owner.register_run(self._actor_id, [])
+
+    call = start
+
+
+class _FakeRun:
+    def __init__(self, owner: "FakeApifyClient", run_id: str):
+        self._owner = owner
+        self._run_id = run_id
+
+    def get(self) -> Dict | None:
+        self._owner.latency.wait()
+        return self._owner.runs.get(self._run_id)
+
+
+class FakeApifyClient:
+    """In-process stand-in for ``apify_client.ApifyClient``.
+
+    Serves datasets registered with :meth:`register_run` and records every
+    actor call, so the orchestrator and dataset processor run unmodified.
+    """
+
+    def __init__(self, latency: Latency | None = None, page_size: int = 1000):
+        self.latency = latency or Latency()
+        self.page_size = page_size
+        self.datasets: Dict[str, List[Dict]] = {}
+        self.runs: Dict[str, Dict] = {}
+
+    def register_run(self, actor_id: str, items: List[Dict], status: str = "SUCCEEDED") -> Dict:
+        run_id = uuid.uuid4().hex[:17]
+        dataset_id = uuid.uuid4().hex[:17]
+        self.datasets[dataset_id] = items
+        run = {
+            "id": run_id,
+            "actId": actor_id,
+            "status": status,
+            "defaultDatasetId": dataset_id,
+            "finishedAt": datetime.now(timezone.utc).isoformat() if status != "RUNNING" else None,
+            "usageTotalUsd": round(0.0004 * len(items), 4),
+        }
+        self.runs[run_id] = run
+        return run
+
+    def actor(self, actor_id: str) -> _FakeActor:
+        return _FakeActor(self, actor_id)
+
+    def dataset(self, dataset_id: str) -> _FakeDataset:
+        return _FakeDataset(self, dataset_id)
+
+    def run(self, run_id: str) -> _FakeRun:
+        return _FakeRun(self, run_id)
+
+
+_MENTION_HEADER = re.compile(r"^MENTION \d+:", re.MULTILINE)
+
+
+def _sentiment_message(model: str, messages: List[Dict], rng: random.Random):
+    prompt = "".join(message["content"] for message in messages if isinstance(message["content"], str))
+    results = []
+    for _ in range(len(_MENTION_HEADER.findall(prompt))):
+        score = round(rng.uniform(-1.0, 1.0), 2)
+        results.append(
+            {
+                "sentiment": "positive" if score > 0.2 else "negative" if score < -0.2 else "neutral",
+                "sentiment_score": score,
+                "confidence_score": round(rng.uniform(0.5, 1.0), 2),
+                "entities": ["Acme"],
+                "crisis_indicator": score < -0.9,
+            }
+        )
+    text = json.dumps(results)
+    return SimpleNamespace(
+        id=f"msg_{uuid.uuid4().hex[:24]}",
+        model=model,
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4),
+    )
+
+
+class _FakeBatches:
+    """``client.beta.messages.batches``: batches end ``batch_seconds`` after creation; a
+    ``batch_error_rate`` share of requests come back ``errored``."""
+
+    def __init__(self, owner: "FakeAnthropic"):
+        self._owner = owner
+        self._batches: Dict[str, Dict] = {}
+
+    def create(self, requests: List[Dict], **_: object):
+        owner = self._owner
+        owner.latency.wait()
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        with owner._lock:
+            owner.batches_created += 1
+            owner.batch_requests += len(requests)
+            self._batches[batch_id] = {
+                "requests": list(requests),
+                "ready_at": time.monotonic() + owner.batch_seconds,
+                "seed": owner.seed + owner.batches_created,
+            }
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+    def retrieve(self, batch_id: str):
+        self._owner.latency.wait()
+        batch = self._batches[batch_id]
+        ended = time.monotonic() >= batch["ready_at"]
+        return SimpleNamespace(id=batch_id, processing_status="ended" if ended else "in_progress")
+
+    def results(self, batch_id: str) -> Iterator[SimpleNamespace]:
+        batch = self._batches[batch_id]
+        rng = random.Random(batch["seed"])
+        for request in batch["requests"]:
+            if rng.random() < self._owner.batch_error_rate:
+                result = SimpleNamespace(type="errored", error={"type": "overloaded_error"})
+            else:
+                params = request["params"]
+                result = SimpleNamespace(type="succeeded", message=_sentiment_message(params["model"], params["messages"], rng))
+            yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+
+class _FakeBetaMessages:
+    def __init__(self, owner: "FakeAnthropic"):
+        self.batches = _FakeBatches(owner)
+
+
+class _FakeMessages:
+    def __init__(self, owner: "FakeAnthropic"):
+        self._owner = owner
+
+    def create(self, model: str, max_tokens: int, messages: List[Dict], **_: object):
+        prompt = "".join(message["content"] for message in messages if isinstance(message["content"], str))
+        self._owner.latency.wait(len(_MENTION_HEADER.findall(prompt)))
+
+        with self._owner._lock:
+            self._owner.calls += 1
+            rng = random.Random(self._owner.seed + self._owner.calls)
+        return _sentiment_message(model, messages, rng)
+
+
+class FakeAnthropic:
+    """In-process stand-in for ``anthropic.Anthropic`` returning well-formed sentiment JSON.
+
+    Covers both ``messages.create`` (live lane) and ``beta.messages.batches`` (backfill lane),
+    where ``anthropic==0.40.0`` has them.
+    """
+
+    def __init__(
+        self,
+        latency: Latency | None = None,
+        seed: int = 0,
+        batch_seconds: float = 0.0,
+        batch_error_rate: float = 0.0,
+    ):
+        self.latency = latency or Latency()
+        self.seed = seed
+        self.batch_seconds = batch_seconds
+        self.batch_error_rate = batch_error_rate
+        self.calls = 0
+        self.batches_created = 0
+        self.batch_requests = 0
+        self._lock = threading.Lock()
+        self.messages = _FakeMessages(self)
+        self.beta = SimpleNamespace(messages=_FakeBetaMessages(self))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import platform
+import subprocess
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+from .scenarios import BenchOptions
+
+SCHEMA_VERSION = 1
+# Quality scores (fractions in [0, 1]) compared like throughput: a drop is a regression.
+QUALITY_METRICS = frozenset({"purity", "completeness"})
+# Ratios where 1.0 is ideal and only growth is possible, e.g. clusters found per true story.
+RATIO_METRICS = frozenset({"split_ratio"})
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(options: BenchOptions, database_url: str, scenarios: Dict[str, Dict]) -> Dict:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database_url.split("://", 1)[0],
+            "options": asdict(options),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def write_report(report: Dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def load_report(path: str) -> Dict:
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _flatten(prefix: str, value) -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, nested in value.items():
+            yield from _flatten(f"{prefix}.{key}" if prefix else key, nested)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def _direction(metric: str) -> int:
+    """+1 when higher is better, -1 when lower is better, 0 for informational metrics."""
+    leaf = metric.rsplit(".", 1)[-1]
+    if leaf.endswith("_per_sec") or leaf in QUALITY_METRICS:
+        return 1
+    if leaf.endswith("_ms") or leaf.endswith("_us") or leaf.endswith("seconds") or leaf in RATIO_METRICS:
+        return -1
+    return 0
+
+
+def compare_reports(baseline: Dict, candidate: Dict, threshold: float = 0.10) -> List[Dict]:
+    """Return per-metric deltas, flagging regressions larger than ``threshold`` (a fraction)."""
+    before = dict(_flatten("", baseline.get("scenarios", {})))
+    after = dict(_flatten("", candidate.get("scenarios", {})))
+
+    rows = []
+    for metric in sorted(before.keys() & after.keys()):
+        direction = _direction(metric)
+        if not direction:
+            continue
+        old, new = before[metric], after[metric]
+        change = (new - old) / old if old else 0.0
+        rows.append(
+            {
+                "metric": metric,
+                "baseline": old,
+                "candidate": new,
+                "change": round(change, 4),
+                "regression": change * direction < -threshold,
+            }
+        )
+    return rows
@@ -0,0 +1,597 @@
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from .fakes import Latency
+
+
+@dataclass
+class BenchOptions:
+    rows: int = 2000
+    sentiment_mentions: int = 500
+    sentiment_batch_size: int = 20
+    seed_mentions: int = 5000
+    seed_alerts: int = 500
+    requests: int = 200
+    serialization_iterations: int = 50
+    startup_runs: int = 5
+    concurrency: int = 8
+    story_count: int = 100
+    story_mentions: int = 5000
+    story_increment: int = 50
+    backfill_mentions: int = 20000
+    apify_latency_ms: float = 50.0
+    apify_per_item_ms: float = 0.0
+    anthropic_latency_ms: float = 200.0
+    anthropic_per_mention_ms: float = 5.0
+    jitter_ms: float = 0.0
+
+    def apify_latency(self) -> Latency:
+        return Latency(self.apify_latency_ms, self.apify_per_item_ms, self.jitter_ms)
+
+    def anthropic_latency(self) -> Latency:
+        return Latency(self.anthropic_latency_ms, self.anthropic_per_mention_ms, self.jitter_ms)
+
+
+Scenario = Callable[[BenchOptions, Dict[str, object]], Dict[str, object]]
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(name: str) -> Callable[[Scenario], Scenario]:
+    def register(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+
+    return register
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def _test_client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
+
+
+@scenario("webhook_ingest")
+def webhook_ingest(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Deliver one Apify webhook per source type and measure dataset ingest throughput."""
+    from app.core.database import SessionLocal
+    from app.models.scrape_job import ScrapeJob
+    from app.scrapers.apify_orchestrator import ApifyOrchestrator
+
+    from .datasets import generate_dataset
+
+    fake_apify = state["fakes"]["apify"]
+    client = _test_client()
+    per_source: Dict[str, Dict[str, float]] = {}
+    total_rows = 0
+    total_seconds = 0.0
+
+    for source_type, config in ApifyOrchestrator.ACTOR_CONFIGS.items():
+        items = generate_dataset(source_type, options.rows)
+        run = fake_apify.register_run(config["actor_id"], items)
+
+        db = SessionLocal()
+        try:
+            db.add(
+                ScrapeJob(
+                    client_id=state["client_id"],
+                    source_type=source_type,
+                    apify_run_id=run["id"],
+                    status="running",
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        payload = {"resource": {"id": run["id"], "defaultDatasetId": run["defaultDatasetId"]}}
+        started = time.perf_counter()
+        response = client.post(f"/api/v1/webhooks/apify/{state['client_id']}", json=payload)
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+
+        per_source[source_type] = {
+            "rows": len(items),
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(len(items) / elapsed, 2),
+        }
+        total_rows += len(items)
+        total_seconds += elapsed
+
+    return {
+        "rows": total_rows,
+        "seconds": round(total_seconds, 4),
+        "rows_per_sec": round(total_rows / total_seconds, 2) if total_seconds else 0.0,
+        "sources": per_source,
+    }
+
+
+def _legacy_map(raw: Dict) -> Dict:
+    """Field mapping as ``process_apify_dataset`` did it before per-source mappers."""
+    return {
+        "source_url": raw.get("url") or raw.get("link", ""),
+        "title": raw.get("title"),
+        "content": raw.get("text") or raw.get("content", ""),
+        "author": raw.get("author"),
+        "published_at": raw.get("publishedAt"),
+    }
+
+
+def _rows_per_sec(func: Callable[[Dict], object], items: List[Dict]) -> float:
+    for raw in items[:100]:
+        func(raw)
+    started = time.perf_counter()
+    for raw in items:
+        func(raw)
+    elapsed = time.perf_counter() - started
+    return round(len(items) / elapsed, 2) if elapsed else 0.0
+
+
+@scenario("ingest_normalization")
+def ingest_normalization(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Bytes saved per row and throughput of the pre-ingest mappers and normalizer, per source type.
+
+    ``legacy_map_per_sec`` is the old chained ``raw.get`` mapping, for scale: it reads fixed
+    keys, so it is faster than the per-source mappers but misses most sources' text fields.
+    Twitter items carry ``lang``; the run keeps ``en`` only.
+    """
+    import orjson
+
+    from app.scrapers.apify_orchestrator import ApifyOrchestrator
+    from app.scrapers.normalizer import SOURCE_MAPPERS, Normalizer
+
+    from .datasets import generate_dataset
+
+    languages = ("en",)
+    per_source: Dict[str, Dict[str, object]] = {}
+    totals = {"rows": 0, "stored": 0, "bytes_in": 0, "bytes_out": 0, "raw_saved": 0}
+
+    for source_type in ApifyOrchestrator.ACTOR_CONFIGS:
+        items = generate_dataset(source_type, options.rows)
+        mapper = SOURCE_MAPPERS[source_type]
+
+        normalizer = Normalizer(source_type, languages=languages)
+        started = time.perf_counter()
+        rows = list(normalizer.normalize_many(items))
+        normalize_seconds = time.perf_counter() - started
+        stats = normalizer.stats
+
+        raw_in = sum(len(orjson.dumps(raw)) for raw in items)
+        raw_out = sum(len(orjson.dumps(row["raw_data"])) for row in rows)
+        per_source[source_type] = {
+            "rows": len(items),
+            "stored": stats.rows_out,
+            "dropped": stats.dropped,
+            "content_bytes_in_per_row": round(stats.bytes_in / len(items), 1),
+            "content_bytes_stored_per_row": round(stats.bytes_out / max(stats.rows_out, 1), 1),
+            "content_bytes_saved_per_row": round(stats.bytes_saved_per_row, 1),
+            "raw_data_bytes_saved_per_row": round((raw_in - raw_out) / len(items), 1),
+            "legacy_map_per_sec": _rows_per_sec(_legacy_map, items),
+            "mapper_per_sec": _rows_per_sec(mapper, items),
+            "normalize_per_sec": round(len(items) / normalize_seconds, 2) if normalize_seconds else 0.0,
+        }
+        totals["rows"] += len(items)
+        totals["stored"] += stats.rows_out
+        totals["bytes_in"] += stats.bytes_in
+        totals["bytes_out"] += stats.bytes_out
+        totals["raw_saved"] += raw_in - raw_out
+
+    return {
+        "rows": totals["rows"],
+        "stored": totals["stored"],
+        "languages": list(languages),
+        "content_bytes_saved_per_row": round((totals["bytes_in"] - totals["bytes_out"]) / totals["rows"], 1),
+        "raw_data_bytes_saved_per_row": round(totals["raw_saved"] / totals["rows"], 1),
+        "sources": per_source,
+    }
+
+
+@scenario("sentiment")
+def sentiment(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Run ``SentimentAnalyzer.analyze_batch`` over synthetic mentions against the fake model."""
+    from app.processors.sentiment_analyzer import analyzer
+
+    from .datasets import generate_mixed_dataset
+
+    mentions = [
+        {"title": raw.get("title"), "content": str(raw.get("text") or raw.get("description") or raw.get("body") or "")}
+        for raw in generate_mixed_dataset(options.sentiment_mentions)
+    ]
+    batch_size = options.sentiment_batch_size
+    batch_latencies: List[float] = []
+    analyzed = 0
+
+    started = time.perf_counter()
+    for start in range(0, len(mentions), batch_size):
+        batch = mentions[start:start + batch_size]
+        batch_started = time.perf_counter()
+        results = analyzer.analyze_batch(batch)
+        batch_latencies.append((time.perf_counter() - batch_started) * 1000)
+        analyzed += len(results)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mentions": analyzed,
+        "batch_size": batch_size,
+        "seconds": round(elapsed, 4),
+        "mentions_per_sec": round(analyzed / elapsed, 2) if elapsed else 0.0,
+        "batch_latency": latency_summary(batch_latencies),
+    }
+
+
+def read_endpoints(state: Dict[str, object]) -> Dict[str, str]:
+    return {
+        "mentions": "/api/v1/mentions/?limit=50",
+        "mentions_page_200": "/api/v1/mentions/?limit=200",
+        "mentions_negative": "/api/v1/mentions/?sentiment=negative",
+        "alerts": "/api/v1/alerts/",
+        "analytics_sentiment": "/api/v1/analytics/sentiment",
+        "analytics_sources": "/api/v1/analytics/sources",
+        "usage": "/api/v1/usage/",
+        "dashboard": "/api/v1/dashboard",
+        "stories": "/api/v1/stories/",
+        "scrape_status": f"/api/v1/scrape/status/{state['scrape_job_id']}",
+    }
+
+
+@scenario("read_endpoints")
+def read_endpoint_latency(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Hammer each read-only ``/api/v1`` route with concurrent requests and report latency percentiles."""
+    headers = {"Authorization": f"Bearer {state['api_key']}"}
+    local = threading.local()
+
+    def http_client():
+        if not hasattr(local, "client"):
+            local.client = _test_client()
+        return local.client
+
+    def timed_get(path: str) -> float:
+        started = time.perf_counter()
+        response = http_client().get(path, headers=headers)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        response.raise_for_status()
+        return elapsed_ms
+
+    results: Dict[str, object] = {"concurrency": options.concurrency, "endpoints": {}}
+    with ThreadPoolExecutor(max_workers=options.concurrency) as pool:
+        for name, path in read_endpoints(state).items():
+            timed_get(path)  # warm-up
+            started = time.perf_counter()
+            samples = list(pool.map(timed_get, [path] * options.requests))
+            elapsed = time.perf_counter() - started
+            summary = latency_summary(samples)
+            summary["requests_per_sec"] = round(len(samples) / elapsed, 2) if elapsed else 0.0
+            results["endpoints"][name] = summary
+
+    return results
+
+
+def _time_page(build, iterations: int) -> float:
+    """Mean microseconds per call of ``build`` after one warm-up call."""
+    build()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build()
+    return (time.perf_counter() - started) / iterations * 1_000_000
+
+
+@scenario("list_serialization")
+def list_serialization(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Per-page cost of the mentions/alerts list read path: full ORM entities + default JSON vs projected rows + orjson."""
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse
+
+    from app.api.v1.alerts import ALERT_LIST_COLUMNS, _serialize_alert
+    from app.api.v1.mentions import MENTION_LIST_COLUMNS, _serialize_mention
+    from app.core.database import SessionLocal
+    from app.models.alert import Alert
+    from app.models.mention import Mention
+
+    page_size = 200
+    cases = {
+        "mentions": (Mention, MENTION_LIST_COLUMNS, _serialize_mention, Mention.discovered_at),
+        "alerts": (Alert, ALERT_LIST_COLUMNS, _serialize_alert, Alert.created_at),
+    }
+
+    db = SessionLocal()
+    results: Dict[str, object] = {"page_size": page_size}
+    try:
+        for name, (model, columns, serialize, order_column) in cases.items():
+            def entity_query():
+                return (
+                    db.query(model).filter(model.client_id == state["client_id"])
+                    .order_by(order_column.desc()).limit(page_size).all()
+                )
+
+            def row_query():
+                return (
+                    db.query(*columns).filter(model.client_id == state["client_id"])
+                    .order_by(order_column.desc()).limit(page_size).all()
+                )
+
+            def entity_page():
+                entities = entity_query()
+                body = JSONResponse(jsonable_encoder([serialize(e) for e in entities])).body
+                db.expunge_all()
+                return body
+
+            def row_page():
+                return ORJSONResponse([serialize(r) for r in row_query()]).body
+
+            rows = row_query()
+            db.expunge_all()
+            serialized = [serialize(r) for r in rows]
+
+            results[name] = {
+                "rows": len(rows),
+                "entity_page_us": round(_time_page(entity_page, options.serialization_iterations), 1),
+                "projected_page_us": round(_time_page(row_page, options.serialization_iterations), 1),
+                "default_json_encode_us": round(
+                    _time_page(lambda: JSONResponse(jsonable_encoder(serialized)).body, options.serialization_iterations), 1
+                ),
+                "orjson_encode_us": round(
+                    _time_page(lambda: ORJSONResponse(serialized).body, options.serialization_iterations), 1
+                ),
+            }
+    finally:
+        db.close()
+
+    return results
+
+
+def _seed_story_mentions(db, client_id, items: List[Dict], offset: int = 0) -> None:
+    from datetime import datetime
+
+    from app.models.mention import Mention
+
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(
+        Mention,
+        [
+            {
+                "client_id": client_id,
+                "source_type": item["source_type"],
+                "source_url": f"https://example.com/story/{offset + index}",
+                "title": item["title"],
+                "content": item["content"],
+                "discovered_at": now,
+                "created_at": now,
+            }
+            for index, item in enumerate(items)
+        ],
+    )
+    db.commit()
+
+
+@scenario("story_clustering")
+def story_clustering(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Throughput and quality of story clustering, and the sentiment calls story sampling needs.
+
+    Mentions arrive ``--story-increment`` at a time with a sweep after each, like the
+    periodic sweep sees them in production, rather than as one bulk backlog.
+    """
+    from collections import Counter
+    from types import SimpleNamespace
+
+    from app.core.database import SessionLocal
+    from app.models.mention import Mention
+    from app.processors.story_clusterer import _mention_text, story_clusterer
+
+    from .datasets import generate_story_mentions
+    from .environment import seed_client
+
+    per_story = max(1, options.story_mentions // options.story_count)
+    items = generate_story_mentions(options.story_count, per_story)
+    truth = {f"https://example.com/story/{index}": item["story"] for index, item in enumerate(items)}
+    increment = max(1, options.story_increment)
+
+    def sweep_in_increments(db, client_id, analyze: bool):
+        seconds = 0.0
+        totals = Counter()
+        for start in range(0, len(items), increment):
+            _seed_story_mentions(db, client_id, items[start:start + increment], offset=start)
+            started = time.perf_counter()
+            totals.update(story_clusterer.cluster_pending(db, client_id, analyze=analyze))
+            seconds += time.perf_counter() - started
+        return totals, seconds
+
+    db = SessionLocal()
+    try:
+        texts = [_mention_text(SimpleNamespace(**item)) for item in items]
+        story_clusterer.vectorize(texts[:100])  # warm-up (hash cache, NumPy)
+        started = time.perf_counter()
+        story_clusterer.vectorize(texts)
+        vectorize_seconds = time.perf_counter() - started
+
+        client = seed_client(db)
+        _, cluster_seconds = sweep_in_increments(db, client.id, analyze=False)
+
+        members: Dict[object, Counter] = {}
+        for story_id, url in db.query(Mention.story_id, Mention.source_url).filter(Mention.client_id == client.id):
+            members.setdefault(story_id, Counter())[truth[url]] += 1
+        purity = sum(counts.most_common(1)[0][1] for counts in members.values()) / len(items)
+        # Purity can't see over-splitting (every singleton is pure); completeness can: the
+        # share of each true story's mentions that landed in its largest cluster.
+        largest: Counter = Counter()
+        for counts in members.values():
+            for story, count in counts.items():
+                largest[story] = max(largest[story], count)
+        completeness = sum(largest.values()) / len(items)
+
+        anthropic = state["fakes"]["anthropic"]
+        sampled_client = seed_client(db)
+        calls_before = anthropic.calls
+        sampled, sampled_seconds = sweep_in_increments(db, sampled_client.id, analyze=True)
+    finally:
+        db.close()
+
+    return {
+        "mentions": len(items),
+        "increment": increment,
+        "true_stories": options.story_count,
+        "stories_found": len(members),
+        "split_ratio": round(len(members) / options.story_count, 4),
+        "purity": round(purity, 4),
+        "completeness": round(completeness, 4),
+        "vectorize_per_sec": round(len(texts) / vectorize_seconds, 2) if vectorize_seconds else 0.0,
+        "cluster_seconds": round(cluster_seconds, 4),
+        "mentions_per_sec": round(len(items) / cluster_seconds, 2) if cluster_seconds else 0.0,
+        "sampled_mentions": sampled["sampled"],
+        "sentiment_calls": anthropic.calls - calls_before,
+        "with_sentiment_seconds": round(sampled_seconds, 4),
+    }
+
+
+@scenario("sentiment_backfill")
+def sentiment_backfill(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Backfill lane end to end against the fake batch API: enqueue, batch submit, bulk writeback.
+
+    Checks that a live ``analyze_batch`` call defers backfill submission, and injects a
+    2% request error rate to exercise requeueing.
+    """
+    import uuid
+    from datetime import datetime
+
+    from app.core.config import get_settings
+    from app.core.database import SessionLocal
+    from app.models.mention import Mention
+    from app.processors.sentiment_analyzer import analyzer
+    from app.processors.sentiment_backfill import (
+        backfill_progress,
+        enqueue_backfill,
+        run_sentiment_backfill,
+        submit_backfill,
+    )
+
+    from .datasets import generate_mixed_dataset
+    from .environment import seed_client
+
+    anthropic = state["fakes"]["anthropic"]
+    db = SessionLocal()
+    try:
+        client = seed_client(db)
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(
+            Mention,
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "client_id": client.id,
+                    "source_type": "web_scraper",
+                    "source_url": raw.get("url") or raw.get("link", ""),
+                    "title": raw.get("title") or raw.get("pageTitle"),
+                    "content": str(raw.get("text") or raw.get("description") or raw.get("body") or raw.get("full_text")),
+                    "discovered_at": now,
+                    "created_at": now,
+                }
+                for raw in generate_mixed_dataset(options.backfill_mentions)
+            ],
+        )
+        db.commit()
+
+        started = time.perf_counter()
+        queued = enqueue_backfill(db, client.id)
+        enqueue_seconds = time.perf_counter() - started
+
+        analyzer.analyze_batch([{"title": "Live", "content": "Acme outage right now"}])
+        deferred = submit_backfill(db) is None
+        time.sleep(get_settings().sentiment_live_grace_seconds)
+
+        anthropic.batch_error_rate = 0.02
+        batches_before = anthropic.batches_created
+        totals = {"batches": 0, "scored": 0, "retried": 0, "failed": 0}
+        rounds = 0
+        started = time.perf_counter()
+        while rounds < 50:
+            progress = backfill_progress(db, client.id)
+            if not progress["queued"] and not progress["submitted"]:
+                break
+            counts = run_sentiment_backfill(db) or {}
+            for key in totals:
+                totals[key] += counts.get(key, 0)
+            rounds += 1
+        elapsed = time.perf_counter() - started
+        anthropic.batch_error_rate = 0.0
+        progress = backfill_progress(db, client.id)
+        scored = db.query(Mention.id).filter(Mention.client_id == client.id, Mention.sentiment.isnot(None)).count()
+    finally:
+        db.close()
+
+    return {
+        "mentions": options.backfill_mentions,
+        "queued": queued,
+        "enqueue_seconds": round(enqueue_seconds, 4),
+        "deferred_while_live": deferred,
+        "rounds": rounds,
+        "batches_submitted": anthropic.batches_created - batches_before,
+        "batches_collected": totals["batches"],
+        "retried": totals["retried"],
+        "failed": progress["failed"],
+        "scored": scored,
+        "seconds": round(elapsed, 4),
+        "mentions_per_sec": round(scored / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+_STARTUP_PROBES = {
+    "import_app_main_ms": "import app.main",
+    "api_first_request_ms": (
+        "from fastapi.testclient import TestClient; from app.main import app; "
+        "TestClient(app).get('/').raise_for_status()"
+    ),
+    "import_celery_tasks_ms": "import app.tasks",
+}
+
+
+def _probe_ms(code: str) -> float:
+    """Milliseconds a fresh interpreter spends executing ``code`` (interpreter start excluded)."""
+    script = f"import time; _t = time.perf_counter(); {code}; print((time.perf_counter() - _t) * 1000)"
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=os.environ.copy(),
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+@scenario("startup")
+def startup(options: BenchOptions, state: Dict[str, object]) -> Dict[str, object]:
+    """Median cold-start cost of importing the API / Celery modules and serving a first request."""
+    results: Dict[str, object] = {"runs": options.startup_runs}
+    for name, code in _STARTUP_PROBES.items():
+        samples = [_probe_ms(code) for _ in range(options.startup_runs)]
+        results[name] = round(statistics.median(samples), 2)
+    return results
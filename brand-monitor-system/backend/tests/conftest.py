@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import fakeredis
+import pytest
+
+from benchmarks.environment import configure_environment
+
+# Settings, engine and SDK clients are built lazily, so this only has to run before first use.
+configure_environment()
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    from app.core.cache import redis_provider
+
+    client = fakeredis.FakeRedis()
+    redis_provider.override(client)
+    yield client
+    redis_provider.override(None)
+
+
+@pytest.fixture
+def db():
+    from app.core.database import SessionLocal
+    from benchmarks.environment import create_schema
+
+    create_schema()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def apify():
+    from app.core.apify_client import apify_client_provider
+    from benchmarks.fakes import FakeApifyClient
+
+    fake = FakeApifyClient()
+    apify_client_provider.override(fake)
+    yield fake
+    apify_client_provider.override(None)
+
+
+@pytest.fixture
+def anthropic():
+    from app.processors.sentiment_analyzer import anthropic_client_provider
+    from benchmarks.fakes import FakeAnthropic
+
+    fake = FakeAnthropic()
+    anthropic_client_provider.override(fake)
+    yield fake
+    anthropic_client_provider.override(None)
+
+
+@pytest.fixture
+def client(db):
+    from benchmarks.environment import seed_client
+
+    return seed_client(db)
+
+
+@pytest.fixture
+def api():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
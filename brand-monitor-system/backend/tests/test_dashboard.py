@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.api.v1.auth import IdentityCache, client_identities
+from app.core.cache import mark_client_ingest
+from app.core.database import get_engine
+from app.models.client import Client
+
+
+@pytest.fixture(autouse=True)
+def fresh_identities():
+    client_identities.clear()
+    yield
+    client_identities.clear()
+
+
+@pytest.fixture
+def berlin(monkeypatch):
+    """Run with a local time zone east of UTC; naive-UTC mixups then show up as a 1-2 hour skew."""
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.fixture
+def statements():
+    executed = []
+
+    def record(conn, cursor, statement, *args):  # noqa: ANN001
+        executed.append(statement)
+
+    engine = get_engine()
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def _get(api, client, **headers):
+    return api.get("/api/v1/dashboard", headers={"Authorization": f"Bearer {client.api_key}", **headers})
+
+
+def test_validators_name_the_latest_ingest(api, client, berlin):
+    mark_client_ingest(client.id)
+    response = _get(api, client)
+
+    assert response.status_code == 200
+    last_modified = parsedate_to_datetime(response.headers["Last-Modified"])
+    assert abs((last_modified - datetime.now(timezone.utc)).total_seconds()) < 5
+    last_ingest = datetime.fromisoformat(response.json()["last_ingest_at"])
+    assert abs((last_ingest - datetime.now(timezone.utc)).total_seconds()) < 5
+    assert response.headers["ETag"].startswith(f'W/"{client.id.hex}-')
+
+
+def test_matching_etag_gets_304_without_database_access(api, client, statements):
+    etag = _get(api, client).headers["ETag"]
+    statements.clear()
+
+    response = _get(api, client, **{"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert statements == []
+
+
+def test_new_ingest_changes_the_etag(api, client):
+    etag = _get(api, client).headers["ETag"]
+    time.sleep(0.002)
+    mark_client_ingest(client.id)
+
+    response = _get(api, client, **{"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_if_modified_since(api, client, statements, berlin):
+    last_modified = _get(api, client).headers["Last-Modified"]
+    statements.clear()
+
+    assert _get(api, client, **{"If-Modified-Since": last_modified}).status_code == 304
+    assert statements == []
+
+    earlier = parsedate_to_datetime(last_modified) - timedelta(minutes=1)
+    assert _get(api, client, **{"If-Modified-Since": format_datetime(earlier, usegmt=True)}).status_code == 200
+
+
+def test_deactivated_key_is_evicted_on_401(api, db, client):
+    assert _get(api, client).status_code == 200
+    db.query(Client).filter(Client.id == client.id).update({Client.status: "suspended"})
+    db.commit()
+
+    # Any endpoint that finds the key inactive drops the dashboard's cached identity.
+    assert api.post("/api/v1/auth/validate", headers={"Authorization": f"Bearer {client.api_key}"}).status_code == 401
+    assert _get(api, client).status_code == 401
+
+
+def test_identity_cache_is_bounded_and_hashed():
+    cache = IdentityCache(max_entries=2)
+    for key in ("key-a", "key-b", "key-c"):
+        cache.put(key, {"client": key}, ttl=60)
+
+    assert cache.get("key-a") is None
+    assert cache.get("key-c") == {"client": "key-c"}
+    assert not any("key-" in stored for stored in cache._entries)
+
+    cache.put("key-d", {"client": "key-d"}, ttl=-1)
+    assert cache.get("key-d") is None
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+from app.core.metrics import HTTP_REQUEST_SECONDS, _route_template
+
+
+def _observed_routes() -> set:
+    return {
+        sample.labels["route"]
+        for metric in HTTP_REQUEST_SECONDS.collect()
+        for sample in metric.samples
+        if sample.name.endswith("_count")
+    }
+
+
+def test_requests_are_labelled_with_the_route_template(api, client):
+    response = api.get(
+        f"/api/v1/scrape/status/{uuid.uuid4()}", headers={"Authorization": f"Bearer {client.api_key}"}
+    )
+
+    assert response.status_code == 404
+    routes = _observed_routes()
+    assert "/api/v1/scrape/status/{scrape_job_id}" in routes
+    assert not any(route.startswith("/api/v1/scrape/status/") and "{" not in route for route in routes)
+
+
+def test_matched_route_is_read_from_scope_without_scanning_routes():
+    route = SimpleNamespace(path="/api/v1/stories/")
+
+    assert _route_template(None, {"route": route, "type": "http", "path": "/api/v1/stories/"}) == "/api/v1/stories/"
+
+
+def test_unrouted_requests_fall_back_to_a_scan(api):
+    api.get("/no/such/path")
+
+    assert "unmatched" in _observed_routes()
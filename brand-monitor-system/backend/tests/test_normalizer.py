@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import pytest
+
+from app.scrapers import normalizer
+from app.scrapers.normalizer import Normalizer, clean_text
+
+
+@pytest.mark.parametrize(
+    "raw, text",
+    [
+        ('<p>Hello <b>world</b></p><script>var x = "<p>";</script> tail', "Hello world tail"),
+        ("<!-- note --> a &amp; b <NAV class=menu>Home</nav > c", "a & b c"),
+        ("<svg/> kept <form><input></form>", "kept"),
+        ("a < b and 2 <3", "a < b and 2 <3"),
+        ("cut off <div class=\"lead", "cut off"),
+        ("body <script>never closed", "body"),
+        ("body <!-- never closed", "body"),
+    ],
+)
+def test_clean_text(raw, text):
+    assert clean_text(raw) == text
+
+
+class _TracedText(str):
+    """Text recording the span of every ``find``/``startswith`` scan over it."""
+
+    spans: list
+
+    def find(self, sub, start=0, *args):
+        found = super().find(sub, start, *args)
+        self.spans.append((start, len(self) if found < 0 else found + len(sub)))
+        return found
+
+    def startswith(self, prefix, start=0, *args):
+        self.spans.append((start, start + len(prefix)))
+        return super().startswith(prefix, start, *args)
+
+
+class _TracedPattern:
+    """Pattern recording the span of text each ``match``/``search`` looked at."""
+
+    def __init__(self, pattern, spans: list):
+        self.pattern = pattern
+        self.spans = spans
+
+    def match(self, text, pos=0):
+        found = self.pattern.match(text, pos)
+        # A failed tag match reads up to the next ``<`` at most.
+        stop = found.end() if found else str.find(text, "<", pos + 1)
+        self.spans.append((pos, len(text) if stop < 0 else stop))
+        return found
+
+    def search(self, text, pos=0):
+        found = self.pattern.search(text, pos)
+        self.spans.append((pos, found.end() if found else len(text)))
+        return found
+
+
+REPEAT = 2000
+
+
+@pytest.mark.parametrize(
+    "unit, kept",
+    [
+        ("<script>", ""),
+        ("<!--", ""),
+        # Each unterminated tag is text up to the next ``<``; the last one runs to the end.
+        ("<style x=", "<style x=" * (REPEAT - 1)),
+        ("<a", "<a" * (REPEAT - 1)),
+        ("<", "<" * REPEAT),
+    ],
+    ids=["script", "comment", "attribute", "tag", "bracket"],
+)
+def test_clean_text_is_linear_on_broken_markup(unit, kept, monkeypatch):
+    spans: list = []
+    monkeypatch.setattr(normalizer, "_MARKUP", _TracedPattern(normalizer._MARKUP, spans))
+    monkeypatch.setattr(
+        normalizer,
+        "_DROPPED_CLOSE",
+        {tag: _TracedPattern(pattern, spans) for tag, pattern in normalizer._DROPPED_CLOSE.items()},
+    )
+    text = _TracedText("x " + unit * REPEAT)
+    text.spans = spans
+
+    assert clean_text(text) == f"x {kept}".strip()
+    # No scan starts behind an earlier one, and each character is looked at a bounded number of times
+    # (a quadratic scan would read ~REPEAT times the text).
+    starts = [start for start, _ in spans]
+    assert starts == sorted(starts)
+    assert sum(stop - start for start, stop in spans) <= 8 * len(text)
+
+
+def test_raw_fields_are_capped_before_cleaning():
+    normalizer = Normalizer(None, max_content_chars=100)
+    row = normalizer.normalize({"url": "https://example.com", "text": "word " * 10000})
+
+    assert len(row["content"]) <= 100
+    assert clean_text("<b>" + "x" * 10, max_chars=5) == "xx"
+
+
+@pytest.mark.parametrize(
+    "source_type, item, content_key",
+    [
+        ("reddit", {"url": "https://reddit.com/r/x/1", "title": "Acme", "body": "Acme rocks", "score": 3}, "body"),
+        ("news", {"link": "https://news.example/1", "title": "Acme", "description": "Acme grows"}, "description"),
+        ("web_scraper", {"url": "https://acme.com", "text": "Acme page", "html": "<p>Acme page</p>"}, "text"),
+        (None, {"url": "https://example.com", "content": "Acme elsewhere", "extra": 1}, "content"),
+    ],
+)
+def test_raw_data_does_not_repeat_content(source_type, item, content_key):
+    normalizer_ = Normalizer(source_type)
+    row = normalizer_.normalize(item)
+
+    assert row["content"]
+    assert content_key not in row["raw_data"]
+    assert "html" not in row["raw_data"]
+    assert set(row["raw_data"]) == set(item) - {content_key, "html"}
+    assert normalizer_.stats.bytes_in == sum(
+        len(item[key]) for key in ("title", content_key, "html") if key in item
+    )
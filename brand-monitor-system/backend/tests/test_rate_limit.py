@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from app.core import rate_limit
+from app.core.config import get_settings
+from app.core.rate_limit import BUCKET_KEY, TIER_LIMITS, take_token
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "rate_limit_enabled", True)
+    monkeypatch.setattr(rate_limit, "_redis_down_until", 0.0)
+
+
+def _mentions(api, client):
+    return api.get("/api/v1/mentions/", headers={"Authorization": f"Bearer {client.api_key}"})
+
+
+def test_bucket_admits_a_burst_of_limit_then_refuses(client):
+    limit = TIER_LIMITS["starter"]["analytics"]
+
+    decisions = [take_token(client.id, "starter", "analytics") for _ in range(limit.limit + 1)]
+
+    assert all(decision.allowed for decision in decisions[:-1])
+    assert [decision.remaining for decision in decisions[:3]] == [limit.limit - 1, limit.limit - 2, limit.limit - 3]
+    refused = decisions[-1]
+    assert not refused.allowed
+    assert refused.remaining == 0
+    assert 1 <= refused.retry_after <= limit.period / limit.limit + 1
+
+
+def test_buckets_are_per_client_and_endpoint_class(db, client):
+    from benchmarks.environment import seed_client
+
+    other = seed_client(db, tier="starter")
+    for _ in range(TIER_LIMITS["starter"]["analytics"].limit):
+        take_token(client.id, "starter", "analytics")
+
+    assert not take_token(client.id, "starter", "analytics").allowed
+    assert take_token(client.id, "starter", "read").allowed
+    assert take_token(other.id, "starter", "analytics").allowed
+
+
+def test_admitted_responses_carry_ratelimit_headers(api, client):
+    limit = TIER_LIMITS[client.subscription_tier]["read"]
+
+    first, second = _mentions(api, client), _mentions(api, client)
+
+    assert first.status_code == 200
+    assert first.headers["RateLimit-Limit"] == str(limit.limit)
+    assert first.headers["RateLimit-Remaining"] == str(limit.limit - 1)
+    assert second.headers["RateLimit-Remaining"] == str(limit.limit - 2)
+    assert int(first.headers["RateLimit-Reset"]) >= 1
+    assert "Retry-After" not in first.headers
+
+
+def test_exhausted_bucket_gets_429_with_retry_after(api, client, redis):
+    key = BUCKET_KEY.format(client_id=client.id, endpoint_class="read")
+    redis.hset(key, mapping={"tokens": "0", "ts": repr(time.time())})
+
+    response = _mentions(api, client)
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.headers["RateLimit-Remaining"] == "0"
+
+
+def test_limiter_fails_open_without_redis(client):
+    from app.core.cache import redis_provider
+
+    class Down:
+        def __getattr__(self, name):
+            raise ConnectionError("redis is down")
+
+    redis_provider.override(Down())
+    assert take_token(client.id, "starter", "read") is None
+    assert rate_limit._redis_down_until > time.monotonic()
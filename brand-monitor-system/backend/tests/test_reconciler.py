@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.scrape_job import ScrapeJob
+from app.scrapers.reconciler import reconcile_scrape_jobs
+from benchmarks.datasets import generate_dataset
+from benchmarks.environment import seed_client
+
+ACTOR = "apify/google-search-scraper"
+
+
+def _job(db, client, run_id: str | None, status: str = "running", age: timedelta = timedelta(hours=1)) -> ScrapeJob:
+    job = ScrapeJob(
+        client_id=client.id,
+        apify_run_id=run_id,
+        source_type="google_search",
+        status=status,
+        started_at=datetime.utcnow() - age,
+        created_at=datetime.utcnow() - age,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+@pytest.fixture
+def ingested():
+    return []
+
+
+def _reconcile(db, ingested):
+    return reconcile_scrape_jobs(db, lambda job, dataset_id: ingested.append((job.id, dataset_id)))
+
+
+def test_runs_are_reconciled_by_status(db, client, apify, ingested):
+    succeeded = apify.register_run(ACTOR, generate_dataset("google_search", 5))
+    failed = apify.register_run(ACTOR, [], status="FAILED")
+    running = apify.register_run(ACTOR, [], status="RUNNING")
+    jobs = {
+        "succeeded": _job(db, client, succeeded["id"]),
+        "failed": _job(db, client, failed["id"], status="processing"),
+        "running": _job(db, client, running["id"]),
+        "unknown": _job(db, client, "no-such-run"),
+    }
+
+    counts = _reconcile(db, ingested)
+
+    assert counts == {"checked": 4, "ingest": 1, "failed": 2, "running": 1, "unreachable": 0}
+    assert ingested == [(jobs["succeeded"].id, succeeded["defaultDatasetId"])]
+    for job in jobs.values():
+        db.refresh(job)
+    assert jobs["failed"].status == "failed" and jobs["failed"].error_message == "Apify run failed"
+    assert jobs["unknown"].status == "failed"
+    assert jobs["running"].status == "running"
+    assert jobs["succeeded"].completed_at is not None
+
+
+def test_succeeded_run_without_dataset_is_failed_not_polled_forever(db, client, apify, ingested):
+    run = apify.register_run(ACTOR, [])
+    run["defaultDatasetId"] = None
+    job = _job(db, client, run["id"])
+
+    assert _reconcile(db, ingested)["failed"] == 1
+    db.refresh(job)
+    assert job.status == "failed"
+    assert ingested == []
+    assert _reconcile(db, ingested)["checked"] == 0
+
+
+def test_recent_and_finished_jobs_are_not_polled(db, client, apify, ingested):
+    run = apify.register_run(ACTOR, [])
+    _job(db, client, run["id"], age=timedelta(seconds=5))
+    _job(db, client, run["id"], status="completed")
+
+    assert _reconcile(db, ingested)["checked"] == 0
+
+
+def _statuses(api, client, *ids):
+    return api.get(
+        "/api/v1/scrape/status",
+        params=[("ids", value) for value in ids],
+        headers={"Authorization": f"Bearer {client.api_key}"},
+    )
+
+
+def test_bulk_status_keeps_request_order_and_lists_foreign_ids_as_missing(api, db, client):
+    other = seed_client(db)
+    first, second = _job(db, client, None, status="queued"), _job(db, client, "run-1")
+    foreign = _job(db, other, "run-2")
+    unknown = uuid.uuid4()
+
+    response = _statuses(api, client, f"{second.id},{first.id}", str(foreign.id), str(second.id), str(unknown))
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [job["id"] for job in body["jobs"]] == [str(second.id), str(first.id)]
+    assert [job["status"] for job in body["jobs"]] == ["running", "queued"]
+    assert body["missing"] == [str(foreign.id), str(unknown)]
+
+
+def test_bulk_status_rejects_bad_ids(api, client):
+    assert _statuses(api, client, "not-a-uuid").status_code == 400
+    assert _statuses(api, client, *(str(uuid.uuid4()) for _ in range(101))).status_code == 400
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.config import get_settings
+from app.core.database import Base
+from app.core.replicas import ReplicaPool, primary_pins, replica_pool
+from app.models.client import Client
+from app.models.mention import Mention
+
+MENTIONS = 30
+
+
+@pytest.fixture
+def replica(db, client, monkeypatch):
+    """A second SQLite file standing in for a replica that has the client row but none of its mentions yet."""
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='brand-monitor-replica-'), 'replica.db')}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            Client.__table__.insert(),
+            {
+                "id": client.id,
+                "api_key": client.api_key,
+                "company_name": "Replica Co",
+                "email": client.email,
+                "subscription_tier": client.subscription_tier,
+                "monthly_mention_limit": client.monthly_mention_limit,
+                "status": "active",
+            },
+        )
+    engine.dispose()
+
+    now = datetime.utcnow()
+    db.bulk_insert_mappings(
+        Mention,
+        [
+            {
+                "id": uuid.uuid4(),
+                "client_id": client.id,
+                "source_type": "news",
+                "source_url": f"https://example.com/{index}",
+                "content": "Acme in the news",
+                "discovered_at": now,
+                "created_at": now,
+            }
+            for index in range(MENTIONS)
+        ],
+    )
+    db.commit()
+
+    monkeypatch.setattr(get_settings(), "database_replica_urls", [url])
+    replica_pool.reset()
+    primary_pins._expires.clear()
+    yield url
+    replica_pool.get().dispose()
+    replica_pool.reset()
+    primary_pins._expires.clear()
+
+
+def _auth(client, **headers):
+    return {"Authorization": f"Bearer {client.api_key}", **headers}
+
+
+def _mention_total(api, client, **headers) -> int:
+    response = api.get("/api/v1/mentions/", headers=_auth(client, **headers))
+    assert response.status_code == 200
+    return response.json()["total"]
+
+
+def test_reads_go_to_the_replica_unless_primary_is_requested(replica, api, client):
+    assert _mention_total(api, client) == 0
+    assert _mention_total(api, client, **{"X-Read-From": "primary"}) == MENTIONS
+
+
+def test_non_get_requests_use_the_primary(replica, api, client):
+    response = api.post("/api/v1/auth/validate", headers=_auth(client))
+
+    assert response.status_code == 200
+    assert response.json()["company_name"] == client.company_name
+
+
+def test_api_key_missing_on_replica_is_retried_on_primary(replica, api, db, client):
+    engine = create_engine(replica)
+    with engine.begin() as connection:
+        connection.execute(Client.__table__.delete())
+    engine.dispose()
+
+    # The client authenticates from the primary, and the rest of the request stays there.
+    assert _mention_total(api, client) == MENTIONS
+
+
+def test_write_pins_client_to_primary_across_processes(replica, api, client, redis, monkeypatch):
+    monkeypatch.setattr("app.api.v1.scraping.request_dispatch", lambda: None)  # no Celery broker here
+    response = api.post(
+        "/api/v1/scrape/trigger",
+        json={"source_type": "news", "keywords": ["acme"]},
+        headers=_auth(client),
+    )
+    assert response.status_code == 200
+    assert _mention_total(api, client) == MENTIONS
+
+    # Another API worker has no in-process pin; the Redis one still applies.
+    primary_pins._expires.clear()
+    assert redis.exists(f"brand_monitor:primary_pin:{client.id}")
+    assert _mention_total(api, client) == MENTIONS
+
+    redis.flushall()
+    assert _mention_total(api, client) == 0
+
+
+def test_expired_lag_is_probed_by_one_request_at_a_time(replica):
+    pool = ReplicaPool([replica], max_lag_seconds=5, check_interval=0.2)
+    probes = []
+
+    def slow_probe(index):
+        probes.append(index)
+        time.sleep(0.05)
+        return 0.0
+
+    pool.measure_lag = slow_probe
+    pool.lag(0)
+    probes.clear()
+    time.sleep(0.25)
+
+    threads = [threading.Thread(target=pool.lag, args=(0,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(probes) == 1
+    pool.dispose()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.core.config import get_settings
+from app.models.scrape_job import ScrapeJob
+from app.scrapers.scrape_queue import (
+    TIER_SCRAPE_CONCURRENCY,
+    _queued_round_robin,
+    active_runs,
+    dispatch_queued_scrapes,
+)
+from benchmarks.environment import seed_client
+
+
+def _job(db, client, status: str, claimed_at: datetime | None = None) -> ScrapeJob:
+    job = ScrapeJob(
+        client_id=client.id,
+        source_type="news",
+        run_config={"keywords": ["acme"]},
+        status=status,
+        claimed_at=claimed_at,
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_stale_pending_claim_is_requeued_and_started(db, apify):
+    client = seed_client(db, tier="starter")
+    job = _job(db, client, "pending", claimed_at=datetime.utcnow() - timedelta(hours=1))
+
+    started = dispatch_queued_scrapes(db)
+
+    assert [scrape_job.id for scrape_job in started] == [job.id]
+    db.refresh(job)
+    assert job.status == "running" and job.apify_run_id is not None
+
+
+def test_live_pending_claim_keeps_its_slot(db, apify):
+    client = seed_client(db, tier="starter")
+    claimed = _job(db, client, "pending", claimed_at=datetime.utcnow())
+    queued = _job(db, client, "queued")
+
+    assert dispatch_queued_scrapes(db) == []
+    db.refresh(claimed)
+    db.refresh(queued)
+    assert (claimed.status, queued.status) == ("pending", "queued")
+
+
+def _backlog(db, client, count: int) -> list:
+    return [_job(db, client, "queued") for _ in range(count)]
+
+
+def test_round_robin_interleaves_tenants(db):
+    heavy = seed_client(db, tier="professional")
+    light = seed_client(db, tier="starter")
+    heavy_jobs = _backlog(db, heavy, 5)
+    light_jobs = _backlog(db, light, 2)
+
+    order = [(job_id, client_id) for job_id, client_id, _ in _queued_round_robin(db)]
+
+    # Each round takes every tenant's next-oldest job, so the light tenant doesn't wait out the heavy backlog.
+    assert order[:4] == [
+        (heavy_jobs[0].id, heavy.id),
+        (light_jobs[0].id, light.id),
+        (heavy_jobs[1].id, heavy.id),
+        (light_jobs[1].id, light.id),
+    ]
+    assert [job_id for job_id, _ in order[4:]] == [job.id for job in heavy_jobs[2:]]
+
+
+def test_dispatch_respects_tier_and_global_caps(db, apify, monkeypatch):
+    heavy = seed_client(db, tier="professional")
+    light = seed_client(db, tier="starter")
+    _backlog(db, heavy, 5)
+    _backlog(db, light, 3)
+
+    monkeypatch.setattr(get_settings(), "apify_max_concurrent_runs", 2)
+    assert sorted(str(job.client_id) for job in dispatch_queued_scrapes(db)) == sorted([str(heavy.id), str(light.id)])
+
+    monkeypatch.setattr(get_settings(), "apify_max_concurrent_runs", 25)
+    dispatch_queued_scrapes(db)
+    assert active_runs(db) == {heavy.id: TIER_SCRAPE_CONCURRENCY["professional"], light.id: 1}
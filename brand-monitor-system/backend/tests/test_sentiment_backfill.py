@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core import cache
+from app.core.cache import get_client_ingest
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.mention import Mention
+from app.models.sentiment_backfill import SentimentBackfillItem
+from app.models.sentiment_batch import SentimentBatch
+from app.processors import sentiment_backfill
+from app.processors.sentiment_analyzer import analyzer
+from app.processors.sentiment_backfill import collect_backfill, enqueue_backfill, submit_backfill
+from benchmarks.environment import seed_client
+
+
+pytestmark = pytest.mark.usefixtures("anthropic")
+
+
+@pytest.fixture(autouse=True)
+def no_live_sentiment(monkeypatch):
+    """Start without the in-process live marker a previous test's live call may have left."""
+    monkeypatch.setattr(cache, "_live_sentiment_until", 0.0)
+
+
+def _seed_mentions(db, client_id, count: int) -> None:
+    now = datetime.utcnow()
+    db.add_all(
+        Mention(
+            id=uuid.uuid4(),
+            client_id=client_id,
+            source_type="news",
+            source_url=f"https://example.com/{uuid.uuid4()}",
+            title="Acme",
+            content="Acme ships a new product",
+            discovered_at=now,
+            created_at=now,
+        )
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def test_collect_marks_each_client_once_its_chunk_commits(db, client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "sentiment_backfill_request_size", 3)
+    other = seed_client(db)
+    for client_id, count in ((client.id, 6), (other.id, 12)):
+        _seed_mentions(db, client_id, count)
+        enqueue_backfill(db, client_id)
+    assert submit_backfill(db) is not None
+
+    marked = []
+
+    def mark(client_id, at=None):
+        with SessionLocal() as check:  # the chunk must be visible to other sessions by now
+            scored = check.query(Mention.id).filter(Mention.client_id == client_id, Mention.sentiment.isnot(None))
+            marked.append((client_id, scored.count()))
+
+    monkeypatch.setattr(sentiment_backfill, "WRITEBACK_CHUNK_SIZE", 4)
+    monkeypatch.setattr(sentiment_backfill, "mark_client_ingest", mark)
+    counts = collect_backfill(db)
+
+    # Requests of 3 mentions, flushed once 4+ results are pending: chunks of 6.
+    assert counts["scored"] == 18
+    assert marked == [(client.id, 6), (other.id, 6), (other.id, 12)]
+
+
+def test_collect_moves_the_ingest_marker(db, client):
+    _seed_mentions(db, client.id, 3)
+    enqueue_backfill(db, client.id)
+    before = get_client_ingest(client.id)
+    submit_backfill(db)
+
+    collect_backfill(db)
+
+    assert get_client_ingest(client.id) > before
+
+
+def test_submit_waits_while_live_sentiment_is_active(db, client, anthropic, redis):
+    _seed_mentions(db, client.id, 3)
+    enqueue_backfill(db, client.id)
+    analyzer.analyze_batch([{"title": "Acme", "content": "Acme ships a new product"}])
+
+    assert submit_backfill(db) is None
+    # Another worker has no in-process marker; the Redis one still defers it.
+    cache._live_sentiment_until = 0.0
+    assert submit_backfill(db) is None
+
+    assert anthropic.batches_created == 0
+    assert db.query(SentimentBatch).count() == 0
+    assert {item.status for item in db.query(SentimentBackfillItem)} == {"queued"}
+
+    redis.delete(cache.LIVE_SENTIMENT_KEY)
+    assert submit_backfill(db) is not None
+    assert anthropic.batches_created == 1
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from app.core.config import get_settings
+from app.models.mention import Mention
+from app.models.story import Story
+from app.processors.sentiment_analyzer import analyzer
+from app.processors.story_clusterer import story_clusterer
+from benchmarks.datasets import generate_story_mentions
+from benchmarks.scenarios import _seed_story_mentions
+
+STORIES = 20
+
+
+def _cluster(db, client, items, increment: int):
+    for start in range(0, len(items), increment):
+        _seed_story_mentions(db, client.id, items[start:start + increment], offset=start)
+        story_clusterer.cluster_pending(db, client.id, analyze=False)
+
+    truth = {f"https://example.com/story/{index}": item["story"] for index, item in enumerate(items)}
+    members = {}
+    for story_id, url in db.query(Mention.story_id, Mention.source_url).filter(Mention.client_id == client.id):
+        members.setdefault(story_id, Counter())[truth[url]] += 1
+    return members
+
+
+@pytest.mark.parametrize("batch_size, increment", [(1000, 1000), (5, 1000), (1000, 5), (1000, 1)])
+def test_stories_do_not_depend_on_sweep_size(db, client, monkeypatch, batch_size, increment):
+    monkeypatch.setattr(get_settings(), "story_batch_size", batch_size)
+    items = generate_story_mentions(STORIES, 12)
+
+    members = _cluster(db, client, items, increment)
+
+    assert None not in members
+    assert all(len(counts) == 1 for counts in members.values())  # no story mixes two true stories
+    # Per-batch IDF split these into 50+ stories at small batch sizes. A mention unlike
+    # every centroid can still start a story of its own, but each true story must have
+    # exactly one story holding the rest of it.
+    grown = [next(iter(counts)) for counts in members.values() if sum(counts.values()) > 1]
+    assert sorted(grown) == list(range(STORIES))
+
+
+def test_unsampled_members_inherit_story_sentiment(db, client, anthropic, monkeypatch):
+    monkeypatch.setattr(get_settings(), "story_sample_size", 2)
+    items = generate_story_mentions(STORIES, 6)
+    _seed_story_mentions(db, client.id, items)
+
+    counts = story_clusterer.cluster_pending(db, client.id)
+
+    mentions = db.query(Mention).filter(Mention.client_id == client.id).all()
+    assert all(mention.sentiment is not None for mention in mentions)
+    analysed = [mention for mention in mentions if not mention.sentiment_inherited]
+    assert len(analysed) == counts["sampled"] < len(mentions)
+    for mention in mentions:
+        if mention.sentiment_inherited:
+            story = db.get(Story, mention.story_id)
+            assert (mention.sentiment, mention.sentiment_score) == (story.sentiment, story.sentiment_score)
+
+
+def test_members_missing_from_a_short_model_reply_are_retried(db, client, anthropic, monkeypatch):
+    monkeypatch.setattr(get_settings(), "story_sample_size", 3)
+    analyze_batch = analyzer.analyze_batch
+    calls = []
+
+    def short_once(mentions):
+        calls.append(len(mentions))
+        results = analyze_batch(mentions)
+        return results[:-1] if len(calls) == 1 else results
+
+    monkeypatch.setattr(analyzer, "analyze_batch", short_once)
+    _seed_story_mentions(db, client.id, generate_story_mentions(STORIES, 4))
+
+    counts = story_clusterer.cluster_pending(db, client.id)
+
+    # The mention the first reply left out is sent once more; every sample ends up analysed.
+    assert sum(calls) == counts["sampled"] + 1
+    analysed = db.query(Mention).filter(Mention.client_id == client.id, Mention.sentiment_inherited.isnot(True))
+    assert analysed.filter(Mention.sentiment.isnot(None)).count() == counts["sampled"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.apify_client import apify_service
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models.mention import Mention
+from app.models.scrape_job import ScrapeJob
+from app.models.webhook_delivery import WebhookDelivery
+from app.scrapers.webhook_handler import claim_delivery, ingest_run
+from benchmarks.datasets import generate_dataset
+
+LEASE_SECONDS = 300
+ITEMS = 50
+CHUNK = 10
+
+
+@pytest.fixture
+def run(db, client, apify, monkeypatch):
+    """A finished Google Search run of :data:`ITEMS` items, ingested in pages and chunks of :data:`CHUNK`."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "ingest_chunk_size", CHUNK)
+    monkeypatch.setattr(settings, "dataset_page_size", CHUNK)
+
+    apify_run = apify.register_run("apify/google-search-scraper", generate_dataset("google_search", ITEMS))
+    job = ScrapeJob(
+        client_id=client.id,
+        apify_run_id=apify_run["id"],
+        source_type="google_search",
+        status="running",
+        created_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    return job, apify_run["id"], apify_run["defaultDatasetId"]
+
+
+def _fail_after(monkeypatch, pages: int, action) -> None:
+    """Make the next dataset fetch call ``action`` once ``pages`` pages have been served; later fetches are untouched."""
+    fetch = apify_service.iter_dataset_pages
+    pending = [action]
+
+    def flaky(dataset_id, offset=0, page_size=5000):
+        for index, page in enumerate(fetch(dataset_id, offset=offset, page_size=page_size)):
+            if index == pages and pending:
+                pending.pop()()
+            yield page
+
+    monkeypatch.setattr(apify_service, "iter_dataset_pages", flaky)
+
+
+def _ledger(db, run_id) -> WebhookDelivery:
+    db.expire_all()
+    return db.query(WebhookDelivery).filter(WebhookDelivery.apify_run_id == run_id).one()
+
+
+def _mention_urls(db, job) -> list:
+    return [url for (url,) in db.query(Mention.source_url).filter(Mention.scrape_job_id == job.id)]
+
+
+def test_first_claim_inserts_ledger_row(db, run):
+    job, run_id, dataset_id = run
+
+    delivery = claim_delivery(db, job.id, run_id, dataset_id, LEASE_SECONDS)
+
+    assert delivery is not None
+    assert (delivery.status, delivery.attempts, delivery.items_committed) == ("processing", 1, 0)
+    assert delivery.lease_expires_at > datetime.utcnow()
+
+
+def test_duplicate_while_lease_is_held_is_refused(db, run):
+    job, run_id, dataset_id = run
+    assert claim_delivery(db, job.id, run_id, dataset_id, LEASE_SECONDS) is not None
+
+    other = SessionLocal()
+    try:
+        assert claim_delivery(other, job.id, run_id, dataset_id, LEASE_SECONDS) is None
+    finally:
+        other.close()
+    assert _ledger(db, run_id).attempts == 1
+
+
+def test_duplicate_of_completed_delivery_is_ignored(db, run):
+    job, run_id, dataset_id = run
+    assert ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+
+    db.query(WebhookDelivery).update({WebhookDelivery.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+
+    assert not ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+    assert len(_mention_urls(db, job)) == ITEMS
+    assert _ledger(db, run_id).status == "completed"
+
+
+def test_retry_resumes_from_items_committed(db, run, monkeypatch):
+    job, run_id, dataset_id = run
+
+    def fail():
+        raise ConnectionError("dataset fetch failed")
+
+    _fail_after(monkeypatch, 2, fail)
+    with pytest.raises(ConnectionError):
+        ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+
+    delivery = _ledger(db, run_id)
+    assert delivery.items_committed == 2 * CHUNK
+    assert delivery.lease_expires_at <= datetime.utcnow()  # released for the next retry
+    assert len(_mention_urls(db, job)) == 2 * CHUNK
+
+    assert ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+
+    urls = _mention_urls(db, job)
+    assert len(urls) == len(set(urls)) == ITEMS
+    delivery = _ledger(db, run_id)
+    assert (delivery.status, delivery.attempts, delivery.items_committed) == ("completed", 2, ITEMS)
+
+
+def test_takeover_fences_out_the_expired_holder(db, run, monkeypatch):
+    job, run_id, dataset_id = run
+
+    def take_over():
+        other = SessionLocal()
+        try:
+            other.query(WebhookDelivery).update(
+                {WebhookDelivery.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)}
+            )
+            other.commit()
+            assert claim_delivery(other, job.id, run_id, dataset_id, LEASE_SECONDS) is not None
+        finally:
+            other.close()
+
+    # The slow holder commits one chunk, then a retry takes its expired lease over.
+    _fail_after(monkeypatch, 1, take_over)
+    assert not ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+
+    assert len(_mention_urls(db, job)) == CHUNK  # its next chunk was rolled back
+    delivery = _ledger(db, run_id)
+    assert (delivery.status, delivery.attempts, delivery.items_committed) == ("processing", 2, CHUNK)
+
+    # The new holder's work resumes from the fenced checkpoint without duplicates.
+    db.query(WebhookDelivery).update({WebhookDelivery.lease_expires_at: datetime.utcnow() - timedelta(seconds=1)})
+    db.commit()
+    assert ingest_run(db, job, run_id, dataset_id, LEASE_SECONDS)
+    urls = _mention_urls(db, job)
+    assert len(urls) == len(set(urls)) == ITEMS
+
+
+def test_webhook_ingest_does_not_block_other_requests(api, db, run, monkeypatch):
+    job, run_id, dataset_id = run
+    fetching, release = threading.Event(), threading.Event()
+    _fail_after(monkeypatch, 1, lambda: (fetching.set(), release.wait(10)))
+    payload = {"resource": {"id": run_id, "defaultDatasetId": dataset_id, "status": "SUCCEEDED"}}
+    responses = []
+
+    with api:  # one event loop shared by both threads' requests
+        webhook = threading.Thread(
+            target=lambda: responses.append(api.post(f"/api/v1/webhooks/apify/{job.client_id}", json=payload))
+        )
+        webhook.start()
+        assert fetching.wait(10)
+        try:
+            assert api.get("/").status_code == 200
+            assert webhook.is_alive()  # still ingesting while the other request was served
+        finally:
+            release.set()
+            webhook.join(10)
+
+    assert responses[0].json() == {"status": "processed"}
+    assert len(_mention_urls(db, job)) == ITEMS
@@ -56,14 +56,13 @@ function brand_monitor_get_mentions_ajax() {
 function brand_monitor_dashboard_page() {
     $api_client = new Brand_Monitor_API_Client();
 
-    $mentions = $api_client->get_mentions(array(
-        'limit' => 10,
-        'sort' => 'discovered_at_desc'
+    $dashboard = $api_client->get_dashboard(array(
+        'mentions_limit' => 10,
     ));
 
-    $sentiment_data = $api_client->get_analytics('sentiment', array(
-        'days' => 7
-    ));
+    $mentions = $dashboard['mentions'] ?? array();
+    $sentiment_data = $dashboard['sentiment'] ?? array();
+    $alerts = $dashboard['alerts'] ?? array();
 
     ?>
     <div class="wrap brand-monitor-dashboard">
@@ -84,7 +83,7 @@ function brand_monitor_dashboard_page() {
 
             <div class="stat-box">
                 <h3><?php esc_html_e('Active Alerts', 'brand-monitor'); ?></h3>
-                <p class="stat-number alert-count">0</p>
+                <p class="stat-number alert-count"><?php echo esc_html($alerts['unread'] ?? 0); ?></p>
             </div>
         </div>
 
@@ -35,6 +35,13 @@ class Brand_Monitor_API_Client {
             return array('error' => $response->get_error_message());
         }
 
+        if (wp_remote_retrieve_response_code($response) === 429) {
+            return array(
+                'error'       => __('Rate limit exceeded, try again later.', 'brand-monitor'),
+                'retry_after' => (int) wp_remote_retrieve_header($response, 'retry-after'),
+            );
+        }
+
         $body = wp_remote_retrieve_body($response);
         return json_decode($body, true);
     }
@@ -60,8 +67,50 @@ class Brand_Monitor_API_Client {
         ));
     }
 
+    public function get_scrape_statuses($ids) {
+        return $this->make_request('/api/v1/scrape/status?ids=' . rawurlencode(implode(',', (array) $ids)));
+    }
+
     public function get_alerts($params = array()) {
         $query_string = http_build_query($params);
         return $this->make_request('/api/v1/alerts?' . $query_string);
     }
+
+    public function get_dashboard($params = array()) {
+        if (empty($this->api_key)) {
+            return array('error' => __('Missing API key.', 'brand-monitor'));
+        }
+
+        $cache_key = 'brand_monitor_dashboard_' . md5($this->api_key . '|' . http_build_query($params));
+        $cached = get_transient($cache_key);
+
+        $headers = array(
+            'Authorization' => 'Bearer ' . $this->api_key,
+        );
+        if (is_array($cached) && !empty($cached['etag'])) {
+            $headers['If-None-Match'] = $cached['etag'];
+        }
+
+        $response = wp_remote_get($this->api_url . '/api/v1/dashboard?' . http_build_query($params), array(
+            'headers' => $headers,
+            'timeout' => 30,
+        ));
+
+        if (is_wp_error($response)) {
+            return is_array($cached) ? $cached['body'] : array('error' => $response->get_error_message());
+        }
+
+        $code = wp_remote_retrieve_response_code($response);
+        if (($code === 304 || $code === 429) && is_array($cached)) {
+            return $cached['body'];
+        }
+
+        $body = json_decode(wp_remote_retrieve_body($response), true);
+        $etag = wp_remote_retrieve_header($response, 'etag');
+        if ($code === 200 && $etag) {
+            set_transient($cache_key, array('etag' => $etag, 'body' => $body), DAY_IN_SECONDS);
+        }
+
+        return $body;
+    }
 }